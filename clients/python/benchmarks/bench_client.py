@@ -0,0 +1,375 @@
+"""Measure the overhead Smello adds to instrumented code.
+
+Runs every workload twice in one process: once before ``smello.init()``
+patches anything, and once after. The difference is the cost Smello adds.
+Requests go to a local stand-in upstream, and captures to a local stand-in
+Smello server, so both runs take the same network path::
+
+    uv run python clients/python/benchmarks/bench_client.py
+    uv run python clients/python/benchmarks/bench_client.py --iterations 2000 --output client.json
+
+Run with ``--help`` for the options, and see README.md next to this file.
+"""
+
+import argparse
+import asyncio
+import gzip
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import threading
+import time
+import tracemalloc
+from collections.abc import Callable, Generator, Iterator
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import aiohttp
+import httpx
+import requests
+import smello
+from smello import transport
+from smello.capture import serialize_request_response
+from smello.config import SmelloConfig
+from smello.utils import body_to_str, redact_headers
+
+BODY_SIZES = {"small": 512, "100KB": 100 * 1024, "1MB": 1024 * 1024}
+# Calls per timing round. The capture queue is flushed between rounds, so
+# it never fills up and drops captures mid-measurement.
+ROUND = 50
+HEADERS = {
+    "Accept": "application/json",
+    "Authorization": "Bearer sk-test",
+    "User-Agent": "bench/1.0",
+    "X-Request-Id": "0f8fad5b-d9cb-469f-a165-70867728950e",
+    "Content-Type": "application/json",
+}
+
+
+def json_body(size: int) -> bytes:
+    """A JSON string literal exactly *size* bytes long."""
+    return b'"' + b"x" * (size - 2) + b'"'
+
+
+# --- Stand-in servers ---
+
+
+class _UpstreamHandler(BaseHTTPRequestHandler):
+    """Answers ``GET /<size>`` with a JSON body of that many bytes."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body go out in separate writes; without this, delayed
+    # ACKs add ~40 ms to every small response.
+    disable_nagle_algorithm = True
+    bodies = {size: json_body(size) for size in BODY_SIZES.values()}
+
+    def do_GET(self):
+        body = self.bodies[int(self.path.strip("/"))]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _SmelloHandler(BaseHTTPRequestHandler):
+    """Accepts and discards captures, like a Smello server that stores nothing."""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    posts = 0
+
+    def do_POST(self):
+        type(self).posts += 1
+        self.rfile.read(int(self.headers["Content-Length"]))
+        body = b'{"status":"ok"}'
+        self.send_response(201)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def serving(
+    handler: type[BaseHTTPRequestHandler], host: str = "127.0.0.1"
+) -> Generator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    server.daemon_threads = True
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://{host}:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+# --- Measurement ---
+
+
+def time_calls(fn: Callable[[], object], iterations: int) -> list[float]:
+    """Per-call wall time of *fn* in microseconds."""
+    times = []
+    for done in range(iterations):
+        begin = time.perf_counter_ns()
+        fn()
+        times.append((time.perf_counter_ns() - begin) / 1000)
+        if done % ROUND == ROUND - 1:
+            transport.flush(timeout=30)
+    transport.flush(timeout=30)
+    return times
+
+
+def peak_alloc(fn: Callable[[], object], iterations: int) -> int:
+    """Median peak of memory allocated while *fn* runs, in bytes.
+
+    tracemalloc follows every thread, so allocations the transport worker
+    makes at the same time are counted too.
+    """
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(iterations):
+            transport.flush(timeout=30)
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            fn()
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+    transport.flush(timeout=30)
+    return int(statistics.median(peaks))
+
+
+def summarize(times: list[float]) -> dict:
+    percentiles = statistics.quantiles(times * 2, n=100, method="inclusive")
+    return {
+        "p50": round(percentiles[49], 1),
+        "p99": round(percentiles[98], 1),
+        "mean": round(statistics.fmean(times), 1),
+    }
+
+
+def measure(fn: Callable[[], object], args: argparse.Namespace) -> tuple[dict, int]:
+    for _ in range(args.warmup):
+        fn()
+    transport.flush(timeout=30)
+    return summarize(time_calls(fn, args.iterations)), peak_alloc(
+        fn, args.alloc_iterations
+    )
+
+
+# --- Workloads ---
+
+
+def http_workloads(
+    upstream: str,
+) -> Iterator[tuple[str, str, Callable[[], object], Callable[[], None]]]:
+    """``(library, size, call, close)`` for each HTTP client and body size.
+
+    Clients are created fresh on every call to this function, so clients
+    made after ``smello.init()`` pick up the patches.
+    """
+    for label, size in BODY_SIZES.items():
+        url = f"{upstream}/{size}"
+
+        session = requests.Session()
+        yield (
+            "requests",
+            label,
+            lambda s=session, u=url: s.get(u, headers=HEADERS).content,
+            session.close,
+        )
+
+        client = httpx.Client(headers=HEADERS)
+        yield "httpx", label, lambda c=client, u=url: c.get(u).content, client.close
+
+        loop = asyncio.new_event_loop()
+        aio = loop.run_until_complete(_aiohttp_session())
+
+        async def fetch(session=aio, url=url):
+            async with session.get(url) as response:
+                return await response.read()
+
+        def close(loop=loop, session=aio):
+            loop.run_until_complete(session.close())
+            loop.close()
+
+        yield (
+            "aiohttp",
+            label,
+            lambda loop=loop, f=fetch: loop.run_until_complete(f()),
+            close,
+        )
+
+
+async def _aiohttp_session() -> aiohttp.ClientSession:
+    return aiohttp.ClientSession(headers=HEADERS)
+
+
+def logging_workload() -> Callable[[], None]:
+    """A WARNING record through a logger with a single NullHandler."""
+    log = logging.getLogger("bench.app")
+    log.propagate = False
+    if not log.handlers:
+        log.addHandler(logging.NullHandler())
+    return lambda: log.warning("charge %s failed for %s", "ch_123", "cus_456")
+
+
+def run_overhead(
+    args: argparse.Namespace, upstream: str, smello_url: str
+) -> list[dict]:
+    """Time every workload unpatched, then patched, and report the difference."""
+    baseline: dict[tuple[str, str], tuple[dict, int]] = {}
+
+    def run_all(results: dict) -> None:
+        for library, label, call, close in http_workloads(upstream):
+            try:
+                print(f"  {library:<9} {label:<6}", file=sys.stderr)
+                results[library, label] = measure(call, args)
+            finally:
+                close()
+        print("  logging", file=sys.stderr)
+        results["logging", "-"] = measure(logging_workload(), args)
+
+    print("Unpatched:", file=sys.stderr)
+    run_all(baseline)
+    smello.init(server_url=smello_url, capture_logs=True)
+    patched: dict[tuple[str, str], tuple[dict, int]] = {}
+    print("Patched:", file=sys.stderr)
+    run_all(patched)
+    if not _SmelloHandler.posts:
+        raise RuntimeError("No captures reached the stand-in Smello server")
+
+    results = []
+    for key, (base_us, base_alloc) in baseline.items():
+        smello_us, smello_alloc = patched[key]
+        results.append(
+            {
+                "workload": key[0],
+                "body": key[1],
+                "baseline_us": base_us,
+                "patched_us": smello_us,
+                "added_us": {
+                    k: round(smello_us[k] - base_us[k], 1) for k in ("p50", "mean")
+                },
+                "baseline_peak_alloc_bytes": base_alloc,
+                "patched_peak_alloc_bytes": smello_alloc,
+                "added_peak_alloc_bytes": smello_alloc - base_alloc,
+            }
+        )
+    return results
+
+
+def run_functions(args: argparse.Namespace) -> list[dict]:
+    """Time the serialization helpers every capture goes through."""
+    config = SmelloConfig(server_url="http://127.0.0.1")
+    results = []
+
+    def add(name: str, label: str, fn: Callable[[], object]) -> None:
+        timing, alloc = measure(fn, args)
+        results.append(
+            {"function": name, "body": label, "us": timing, "peak_alloc_bytes": alloc}
+        )
+
+    add("redact_headers", "-", lambda: redact_headers(HEADERS, config.redact_headers))
+    for label, size in BODY_SIZES.items():
+        body = json_body(size)
+        compressed = gzip.compress(body)
+        add("body_to_str", label, lambda b=body: body_to_str(b))
+        add("body_to_str[gzip]", label, lambda b=compressed: body_to_str(b))
+        add(
+            "serialize_request_response",
+            label,
+            lambda b=body: serialize_request_response(
+                config=config,
+                method="POST",
+                url="https://api.example.com/v1/charges?expand=customer",
+                request_headers=HEADERS,
+                request_body=b,
+                status_code=200,
+                response_headers=HEADERS,
+                response_body=b,
+                duration_s=0.05,
+                library="bench",
+            ),
+        )
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--iterations",
+        type=int,
+        default=500,
+        help="Timed calls per workload. (default: 500)",
+    )
+    parser.add_argument(
+        "--alloc-iterations",
+        type=int,
+        default=20,
+        help="Calls traced for allocations per workload. (default: 20)",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=int,
+        default=20,
+        help="Untimed calls before each workload. (default: 20)",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="Write the JSON report here. (default: stdout)"
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    # Settings from the environment would change what gets captured.
+    for name in [n for n in os.environ if n.startswith("SMELLO_")]:
+        del os.environ[name]
+    # Smello never captures requests to its own server's host, so the two
+    # stand-ins are reached under different names.
+    with (
+        serving(_UpstreamHandler) as upstream,
+        serving(_SmelloHandler, host="localhost") as smello_url,
+    ):
+        functions = run_functions(args)
+        overhead = run_overhead(args, upstream, smello_url)
+    report = {
+        "environment": {
+            "smello": smello.__version__,
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "iterations": args.iterations,
+            "alloc_iterations": args.alloc_iterations,
+            "warmup": args.warmup,
+        },
+        "overhead": overhead,
+        "functions": functions,
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n")
+    else:
+        print(text)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,16 +12,35 @@ from smello._debug import (
     setup_debug_logging,
     teardown_debug_logging,
 )
-from smello._env import env_bool, env_list, env_log_level, env_str, parse_log_level
+from smello._env import (
+    env_bool,
+    env_float,
+    env_int,
+    env_list,
+    env_log_level,
+    env_rates,
+    env_str,
+    parse_log_level,
+)
 from smello.config import SmelloConfig
 from smello.patches import apply_all as _apply_all
-from smello.transport import flush, shutdown
+from smello.sampling import EVENT_TYPES
+from smello.transport import (
+    MAX_BYTES,
+    MAX_EVENTS,
+    OVERFLOW_POLICIES,
+    SPOOL_MAX_BYTES,
+    WORKERS,
+    flush,
+    shutdown,
+    stats,
+)
 from smello.transport import start_worker as _start_worker
 
 logger = logging.getLogger("smello")
 logger.addHandler(logging.NullHandler())
 
-__all__ = ["init", "flush", "shutdown"]
+__all__ = ["init", "flush", "shutdown", "stats"]
 __version__ = "0.14.1"
 
 DEFAULT_REDACT_HEADERS = ["authorization", "x-api-key", "x-goog-api-key"]
@@ -59,6 +78,11 @@ def _env_provenance(env_var_name: str, cli_prov: dict[str, str | None]) -> str:
     return env_var_name
 
 
+def _clamp_rate(rate: float) -> float:
+    """Limit a sample rate to ``0.0``–``1.0``."""
+    return min(max(rate, 0.0), 1.0)
+
+
 def init(
     server_url: str | None = None,
     capture_hosts: list[str] | None = None,
@@ -70,6 +94,19 @@ def init(
     capture_logs: bool | None = None,
     log_level: int | str | None = None,
     ignore_loggers: list[str] | None = None,
+    sample_rate: float | None = None,
+    host_sample_rates: dict[str, float] | None = None,
+    method_sample_rates: dict[str, float] | None = None,
+    slow_threshold_ms: int | None = None,
+    rate_limits: dict[str, float] | None = None,
+    queue_max_events: int | None = None,
+    queue_max_bytes: int | None = None,
+    overflow_policy: str | None = None,
+    block_timeout_ms: int | None = None,
+    spool_dir: str | None = None,
+    spool_max_bytes: int | None = None,
+    compress: bool | None = None,
+    workers: int | None = None,
     app: str | None = None,
     session: str | None = None,
     debug: bool | None = None,
@@ -99,6 +136,19 @@ def init(
     capture_logs          ``SMELLO_CAPTURE_LOGS``         ``False``
     log_level             ``SMELLO_LOG_LEVEL``            ``30`` (WARNING)
     ignore_loggers        ``SMELLO_IGNORE_LOGGERS``       ``[]``
+    sample_rate           ``SMELLO_SAMPLE_RATE``          ``1.0``
+    host_sample_rates     ``SMELLO_HOST_SAMPLE_RATES``    ``{}``
+    method_sample_rates   ``SMELLO_METHOD_SAMPLE_RATES``  ``{}``
+    slow_threshold_ms     ``SMELLO_SLOW_THRESHOLD_MS``    ``1000``
+    rate_limits           ``SMELLO_RATE_LIMITS``          ``{}`` (unlimited)
+    queue_max_events      ``SMELLO_QUEUE_MAX_EVENTS``     ``1000``
+    queue_max_bytes       ``SMELLO_QUEUE_MAX_BYTES``      ``67108864`` (64 MiB)
+    overflow_policy       ``SMELLO_OVERFLOW_POLICY``      ``"drop_newest"``
+    block_timeout_ms      ``SMELLO_BLOCK_TIMEOUT_MS``     ``100``
+    spool_dir             ``SMELLO_SPOOL_DIR``            ``None`` (no spool)
+    spool_max_bytes       ``SMELLO_SPOOL_MAX_BYTES``      ``268435456`` (256 MiB)
+    compress              ``SMELLO_COMPRESS``             ``False``
+    workers               ``SMELLO_WORKERS``              ``1``
     app                   ``SMELLO_APP``                  ``""``
     session               ``SMELLO_SESSION``              ``""``
     ====================  ==============================  ==========================
@@ -126,8 +176,43 @@ def init(
        application must configure its own logging level accordingly (e.g.
        ``logging.basicConfig(level=logging.DEBUG)``).
 
+    ``sample_rate`` keeps that fraction of outgoing and incoming HTTP calls
+    (``0.0`` to ``1.0``). ``host_sample_rates`` and ``method_sample_rates``
+    override it for outgoing calls to a host, or calls with a method; the
+    host rate wins. Calls that fail, return a status of 400 or more, or take
+    at least ``slow_threshold_ms`` are always kept. ``rate_limits`` caps
+    captures per second by event type (``"http"``, ``"http_incoming"``,
+    ``"log"``, ``"exception"``), errors included. Both are decided before
+    a capture is serialized, so dropped calls cost next to nothing.
+
+    Captures wait in a queue for the background transport, which holds at
+    most ``queue_max_events`` captures and about ``queue_max_bytes`` bytes.
+    ``overflow_policy`` decides what happens when a capture does not fit:
+    ``"drop_newest"`` drops it, ``"drop_oldest"`` drops the oldest queued
+    captures to make room, and ``"block"`` makes the caller wait up to
+    ``block_timeout_ms`` for room before dropping it. ``smello.stats()``
+    returns how many captures of each type were sent, dropped, or failed.
+
+    ``spool_dir`` turns on a disk spool: captures the server cannot take
+    because it is down or failing are appended to size-capped segment
+    files in that directory (at most ``spool_max_bytes`` in total) and
+    replayed in batches once the server is back. Processes may share a
+    spool directory. With a spool, ``overflow_policy="spill"`` writes
+    captures that do not fit in the queue to the spool instead of dropping
+    them.
+
+    ``compress`` gzips requests to the server of 1 KiB or more, which pays
+    off when the server is remote. Servers that predate gzip support get
+    uncompressed requests.
+
+    ``workers`` caps how many requests to the server are in flight at once.
+    Raise it when the server is slow to answer and captures are dropped.
+    Logs and exceptions still arrive in order; HTTP captures may not.
+
     Boolean env vars accept ``true``/``1``/``yes`` and ``false``/``0``/``no``
-    (case-insensitive).  List env vars are comma-separated.
+    (case-insensitive).  List env vars are comma-separated.  Rate env vars
+    are comma-separated ``key=number`` pairs, e.g.
+    ``SMELLO_RATE_LIMITS=log=20,http=100``.
 
     Calling ``init()`` more than once is safe. The first call applies the
     monkey-patches; subsequent calls update the live ``SmelloConfig`` in
@@ -281,6 +366,171 @@ def init(
             log_level = logging.WARNING
             provenance["log_level"] = "default"
 
+    if sample_rate is not None:
+        provenance["sample_rate"] = "param"
+    else:
+        env_val = env_float("SAMPLE_RATE")
+        if env_val is not None:
+            sample_rate = env_val
+            provenance["sample_rate"] = _env_provenance("SMELLO_SAMPLE_RATE", cli_prov)
+        else:
+            sample_rate = 1.0
+            provenance["sample_rate"] = "default"
+
+    if host_sample_rates is not None:
+        provenance["host_sample_rates"] = "param"
+    else:
+        env_val = env_rates("HOST_SAMPLE_RATES")
+        host_sample_rates = env_val or {}
+        provenance["host_sample_rates"] = (
+            _env_provenance("SMELLO_HOST_SAMPLE_RATES", cli_prov)
+            if env_val
+            else "default"
+        )
+
+    if method_sample_rates is not None:
+        provenance["method_sample_rates"] = "param"
+    else:
+        env_val = env_rates("METHOD_SAMPLE_RATES")
+        method_sample_rates = env_val or {}
+        provenance["method_sample_rates"] = (
+            _env_provenance("SMELLO_METHOD_SAMPLE_RATES", cli_prov)
+            if env_val
+            else "default"
+        )
+
+    if slow_threshold_ms is not None:
+        provenance["slow_threshold_ms"] = "param"
+    else:
+        env_val = env_int("SLOW_THRESHOLD_MS")
+        if env_val is not None:
+            slow_threshold_ms = env_val
+            provenance["slow_threshold_ms"] = _env_provenance(
+                "SMELLO_SLOW_THRESHOLD_MS", cli_prov
+            )
+        else:
+            slow_threshold_ms = 1000
+            provenance["slow_threshold_ms"] = "default"
+
+    if rate_limits is not None:
+        provenance["rate_limits"] = "param"
+    else:
+        env_val = env_rates("RATE_LIMITS")
+        rate_limits = env_val or {}
+        provenance["rate_limits"] = (
+            _env_provenance("SMELLO_RATE_LIMITS", cli_prov) if env_val else "default"
+        )
+    for event_type in rate_limits:
+        if event_type not in EVENT_TYPES:
+            logger.warning(
+                "Unknown event type %r in rate_limits, expected one of %s",
+                event_type,
+                ", ".join(EVENT_TYPES),
+            )
+
+    if queue_max_events is not None:
+        provenance["queue_max_events"] = "param"
+    else:
+        env_val = env_int("QUEUE_MAX_EVENTS")
+        if env_val is not None:
+            queue_max_events = env_val
+            provenance["queue_max_events"] = _env_provenance(
+                "SMELLO_QUEUE_MAX_EVENTS", cli_prov
+            )
+        else:
+            queue_max_events = MAX_EVENTS
+            provenance["queue_max_events"] = "default"
+
+    if queue_max_bytes is not None:
+        provenance["queue_max_bytes"] = "param"
+    else:
+        env_val = env_int("QUEUE_MAX_BYTES")
+        if env_val is not None:
+            queue_max_bytes = env_val
+            provenance["queue_max_bytes"] = _env_provenance(
+                "SMELLO_QUEUE_MAX_BYTES", cli_prov
+            )
+        else:
+            queue_max_bytes = MAX_BYTES
+            provenance["queue_max_bytes"] = "default"
+
+    if overflow_policy is not None:
+        provenance["overflow_policy"] = "param"
+    else:
+        env_val = env_str("OVERFLOW_POLICY")
+        overflow_policy = env_val or "drop_newest"
+        provenance["overflow_policy"] = (
+            _env_provenance("SMELLO_OVERFLOW_POLICY", cli_prov)
+            if env_val
+            else "default"
+        )
+    if overflow_policy not in OVERFLOW_POLICIES:
+        logger.warning(
+            "Unknown overflow_policy %r, falling back to drop_newest", overflow_policy
+        )
+        overflow_policy = "drop_newest"
+
+    if block_timeout_ms is not None:
+        provenance["block_timeout_ms"] = "param"
+    else:
+        env_val = env_int("BLOCK_TIMEOUT_MS")
+        if env_val is not None:
+            block_timeout_ms = env_val
+            provenance["block_timeout_ms"] = _env_provenance(
+                "SMELLO_BLOCK_TIMEOUT_MS", cli_prov
+            )
+        else:
+            block_timeout_ms = 100
+            provenance["block_timeout_ms"] = "default"
+
+    if spool_dir is not None:
+        provenance["spool_dir"] = "param"
+    else:
+        spool_dir = env_str("SPOOL_DIR")
+        provenance["spool_dir"] = (
+            _env_provenance("SMELLO_SPOOL_DIR", cli_prov) if spool_dir else "default"
+        )
+    if overflow_policy == "spill" and not spool_dir:
+        logger.warning(
+            "overflow_policy 'spill' needs spool_dir, falling back to drop_newest"
+        )
+        overflow_policy = "drop_newest"
+
+    if spool_max_bytes is not None:
+        provenance["spool_max_bytes"] = "param"
+    else:
+        env_val = env_int("SPOOL_MAX_BYTES")
+        if env_val is not None:
+            spool_max_bytes = env_val
+            provenance["spool_max_bytes"] = _env_provenance(
+                "SMELLO_SPOOL_MAX_BYTES", cli_prov
+            )
+        else:
+            spool_max_bytes = SPOOL_MAX_BYTES
+            provenance["spool_max_bytes"] = "default"
+
+    if compress is not None:
+        provenance["compress"] = "param"
+    else:
+        env_val = env_bool("COMPRESS")
+        if env_val is not None:
+            compress = env_val
+            provenance["compress"] = _env_provenance("SMELLO_COMPRESS", cli_prov)
+        else:
+            compress = False
+            provenance["compress"] = "default"
+
+    if workers is not None:
+        provenance["workers"] = "param"
+    else:
+        env_val = env_int("WORKERS")
+        if env_val is not None:
+            workers = env_val
+            provenance["workers"] = _env_provenance("SMELLO_WORKERS", cli_prov)
+        else:
+            workers = WORKERS
+            provenance["workers"] = "default"
+
     if app is not None:
         provenance["app"] = "param"
     else:
@@ -302,6 +552,11 @@ def init(
     resolved_url = server_url.rstrip("/")
     normalized_redact_headers = [h.lower() for h in redact_headers]
     normalized_redact_query_params = [p.lower() for p in redact_query_params]
+    sample_rate = _clamp_rate(sample_rate)
+    host_sample_rates = {h: _clamp_rate(r) for h, r in host_sample_rates.items()}
+    method_sample_rates = {
+        m.upper(): _clamp_rate(r) for m, r in method_sample_rates.items()
+    }
 
     log_resolved_config(
         provenance,
@@ -316,6 +571,19 @@ def init(
         capture_logs=capture_logs,
         log_level=log_level,
         ignore_loggers=ignore_loggers,
+        sample_rate=sample_rate,
+        host_sample_rates=host_sample_rates,
+        method_sample_rates=method_sample_rates,
+        slow_threshold_ms=slow_threshold_ms,
+        rate_limits=rate_limits,
+        queue_max_events=queue_max_events,
+        queue_max_bytes=queue_max_bytes,
+        overflow_policy=overflow_policy,
+        block_timeout_ms=block_timeout_ms,
+        spool_dir=spool_dir,
+        spool_max_bytes=spool_max_bytes,
+        compress=compress,
+        workers=workers,
         app=app,
         session=session,
     )
@@ -332,6 +600,19 @@ def init(
             capture_logs=capture_logs,
             log_level=log_level,
             ignore_loggers=ignore_loggers,
+            sample_rate=sample_rate,
+            host_sample_rates=host_sample_rates,
+            method_sample_rates=method_sample_rates,
+            slow_threshold_ms=slow_threshold_ms,
+            rate_limits=rate_limits,
+            queue_max_events=queue_max_events,
+            queue_max_bytes=queue_max_bytes,
+            overflow_policy=overflow_policy,
+            block_timeout_ms=block_timeout_ms,
+            spool_dir=spool_dir,
+            spool_max_bytes=spool_max_bytes,
+            compress=compress,
+            workers=workers,
             app=app,
             session=session,
             debug=debug,
@@ -349,6 +630,19 @@ def init(
         _config.capture_logs = capture_logs
         _config.log_level = log_level
         _config.ignore_loggers = ignore_loggers
+        _config.sample_rate = sample_rate
+        _config.host_sample_rates = host_sample_rates
+        _config.method_sample_rates = method_sample_rates
+        _config.slow_threshold_ms = slow_threshold_ms
+        _config.rate_limits = rate_limits
+        _config.queue_max_events = queue_max_events
+        _config.queue_max_bytes = queue_max_bytes
+        _config.overflow_policy = overflow_policy
+        _config.block_timeout_ms = block_timeout_ms
+        _config.spool_dir = spool_dir
+        _config.spool_max_bytes = spool_max_bytes
+        _config.compress = compress
+        _config.workers = workers
         _config.app = app
         _config.session = session
         _config.debug = debug
@@ -359,7 +653,19 @@ def init(
         _config.ignore_hosts.append(server_host)
 
     # Start transport worker (idempotent — start_worker guards against re-start)
-    _start_worker(_config.server_url, app=_config.app, session=_config.session)
+    _start_worker(
+        _config.server_url,
+        app=_config.app,
+        session=_config.session,
+        max_events=_config.queue_max_events,
+        max_bytes=_config.queue_max_bytes,
+        overflow_policy=_config.overflow_policy,
+        block_timeout=_config.block_timeout_ms / 1000,
+        spool_dir=_config.spool_dir,
+        spool_max_bytes=_config.spool_max_bytes,
+        compress=_config.compress,
+        workers=_config.workers,
+    )
 
     # Apply patches once. Re-applying nests wrappers, which would double-capture
     # every request (the second patch's `original_send` is the first patch's
@@ -44,13 +44,28 @@ def check_connectivity(server_url: str) -> None:
     """Ping the Smello server and log the result. Never raises."""
     logger = logging.getLogger("smello")
     try:
-        req = urllib.request.Request(f"{server_url}/api/meta", method="GET")
-        resp = urllib.request.urlopen(req, timeout=2)  # noqa: S310
-        logger.debug("connected to %s (%d)", server_url, resp.status)
+        if server_url.startswith("unix:"):
+            status = _get_unix(server_url, "/api/meta")
+        else:
+            req = urllib.request.Request(f"{server_url}/api/meta", method="GET")
+            status = urllib.request.urlopen(req, timeout=2).status  # noqa: S310
+        logger.debug("connected to %s (%d)", server_url, status)
     except Exception as err:
         logger.warning("failed to reach %s (%s)", server_url, err)
 
 
+def _get_unix(server_url: str, path: str) -> int:
+    """GET *path* from a server behind a ``unix://`` URL; return the status."""
+    from smello.transport import open_connection  # noqa: PLC0415
+
+    conn = open_connection(server_url, timeout=2)
+    try:
+        conn.request("GET", path)
+        return conn.getresponse().status
+    finally:
+        conn.close()
+
+
 def log_resolved_config(provenance: dict[str, str], **fields: object) -> None:
     """Log the resolved configuration with provenance info."""
     logger = logging.getLogger("smello")
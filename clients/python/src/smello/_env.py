@@ -88,3 +88,49 @@ def env_list(name: str) -> list[str] | None:
         return None
     items = [item.strip() for item in raw.split(",") if item.strip()]
     return items if items else None
+
+
+def env_float(name: str) -> float | None:
+    """Read ``SMELLO_{name}`` as a float.
+
+    Returns ``None`` if unset, empty, or not a valid number.
+    """
+    raw = env_str(name)
+    if raw is None:
+        return None
+    try:
+        return float(raw)
+    except ValueError:
+        return None
+
+
+def env_rates(name: str) -> dict[str, float] | None:
+    """Read ``SMELLO_{name}`` as comma-separated ``key=number`` pairs.
+
+    Returns ``None`` if unset, empty, or malformed.
+    """
+    raw = env_str(name)
+    if raw is None:
+        return None
+    return parse_rates(raw)
+
+
+def parse_rates(value: str) -> dict[str, float] | None:
+    """Parse ``"api.example.com=0.1,GET=0.5"`` into ``{key: number}``.
+
+    The key is everything before the last ``=``.  Returns ``None`` if any
+    pair is malformed, or if there are no pairs.
+    """
+    rates: dict[str, float] = {}
+    for item in value.split(","):
+        item = item.strip()
+        if not item:
+            continue
+        key, sep, number = item.rpartition("=")
+        if not sep or not key.strip():
+            return None
+        try:
+            rates[key.strip()] = float(number)
+        except ValueError:
+            return None
+    return rates if rates else None
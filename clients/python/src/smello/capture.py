@@ -1,10 +1,13 @@
 """Serialize captured HTTP request/response pairs for sending to the server."""
 
+import logging
 import time
 import uuid
+from collections.abc import Mapping
 
 import smello
 from smello.config import SmelloConfig
+from smello.transport import EVENT_OVERHEAD, send_http
 from smello.utils import (
     body_to_str,
     python_version,
@@ -12,21 +15,105 @@ from smello.utils import (
     redact_query_params,
 )
 
+logger = logging.getLogger(__name__)
+
+
+def should_send_http(
+    config: SmelloConfig,
+    *,
+    host: str,
+    method: str,
+    status_code: int,
+    duration_s: float,
+    event_type: str = "http",
+) -> bool:
+    """Apply sampling and *event_type*'s rate limit to a finished HTTP call.
+
+    Patches call this before serializing, so a dropped call costs no body
+    copies.
+    """
+    if not config.should_sample(host, method, status_code, duration_s):
+        logger.debug("skipped %s %s (sampled out)", method, host)
+        return False
+    if not config.allow(event_type):
+        logger.debug("skipped %s %s (rate limited)", method, host)
+        return False
+    return True
+
+
+def capture_http(
+    *,
+    config: SmelloConfig,
+    method: str,
+    url: str,
+    request_headers: Mapping,
+    request_body: str | bytes | None,
+    status_code: int,
+    response_headers: Mapping,
+    response_body: str | bytes | None,
+    duration_s: float,
+    library: str,
+) -> None:
+    """Queue an HTTP call for capture without serializing it.
+
+    Only references to the headers and bodies are queued, with the capture
+    time. Redaction, decoding, and building the payload happen later on the
+    transport worker, so the instrumented call pays almost nothing.
+    """
+    timestamp = time.time()
+
+    def build() -> dict:
+        payload = serialize_request_response(
+            config=config,
+            method=method,
+            url=url,
+            request_headers=request_headers,
+            request_body=request_body,
+            status_code=status_code,
+            response_headers=response_headers,
+            response_body=response_body,
+            duration_s=duration_s,
+            library=library,
+            timestamp=timestamp,
+        )
+        logger.debug(
+            "captured %s %s via %s (%d)",
+            method,
+            payload["request"]["url"],
+            library,
+            status_code,
+        )
+        return payload
+
+    send_http(
+        build,
+        size=EVENT_OVERHEAD + _body_size(request_body) + _body_size(response_body),
+    )
+
+
+def _body_size(body: object) -> int:
+    return len(body) if isinstance(body, (str, bytes, bytearray)) else 0
+
 
 def serialize_request_response(
     *,
     config: SmelloConfig,
     method: str,
     url: str,
-    request_headers: dict,
+    request_headers: Mapping,
     request_body: str | bytes | None,
     status_code: int,
-    response_headers: dict,
+    response_headers: Mapping,
     response_body: str | bytes | None,
     duration_s: float,
     library: str,
+    timestamp: float | None = None,
 ) -> dict:
-    """Build the capture payload dict."""
+    """Build the capture payload dict.
+
+    ``timestamp`` is when the call was captured, in seconds since the
+    epoch; it defaults to now.
+    """
     req_headers = redact_headers(dict(request_headers), config.redact_headers)
     url = redact_query_params(url, config.redact_query_params)
     resp_headers = dict(response_headers)
@@ -36,7 +123,7 @@ def serialize_request_response(
 
     return {
         "id": str(uuid.uuid4()),
-        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(timestamp)),
         "duration_ms": int(duration_s * 1000),
         "request": {
             "method": method,
@@ -19,7 +19,7 @@ import sys
 from collections.abc import Sequence
 
 import smello
-from smello._env import parse_log_level
+from smello._env import parse_log_level, parse_rates
 
 DEFAULT_SERVER_URL = "http://localhost:5110"
 
@@ -35,6 +35,15 @@ def _parse_log_level_arg(value: str) -> int:
     return result
 
 
+def _parse_rate_pair_arg(value: str) -> str:
+    """Argparse type for ``KEY=NUMBER`` flags such as --rate-limit."""
+    if parse_rates(value) is None or "," in value:
+        raise argparse.ArgumentTypeError(
+            f"invalid value: {value!r} (use KEY=NUMBER, e.g. log=20)"
+        )
+    return value.strip()
+
+
 def _bootstrap_dir() -> str:
     return os.path.join(os.path.dirname(os.path.abspath(smello.__file__)), "bootstrap")
 
@@ -91,6 +100,32 @@ def _smello_env_overrides(args: argparse.Namespace) -> dict[str, str]:
         overrides["SMELLO_LOG_LEVEL"] = str(args.log_level)
     if args.ignore_logger:
         overrides["SMELLO_IGNORE_LOGGERS"] = ",".join(args.ignore_logger)
+    if args.sample_rate is not None:
+        overrides["SMELLO_SAMPLE_RATE"] = str(args.sample_rate)
+    if args.host_sample_rate:
+        overrides["SMELLO_HOST_SAMPLE_RATES"] = ",".join(args.host_sample_rate)
+    if args.method_sample_rate:
+        overrides["SMELLO_METHOD_SAMPLE_RATES"] = ",".join(args.method_sample_rate)
+    if args.slow_threshold_ms is not None:
+        overrides["SMELLO_SLOW_THRESHOLD_MS"] = str(args.slow_threshold_ms)
+    if args.rate_limit:
+        overrides["SMELLO_RATE_LIMITS"] = ",".join(args.rate_limit)
+    if args.queue_max_events is not None:
+        overrides["SMELLO_QUEUE_MAX_EVENTS"] = str(args.queue_max_events)
+    if args.queue_max_bytes is not None:
+        overrides["SMELLO_QUEUE_MAX_BYTES"] = str(args.queue_max_bytes)
+    if args.overflow_policy is not None:
+        overrides["SMELLO_OVERFLOW_POLICY"] = args.overflow_policy
+    if args.block_timeout_ms is not None:
+        overrides["SMELLO_BLOCK_TIMEOUT_MS"] = str(args.block_timeout_ms)
+    if args.spool_dir is not None:
+        overrides["SMELLO_SPOOL_DIR"] = args.spool_dir
+    if args.spool_max_bytes is not None:
+        overrides["SMELLO_SPOOL_MAX_BYTES"] = str(args.spool_max_bytes)
+    if args.compress is not None:
+        overrides["SMELLO_COMPRESS"] = "true" if args.compress else "false"
+    if args.workers is not None:
+        overrides["SMELLO_WORKERS"] = str(args.workers)
     if args.app is not None:
         overrides["SMELLO_APP"] = args.app
     if args.session is not None:
@@ -109,6 +144,18 @@ _ENV_TO_FLAG: dict[str, str] = {
     "SMELLO_REDACT_QUERY_PARAMS": "--redact-query-param",
     "SMELLO_LOG_LEVEL": "--log-level",
     "SMELLO_IGNORE_LOGGERS": "--ignore-logger",
+    "SMELLO_SAMPLE_RATE": "--sample-rate",
+    "SMELLO_HOST_SAMPLE_RATES": "--host-sample-rate",
+    "SMELLO_METHOD_SAMPLE_RATES": "--method-sample-rate",
+    "SMELLO_SLOW_THRESHOLD_MS": "--slow-threshold-ms",
+    "SMELLO_RATE_LIMITS": "--rate-limit",
+    "SMELLO_QUEUE_MAX_EVENTS": "--queue-max-events",
+    "SMELLO_QUEUE_MAX_BYTES": "--queue-max-bytes",
+    "SMELLO_OVERFLOW_POLICY": "--overflow-policy",
+    "SMELLO_BLOCK_TIMEOUT_MS": "--block-timeout-ms",
+    "SMELLO_SPOOL_DIR": "--spool-dir",
+    "SMELLO_SPOOL_MAX_BYTES": "--spool-max-bytes",
+    "SMELLO_WORKERS": "--workers",
     "SMELLO_APP": "--app",
     "SMELLO_SESSION": "--session",
 }
@@ -145,6 +192,10 @@ def _cli_provenance(
             provenance[env_var] = (
                 "--capture-logs" if args.capture_logs is True else "--no-capture-logs"
             )
+        elif env_var == "SMELLO_COMPRESS":
+            provenance[env_var] = (
+                "--compress" if args.compress is True else "--no-compress"
+            )
         elif env_var == "SMELLO_DEBUG":
             provenance[env_var] = "--debug" if args.debug is True else "--no-debug"
     return provenance
@@ -279,6 +330,94 @@ def _build_parser() -> argparse.ArgumentParser:
         metavar="LOGGER",
         help="Ignore this logger name for log capture (repeatable). Sets SMELLO_IGNORE_LOGGERS.",
     )
+    run.add_argument(
+        "--sample-rate",
+        type=float,
+        metavar="RATE",
+        help="Fraction of HTTP calls to capture, 0.0 to 1.0 (default: 1.0). "
+        "Errors and slow calls are always captured.",
+    )
+    run.add_argument(
+        "--host-sample-rate",
+        action="append",
+        type=_parse_rate_pair_arg,
+        metavar="HOST=RATE",
+        help="Sample rate for calls to this host (repeatable).",
+    )
+    run.add_argument(
+        "--method-sample-rate",
+        action="append",
+        type=_parse_rate_pair_arg,
+        metavar="METHOD=RATE",
+        help="Sample rate for calls with this HTTP method (repeatable).",
+    )
+    run.add_argument(
+        "--slow-threshold-ms",
+        type=int,
+        metavar="MS",
+        help="Always capture HTTP calls at least this slow (default: 1000).",
+    )
+    run.add_argument(
+        "--rate-limit",
+        action="append",
+        type=_parse_rate_pair_arg,
+        metavar="TYPE=PER_SECOND",
+        help="Capture at most this many events of a type (http, http_incoming, "
+        "log, exception) per second (repeatable).",
+    )
+    run.add_argument(
+        "--queue-max-events",
+        type=int,
+        metavar="N",
+        help="Most captures waiting to be sent (default: 1000).",
+    )
+    run.add_argument(
+        "--queue-max-bytes",
+        type=int,
+        metavar="BYTES",
+        help="Most bytes of captures waiting to be sent (default: 64 MiB).",
+    )
+    run.add_argument(
+        "--overflow-policy",
+        choices=smello.OVERFLOW_POLICIES,
+        help="What to do with a capture when the queue is full (default: drop_newest).",
+    )
+    run.add_argument(
+        "--block-timeout-ms",
+        type=int,
+        metavar="MS",
+        help="With --overflow-policy block, how long to wait for room (default: 100).",
+    )
+    run.add_argument(
+        "--spool-dir",
+        metavar="DIR",
+        help="Spool captures to this directory while the server is unreachable.",
+    )
+    run.add_argument(
+        "--spool-max-bytes",
+        type=int,
+        metavar="BYTES",
+        help="Most bytes kept in the spool directory (default: 256 MiB).",
+    )
+    run.add_argument(
+        "--compress",
+        dest="compress",
+        action="store_true",
+        default=None,
+        help="Gzip requests to the server (off by default).",
+    )
+    run.add_argument(
+        "--no-compress",
+        dest="compress",
+        action="store_false",
+        help="Send requests to the server uncompressed.",
+    )
+    run.add_argument(
+        "--workers",
+        type=int,
+        metavar="N",
+        help="Most requests to the server in flight at once (default: 1).",
+    )
     run.add_argument(
         "--debug",
         dest="debug",
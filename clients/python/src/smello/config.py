@@ -1,8 +1,12 @@
 """Configuration for Smello client."""
 
 import logging
+import random
 from dataclasses import dataclass, field
 
+from smello.sampling import TokenBucket
+from smello.transport import MAX_BYTES, MAX_EVENTS, SPOOL_MAX_BYTES, WORKERS
+
 
 @dataclass
 class SmelloConfig:
@@ -18,9 +22,25 @@ class SmelloConfig:
     capture_logs: bool = False
     log_level: int = logging.WARNING
     ignore_loggers: list[str] = field(default_factory=list)
+    sample_rate: float = 1.0
+    host_sample_rates: dict[str, float] = field(default_factory=dict)
+    method_sample_rates: dict[str, float] = field(default_factory=dict)
+    slow_threshold_ms: int = 1000
+    rate_limits: dict[str, float] = field(default_factory=dict)
+    queue_max_events: int = MAX_EVENTS
+    queue_max_bytes: int = MAX_BYTES
+    overflow_policy: str = "drop_newest"
+    block_timeout_ms: int = 100
+    spool_dir: str | None = None
+    spool_max_bytes: int = SPOOL_MAX_BYTES
+    compress: bool = False
+    workers: int = WORKERS
     app: str = ""
     session: str = ""
     debug: bool = False
+    _buckets: dict[str, TokenBucket] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
 
     def should_capture(self, host: str) -> bool:
         """Decide whether to capture a request to the given host."""
@@ -29,3 +49,30 @@ class SmelloConfig:
         if self.capture_all:
             return True
         return host in self.capture_hosts
+
+    def should_sample(
+        self, host: str, method: str, status_code: int, duration_s: float
+    ) -> bool:
+        """Decide whether to keep a finished HTTP call that passed `should_capture`.
+
+        Errors (no response, or status >= 400) and calls slower than
+        ``slow_threshold_ms`` are always kept. Otherwise the host's rate
+        applies, then the method's, then ``sample_rate``.
+        """
+        if not 100 <= status_code < 400 or duration_s * 1000 >= self.slow_threshold_ms:
+            return True
+        rate = self.host_sample_rates.get(host)
+        if rate is None:
+            rate = self.method_sample_rates.get(method.upper(), self.sample_rate)
+        return rate >= 1.0 or random.random() < rate
+
+    def allow(self, event_type: str) -> bool:
+        """Take a token from *event_type*'s rate limit, if it has one."""
+        rate = self.rate_limits.get(event_type)
+        if rate is None:
+            return True
+        bucket = self._buckets.get(event_type)
+        if bucket is None or bucket.rate != rate:
+            # First use, or init() changed the limit.
+            bucket = self._buckets[event_type] = TokenBucket(rate)
+        return bucket.take()
@@ -6,6 +6,7 @@ import uuid
 from typing import Any
 
 import smello
+from smello.capture import should_send_http
 from smello.patches.patch_excepthook import capture_exception
 from smello.transport import send_http_incoming
 from smello.utils import (
@@ -100,7 +101,11 @@ class SmelloMiddleware:
         request._smello_exc_type = type(exception).__qualname__
         request._smello_exc_value = str(exception)
         config = smello._config
-        if config is not None and config.capture_exceptions:
+        if (
+            config is not None
+            and config.capture_exceptions
+            and config.allow("exception")
+        ):
             capture_exception(type(exception), exception, exception.__traceback__)
         return None
 
@@ -117,6 +122,15 @@ def _capture(
     exc_value_str: str | None,
 ) -> None:
     try:
+        if not should_send_http(
+            config,
+            host="",
+            method=request.method,
+            status_code=response.status_code,
+            duration_s=duration_ms / 1000,
+            event_type="http_incoming",
+        ):
+            return
         url = request.build_absolute_uri()
         url = redact_query_params(url, config.redact_query_params)
 
@@ -8,6 +8,7 @@ from collections.abc import Awaitable, Callable
 from typing import Any
 
 import smello
+from smello.capture import should_send_http
 from smello.patches.patch_excepthook import capture_exception
 from smello.transport import send_http_incoming
 from smello.utils import (
@@ -114,7 +115,8 @@ class SmelloMiddleware:
         except Exception as exc:
             exc_type_name = type(exc).__qualname__
             exc_value_str = str(exc)
-            capture_exception(*sys.exc_info())
+            if config.allow("exception"):
+                capture_exception(*sys.exc_info())
             raise
         finally:
             duration_ms = int((time.monotonic() - start) * 1000)
@@ -155,6 +157,18 @@ def _capture(
         method = scope.get("method", "UNKNOWN")
         path = scope.get("path", "/")
 
+        if status == 0 and exc_type_name is not None:
+            status = 500
+        if not should_send_http(
+            config,
+            host="",
+            method=method,
+            status_code=status,
+            duration_s=duration_ms / 1000,
+            event_type="http_incoming",
+        ):
+            return
+
         scheme = scope.get("scheme", "http")
         raw_headers = scope.get("headers", [])
         req_headers: dict[str, str] = {}
@@ -190,9 +204,6 @@ def _capture(
         client = scope.get("client")
         client_ip = client[0] if client else None
 
-        if status == 0 and exc_type_name is not None:
-            status = 500
-
         req_body = b"".join(req_body_chunks) if not req_exceeded else None
         resp_body = b"".join(resp_body_chunks) if not resp_exceeded else None
 
@@ -20,10 +20,8 @@ import logging
 import time
 from types import SimpleNamespace
 
-from smello.capture import serialize_request_response
+from smello.capture import capture_http, should_send_http
 from smello.config import SmelloConfig
-from smello.transport import send_http
-from smello.utils import redact_query_params
 
 logger = logging.getLogger(__name__)
 
@@ -73,26 +71,34 @@ class AiohttpTracer:
     async def on_request_redirect(self, session, ctx, params):
         if ctx.skip:
             return
-        request_body = self._extract_body(ctx)
+        if should_send_http(
+            self.config,
+            host=params.url.host or "",
+            method=params.method,
+            status_code=params.response.status,
+            duration_s=0,
+        ):
+            self._send_redirect_hop(ctx, params)
+        # Reset for the next hop — body is not resent after redirect.
+        ctx.request_headers = dict(params.headers)
+        ctx.body_chunks = []
+
+    def _send_redirect_hop(self, ctx, params):
         try:
-            payload = serialize_request_response(
+            capture_http(
                 config=self.config,
                 method=params.method,
                 url=str(params.response.url),
                 request_headers=ctx.request_headers,
-                request_body=request_body,
+                request_body=self._extract_body(ctx),
                 status_code=params.response.status,
-                response_headers=dict(params.response.headers),
+                response_headers=params.response.headers,
                 response_body=None,
                 duration_s=0,
                 library="aiohttp",
             )
-            send_http(payload)
         except Exception as err:
             logger.debug("failed to capture redirect hop: %s", err)
-        # Reset for the next hop — body is not resent after redirect.
-        ctx.request_headers = dict(params.headers)
-        ctx.body_chunks = []
 
     async def on_response_chunk_received(self, session, ctx, params):
         """Fires inside response.read() with the full body."""
@@ -104,6 +110,14 @@ class AiohttpTracer:
     async def on_request_end(self, session, ctx, params):
         if ctx.skip:
             return
+        if not should_send_http(
+            self.config,
+            host=params.url.host or "",
+            method=params.method,
+            status_code=params.response.status,
+            duration_s=time.monotonic() - ctx.start,
+        ):
+            return
         request_body = self._extract_body(ctx)
         config = self.config
         start = ctx.start
@@ -121,27 +135,18 @@ class AiohttpTracer:
             # body download, not just headers.
             duration = time.monotonic() - start
             try:
-                payload = serialize_request_response(
+                capture_http(
                     config=config,
                     method=params.method,
                     url=str(params.response.url),
                     request_headers=ctx.request_headers,
                     request_body=request_body,
                     status_code=params.response.status,
-                    response_headers=dict(params.response.headers),
+                    response_headers=params.response.headers,
                     response_body=response_body,
                     duration_s=duration,
                     library="aiohttp",
                 )
-                send_http(payload)
-                logger.debug(
-                    "captured %s %s via aiohttp (%d)",
-                    params.method,
-                    redact_query_params(
-                        str(params.response.url), config.redact_query_params
-                    ),
-                    params.response.status,
-                )
             except Exception as err:
                 logger.debug("failed to capture request: %s", err)
 
@@ -170,20 +175,28 @@ class AiohttpTracer:
         duration = time.monotonic() - ctx.start
         request_body = self._extract_body(ctx)
         status_code = 0
-        response_headers: dict = {}
+        response_headers = {}
 
         import aiohttp  # noqa: PLC0415
 
         if isinstance(params.exception, aiohttp.ClientResponseError):
             status_code = params.exception.status
             if params.exception.headers:
-                response_headers = dict(params.exception.headers)
+                response_headers = params.exception.headers
+        if not should_send_http(
+            self.config,
+            host=params.url.host or "",
+            method=params.method,
+            status_code=status_code,
+            duration_s=duration,
+        ):
+            return
         try:
-            payload = serialize_request_response(
+            capture_http(
                 config=self.config,
                 method=params.method,
                 url=str(params.url),
-                request_headers=dict(params.headers),
+                request_headers=params.headers,
                 request_body=request_body,
                 status_code=status_code,
                 response_headers=response_headers,
@@ -191,7 +204,6 @@ class AiohttpTracer:
                 duration_s=duration,
                 library="aiohttp",
             )
-            send_http(payload)
         except Exception as err:
             logger.debug("failed to capture error response: %s", err)
 
@@ -10,10 +10,8 @@ import logging
 import time
 from urllib.parse import urlparse
 
-from smello.capture import serialize_request_response
+from smello.capture import capture_http, should_send_http
 from smello.config import SmelloConfig
-from smello.transport import send_http
-from smello.utils import redact_query_params
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +45,15 @@ def patch_botocore(config: SmelloConfig) -> None:
         response = original_send(self, request)
         duration = time.monotonic() - start
 
+        if not should_send_http(
+            config,
+            host=host,
+            method=request.method,
+            status_code=response.status_code,
+            duration_s=duration,
+        ):
+            return response
+
         try:
             # Read the body — for non-streaming responses this is already
             # buffered; for streaming ones (e.g. S3 GetObject) we read what
@@ -67,25 +74,18 @@ def patch_botocore(config: SmelloConfig) -> None:
                     # File-like upload body — don't read it
                     request_body = "[file upload]"
 
-            payload = serialize_request_response(
+            capture_http(
                 config=config,
                 method=request.method,
                 url=request.url,
                 request_headers=_decode_headers(request.headers),
                 request_body=request_body,
                 status_code=response.status_code,
-                response_headers=dict(response.headers),
+                response_headers=response.headers,
                 response_body=response_body,
                 duration_s=duration,
                 library="botocore",
             )
-            send_http(payload)
-            logger.debug(
-                "captured %s %s via botocore (%d)",
-                request.method,
-                redact_query_params(request.url, config.redact_query_params),
-                response.status_code,
-            )
         except Exception as err:
             logger.debug("failed to capture botocore request: %s", err)
 
@@ -32,7 +32,8 @@ def patch_excepthook(config: SmelloConfig) -> None:
     original_excepthook = sys.excepthook
 
     def smello_excepthook(exc_type, exc_value, exc_tb):
-        capture_exception(exc_type, exc_value, exc_tb)
+        if config.allow("exception"):
+            capture_exception(exc_type, exc_value, exc_tb)
         transport.flush(timeout=2.0)
         original_excepthook(exc_type, exc_value, exc_tb)
 
@@ -45,7 +46,8 @@ def patch_excepthook(config: SmelloConfig) -> None:
     original_threading_excepthook = threading.excepthook
 
     def smello_threading_excepthook(args):
-        capture_exception(args.exc_type, args.exc_value, args.exc_traceback)
+        if config.allow("exception"):
+            capture_exception(args.exc_type, args.exc_value, args.exc_traceback)
         original_threading_excepthook(args)
 
     threading.excepthook = smello_threading_excepthook
@@ -3,7 +3,7 @@
 import logging
 import time
 
-from smello.capture import serialize_request_response
+from smello.capture import serialize_request_response, should_send_http
 from smello.config import SmelloConfig
 from smello.transport import send_http
 
@@ -187,6 +187,7 @@ def _intercept_unary_unary(config, target, continuation, client_call_details, re
         try:
             _send_capture(
                 config=config,
+                host=host,
                 method="POST",
                 url=url,
                 request_headers=request_headers,
@@ -204,6 +205,7 @@ def _intercept_unary_unary(config, target, continuation, client_call_details, re
     try:
         _send_capture(
             config=config,
+            host=host,
             method="POST",
             url=url,
             request_headers=request_headers,
@@ -222,6 +224,7 @@ def _intercept_unary_unary(config, target, continuation, client_call_details, re
 def _send_capture(
     *,
     config: SmelloConfig,
+    host: str,
     method: str,
     url: str,
     request_headers: dict,
@@ -231,6 +234,14 @@ def _send_capture(
     response_body: str,
     duration_s: float,
 ) -> None:
+    if not should_send_http(
+        config,
+        host=host,
+        method=method,
+        status_code=status_code,
+        duration_s=duration_s,
+    ):
+        return
     payload = serialize_request_response(
         config=config,
         method=method,
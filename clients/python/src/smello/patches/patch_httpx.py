@@ -14,10 +14,8 @@ import logging
 import time
 from urllib.parse import urlparse
 
-from smello.capture import serialize_request_response
+from smello.capture import capture_http, should_send_http
 from smello.config import SmelloConfig
-from smello.transport import send_http
-from smello.utils import redact_query_params
 
 logger = logging.getLogger(__name__)
 
@@ -74,7 +72,14 @@ def _make_sync_hooks(config: SmelloConfig) -> dict:
             logger.debug("skipped %s %s (ignored host)", response.request.method, host)
             return
         start = response.request.extensions.pop(_START_KEY, time.monotonic())
-        _wrap_sync_stream(response, start, config)
+        if should_send_http(
+            config,
+            host=host,
+            method=response.request.method,
+            status_code=response.status_code,
+            duration_s=time.monotonic() - start,
+        ):
+            _wrap_sync_stream(response, start, config)
 
     return {"request": [on_request], "response": [on_response]}
 
@@ -89,7 +94,14 @@ def _make_async_hooks(config: SmelloConfig) -> dict:
             logger.debug("skipped %s %s (ignored host)", response.request.method, host)
             return
         start = response.request.extensions.pop(_START_KEY, time.monotonic())
-        _wrap_async_stream(response, start, config)
+        if should_send_http(
+            config,
+            host=host,
+            method=response.request.method,
+            status_code=response.status_code,
+            duration_s=time.monotonic() - start,
+        ):
+            _wrap_async_stream(response, start, config)
 
     return {"request": [on_request], "response": [on_response]}
 
@@ -102,25 +114,18 @@ def _make_async_hooks(config: SmelloConfig) -> dict:
 def _send_capture(*, config, request, response, response_body, start):
     duration = time.monotonic() - start
     try:
-        payload = serialize_request_response(
+        capture_http(
             config=config,
             method=request.method,
             url=str(request.url),
-            request_headers=dict(request.headers),
+            request_headers=request.headers,
             request_body=request.content,
             status_code=response.status_code,
-            response_headers=dict(response.headers),
+            response_headers=response.headers,
             response_body=response_body,
             duration_s=duration,
             library="httpx",
         )
-        send_http(payload)
-        logger.debug(
-            "captured %s %s via httpx (%d)",
-            request.method,
-            redact_query_params(str(request.url), config.redact_query_params),
-            response.status_code,
-        )
     except Exception as err:
         logger.debug("failed to capture request: %s", err)
 
@@ -71,6 +71,8 @@ def patch_logging(config: SmelloConfig) -> None:
                 return
             if record.levelno < config.log_level:
                 return
+            if not config.allow("log"):
+                return
             _capture_log_record(record)
         except Exception:
             pass  # never interfere with logging
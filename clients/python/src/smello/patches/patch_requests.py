@@ -4,10 +4,8 @@ import logging
 import time
 from urllib.parse import urlparse
 
-from smello.capture import serialize_request_response
+from smello.capture import capture_http, should_send_http
 from smello.config import SmelloConfig
-from smello.transport import send_http
-from smello.utils import redact_query_params
 
 logger = logging.getLogger(__name__)
 
@@ -37,26 +35,28 @@ def patch_requests(config: SmelloConfig) -> None:
         response = original_send(self, prepared_request, **kwargs)
         duration = time.monotonic() - start
 
+        if not should_send_http(
+            config,
+            host=host,
+            method=prepared_request.method or "GET",
+            status_code=response.status_code,
+            duration_s=duration,
+        ):
+            return response
+
         try:
-            payload = serialize_request_response(
+            capture_http(
                 config=config,
                 method=prepared_request.method or "GET",
                 url=prepared_request.url,
-                request_headers=dict(prepared_request.headers),
+                request_headers=prepared_request.headers,
                 request_body=prepared_request.body,
                 status_code=response.status_code,
-                response_headers=dict(response.headers),
+                response_headers=response.headers,
                 response_body=response.content,
                 duration_s=duration,
                 library="requests",
             )
-            send_http(payload)
-            logger.debug(
-                "captured %s %s via requests (%d)",
-                prepared_request.method,
-                redact_query_params(prepared_request.url, config.redact_query_params),
-                response.status_code,
-            )
         except Exception as err:
             logger.debug("failed to capture request: %s", err)
 
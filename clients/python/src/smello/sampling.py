@@ -0,0 +1,37 @@
+"""Token-bucket rate limiting for captures."""
+
+import threading
+import time
+
+# Event types a rate limit can be set for.
+EVENT_TYPES = ("http", "http_incoming", "log", "exception")
+
+
+class TokenBucket:
+    """Allow on average ``rate`` events per second, in bursts of up to ``burst``.
+
+    ``burst`` defaults to one second's worth of events (at least one). A
+    ``rate`` of zero allows nothing. Safe to share between threads.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None) -> None:
+        self.rate = rate
+        if burst is None:
+            burst = max(rate, 1.0) if rate > 0 else 0.0
+        self.burst = burst
+        self._tokens = burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self) -> bool:
+        """Take one token. ``False`` means the event is over the limit."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.burst, self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
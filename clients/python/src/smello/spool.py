@@ -0,0 +1,202 @@
+"""Append-only disk spool for captures the server could not take.
+
+The spool is a directory of segment files, one JSON capture per line. Each
+process appends to its own ``.part`` segment and seals it (renames it to
+``.jsonl``) once it reaches the segment size or replay needs it. Replay
+claims the oldest sealed segment by renaming it to ``.sending``, so
+processes sharing a directory never replay the same segment at once.
+
+Captures carry ids and the server ignores ids it already has, so a segment
+that is replayed again after a crash only costs bandwidth.
+"""
+
+import logging
+import os
+import threading
+import time
+from pathlib import Path
+from typing import BinaryIO
+
+logger = logging.getLogger(__name__)
+
+# Total size of all segments in the directory. Appends past it are refused.
+MAX_BYTES = 256 * 1024 * 1024
+SEGMENT_BYTES = 4 * 1024 * 1024
+# A .part or .sending segment untouched this long (seconds) was left behind
+# by a process that died; it is sealed again so someone can replay it.
+STALE_AFTER = 300.0
+
+
+class Spool:
+    """A size-capped directory of line-oriented segment files.
+
+    `append` is safe to call from any thread; `claim` and `release` are
+    meant for the transport worker.
+    """
+
+    def __init__(
+        self,
+        directory: str | os.PathLike,
+        max_bytes: int = MAX_BYTES,
+        segment_bytes: int = SEGMENT_BYTES,
+    ) -> None:
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.segment_bytes = segment_bytes
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._part: Path | None = None
+        self._file: BinaryIO | None = None
+        self._part_bytes = 0
+        self._recover()
+        self.bytes = self._scan()
+
+    def append(self, lines: list[bytes]) -> int:
+        """Append *lines* (without trailing newlines) to this process's segment.
+
+        Stops at the first line that would take the spool past ``max_bytes``
+        and returns how many lines were written. Lines reach the OS page
+        cache but are not fsynced.
+        """
+        written = 0
+        with self._lock:
+            if self._part is not None and not self._part.exists():
+                # Another process sealed it as stale; start a new segment.
+                self._close_file()
+            pending: list[bytes] = []
+            for line in lines:
+                size = len(line) + 1
+                if self.bytes + size > self.max_bytes:
+                    break
+                if self._file is not None and (
+                    self._part_bytes + size > self.segment_bytes
+                ):
+                    self._write(pending)
+                    self._seal()
+                if self._file is None:
+                    self._open()
+                pending.append(line + b"\n")
+                self._part_bytes += size
+                self.bytes += size
+                written += 1
+            self._write(pending)
+        return written
+
+    def claim(self) -> tuple[Path, list[bytes]] | None:
+        """Claim the oldest sealed segment and return ``(path, lines)``.
+
+        If no segment is sealed, this process's own segment is sealed
+        first. Returns ``None`` when there is nothing to replay.
+        """
+        with self._lock:
+            segments = sorted(self.directory.glob("*.jsonl"))
+            if not segments:
+                self._recover()
+                if self._part_bytes:
+                    self._seal()
+                segments = sorted(self.directory.glob("*.jsonl"))
+            self.bytes = self._scan()
+        for path in segments:
+            claimed = path.with_suffix(".sending")
+            try:
+                path.rename(claimed)
+                # Renaming keeps the old mtime; refresh it so the claim
+                # does not look stale to other processes.
+                os.utime(claimed)
+                return claimed, claimed.read_bytes().splitlines()
+            except OSError:
+                continue  # another process claimed it first
+        return None
+
+    def release(self, path: Path, remaining: list[bytes]) -> None:
+        """Finish with a claimed segment, putting *remaining* lines back."""
+        with self._lock:
+            try:
+                before = path.stat().st_size
+                if remaining:
+                    data = b"".join(line + b"\n" for line in remaining)
+                    path.write_bytes(data)
+                    path.rename(path.with_suffix(".jsonl"))
+                    self.bytes -= before - len(data)
+                else:
+                    path.unlink()
+                    self.bytes -= before
+            except OSError as err:
+                logger.debug("failed to release spool segment %s: %s", path, err)
+
+    def close(self) -> None:
+        """Seal this process's segment so any process can replay it."""
+        with self._lock:
+            if self._part_bytes:
+                self._seal()
+            else:
+                part = self._part
+                self._close_file()
+                if part is not None:
+                    part.unlink(missing_ok=True)
+
+    def after_fork(self) -> None:
+        """Leave the parent's segment to the parent in a forked child.
+
+        The child starts its own segment on its next append. The inherited
+        file is unbuffered, so dropping it writes nothing.
+        """
+        self._lock = threading.Lock()
+        self._file = None
+        self._part = None
+        self._part_bytes = 0
+
+    def _open(self) -> BinaryIO:
+        self._part = self.directory / f"{time.time_ns():020d}-{os.getpid()}.part"
+        # Unbuffered: a forked child dropping its inherited copy of this
+        # file must not flush half-written lines into the parent's segment.
+        self._file = self._part.open("ab", buffering=0)
+        self._part_bytes = 0
+        return self._file
+
+    def _write(self, pending: list[bytes]) -> None:
+        """Write *pending* lines to the open segment in one call and clear it."""
+        if pending and self._file is not None:
+            data = memoryview(b"".join(pending))
+            while data:
+                data = data[self._file.write(data) :]
+        pending.clear()
+
+    def _seal(self) -> None:
+        part = self._part
+        self._close_file()
+        if part is not None:
+            try:
+                part.rename(part.with_suffix(".jsonl"))
+            except OSError as err:
+                logger.debug("failed to seal spool segment %s: %s", part, err)
+
+    def _close_file(self) -> None:
+        if self._file is not None:
+            self._file.close()
+        self._file = None
+        self._part = None
+        self._part_bytes = 0
+
+    def _recover(self) -> None:
+        """Seal segments that dead processes left open or half-replayed."""
+        cutoff = time.time() - STALE_AFTER
+        for pattern in ("*.part", "*.sending"):
+            for path in self.directory.glob(pattern):
+                if path == self._part:
+                    continue
+                try:
+                    if path.stat().st_mtime < cutoff:
+                        path.rename(path.with_suffix(".jsonl"))
+                        logger.debug("recovered stale spool segment %s", path)
+                except OSError:
+                    continue
+
+    def _scan(self) -> int:
+        total = 0
+        for path in self.directory.iterdir():
+            try:
+                total += path.stat().st_size
+            except OSError:
+                continue
+        return total
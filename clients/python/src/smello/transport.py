@@ -1,55 +1,394 @@
 """Background transport: sends captured events to the Smello server without blocking."""
 
+import asyncio
+import collections
+import gzip
+import http.client
 import json
 import logging
+import os
 import queue
+import socket
 import threading
-import urllib.request
+import time
+import urllib.parse
+import weakref
+from collections.abc import Callable
+from pathlib import Path
+
+import smello
+from smello.spool import MAX_BYTES as SPOOL_MAX_BYTES
+from smello.spool import Spool
 
 logger = logging.getLogger(__name__)
 
-# Each queue item is (path, payload). The worker uses the path to choose
-# the typed capture endpoint.
-_queue: queue.Queue[tuple[str, dict]] = queue.Queue(maxsize=1000)
+# A payload, or a zero-argument callable that builds one. Callables run on
+# the worker thread, so patches can queue raw references and leave
+# serialization off the caller's thread.
+Payload = dict | Callable[[], dict]
+
+# Queue capacity. A full queue applies the overflow policy to new captures.
+MAX_EVENTS = 1000
+MAX_BYTES = 64 * 1024 * 1024
+# What to do with a capture that does not fit: drop it, drop the oldest
+# queued captures to make room, wait up to the block timeout for room, or
+# write it to the disk spool.
+OVERFLOW_POLICIES = ("drop_newest", "drop_oldest", "block", "spill")
+BLOCK_TIMEOUT = 0.1
+# Bytes counted for a capture besides its strings: ids, timestamps, keys.
+EVENT_OVERHEAD = 512
+
+
+class _CaptureQueue(queue.Queue):
+    """A queue bounded by item count and by approximate payload bytes.
+
+    Items are ``(event_type, payload, size)``. Unlike `queue.Queue`, a full
+    queue applies an overflow policy in `offer` instead of raising.
+    """
+
+    def __init__(self, max_events: int, max_bytes: int) -> None:
+        super().__init__()
+        self.max_events = max_events
+        self.max_bytes = max_bytes
+        self.bytes = 0
+
+    def _put(self, item: tuple[str, Payload, int]) -> None:
+        self.queue.append(item)
+        self.bytes += item[2]
+
+    def _get(self) -> tuple[str, Payload, int]:
+        item = self.queue.popleft()
+        self.bytes -= item[2]
+        return item
+
+    def _full_for(self, size: int) -> bool:
+        # A lone capture larger than max_bytes still fits in an empty queue.
+        return len(self.queue) >= self.max_events or (
+            bool(self.queue) and self.bytes + size > self.max_bytes
+        )
+
+    def offer(
+        self, item: tuple[str, Payload, int], policy: str, timeout: float
+    ) -> list[tuple[str, Payload, int]]:
+        """Queue *item*, applying *policy* if it does not fit.
+
+        Returns the items dropped, which may include *item* itself.
+        """
+        with self.not_full:
+            return self._offer(item, policy, timeout)
+
+    def offer_many(
+        self, items: list[tuple[str, Payload, int]], policy: str, timeout: float
+    ) -> list[tuple[str, Payload, int]]:
+        """Queue *items* in order under one lock acquisition, like `offer`."""
+        dropped = []
+        with self.not_full:
+            if policy != "drop_newest":
+                for item in items:
+                    dropped += self._offer(item, policy, timeout)
+                return dropped
+            queued = 0
+            for item in items:
+                if self._full_for(item[2]):
+                    dropped.append(item)
+                else:
+                    self._put(item)
+                    queued += 1
+            if queued:
+                self.unfinished_tasks += queued
+                self.not_empty.notify(queued)
+        return dropped
+
+    def _offer(
+        self, item: tuple[str, Payload, int], policy: str, timeout: float
+    ) -> list[tuple[str, Payload, int]]:
+        # Called with the mutex held.
+        size = item[2]
+        dropped = []
+        if policy == "drop_oldest":
+            while self._full_for(size):
+                dropped.append(self._get())
+                self.unfinished_tasks -= 1
+            if dropped and not self.unfinished_tasks:
+                self.all_tasks_done.notify_all()
+        elif policy == "block":
+            deadline = time.monotonic() + timeout
+            while self._full_for(size):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return [item]
+                self.not_full.wait(remaining)
+        elif self._full_for(size):
+            return [item]
+        self._put(item)
+        self.unfinished_tasks += 1
+        self.not_empty.notify()
+        return dropped
+
+
+class _LoopBuffer:
+    """Captures made on one thread's running event loop, not yet queued.
+
+    Appending to the deque takes no lock and never wakes the worker. The
+    buffer moves to the capture queue in one `offer_many` at the end of
+    the loop iteration, or as soon as it holds a full batch, so async
+    apps pay one cross-thread handoff per batch instead of per capture.
+    """
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.items: collections.deque[tuple[str, Payload, int]] = collections.deque()
+        self.scheduled = False
+
+    def add(self, item: tuple[str, Payload, int]) -> None:
+        self.items.append(item)
+        if len(self.items) >= _batch_size:
+            self.drain()
+        elif not self.scheduled:
+            self.scheduled = True
+            self.loop.call_soon(self.drain)
+
+    def drain(self) -> None:
+        """Queue everything buffered. Safe to call from any thread."""
+        self.scheduled = False
+        items = []
+        try:
+            while True:
+                items.append(self.items.popleft())
+        except IndexError:
+            pass
+        if items:
+            _offer(items)
+
+
+# The worker drains items into batches for `/api/capture/batch`; a batch of
+# one goes to the typed `/api/capture/{event_type}` endpoint instead.
+_queue = _CaptureQueue(MAX_EVENTS, MAX_BYTES)
+_overflow_policy: str = "drop_newest"
+_block_timeout: float = BLOCK_TIMEOUT
 _server_url: str = ""
 _app: str = ""
 _session: str = ""
 _started: bool = False
 
+# Captures made with an event loop running go through a per-thread
+# _LoopBuffer first. `flush` drains every live buffer.
+_loop_local = threading.local()
+_loop_buffers: weakref.WeakSet[_LoopBuffer] = weakref.WeakSet()
+
+# Batching: after the first item arrives, keep draining until the batch
+# holds BATCH_SIZE items or BATCH_WAIT seconds have passed.
+BATCH_SIZE = 100
+BATCH_WAIT = 0.02
+_batch_size: int = BATCH_SIZE
+_batch_wait: float = BATCH_WAIT
+# Flipped off when the server predates `/api/capture/batch`.
+_batch_supported: bool = True
+
+# Delivery counters per event type: {event_type: {"sent", "dropped", "failed"}}.
+# Reported to the server at most every STATS_INTERVAL seconds, when changed.
+STATS_INTERVAL = 10.0
+_stats_interval: float = STATS_INTERVAL
+_counts: dict[str, dict[str, int]] = {}
+_counts_lock = threading.Lock()
+_counts_changed: bool = False
+_last_report: float = 0.0
+# Flipped off when the server predates `/api/capture/stats`.
+_stats_supported: bool = True
+
+# Disk spool for captures the server could not take. After a failed send
+# the worker spools new batches without trying the server for
+# RETRY_INTERVAL seconds, then replays the spool once a send succeeds.
+RETRY_INTERVAL = 1.0
+_spool: Spool | None = None
+_down_until: float = 0.0
+_next_replay: float = 0.0
+_replay_path: Path | None = None
+_replay_lines: list[bytes] = []
+
+# Optional gzip of request bodies of at least GZIP_MIN_BYTES. Flipped off
+# when the server predates `Content-Encoding: gzip` support.
+GZIP_MIN_BYTES = 1024
+_compress: bool = False
+_gzip_supported: bool = True
+
+# Keep-alive connections to the server, one per worker and sender thread.
+# Built on http.client directly so they never go through a patched HTTP
+# library.
+_TIMEOUT = 5
+_connections = threading.local()
+
+# Sender pool. With more than one worker, the worker thread only drains the
+# queue and hands each batch to a sender thread, so up to `_workers`
+# requests are in flight at once. Each sender holds at most SENDER_BACKLOG
+# waiting batches; past that the worker waits, the queue fills up, and the
+# overflow policy applies. Captures of ORDERED_EVENT_TYPES always go to the
+# same sender, so they reach the server in the order they were captured.
+WORKERS = 1
+SENDER_BACKLOG = 2
+ORDERED_EVENT_TYPES = ("log", "exception")
+_workers: int = WORKERS
+_senders: list[queue.Queue] = []
+
 
-def start_worker(server_url: str, *, app: str = "", session: str = "") -> None:
-    """Start the background worker thread."""
-    global _server_url, _app, _session, _started
+class _ServerError(Exception):
+    """The server answered a capture POST with a non-2xx status."""
+
+    def __init__(self, status: int, reason: str) -> None:
+        super().__init__(f"HTTP {status}: {reason}")
+        self.status = status
+
+
+def start_worker(
+    server_url: str,
+    *,
+    app: str = "",
+    session: str = "",
+    batch_size: int = BATCH_SIZE,
+    batch_wait: float = BATCH_WAIT,
+    max_events: int = MAX_EVENTS,
+    max_bytes: int = MAX_BYTES,
+    overflow_policy: str = "drop_newest",
+    block_timeout: float = BLOCK_TIMEOUT,
+    stats_interval: float = STATS_INTERVAL,
+    spool_dir: str | os.PathLike | None = None,
+    spool_max_bytes: int = SPOOL_MAX_BYTES,
+    compress: bool = False,
+    workers: int = WORKERS,
+) -> None:
+    """Start the background worker thread.
+
+    ``batch_size`` caps how many captures go out in one request, and
+    ``batch_wait`` is how long (in seconds) the worker lingers for more
+    captures once the first one is queued. ``batch_size=1`` disables
+    batching and sends every capture to its typed endpoint.
+
+    The queue holds at most ``max_events`` captures and about ``max_bytes``
+    bytes of payload. ``overflow_policy`` (one of `OVERFLOW_POLICIES`)
+    decides what happens to a capture that does not fit; with ``"block"``
+    the caller waits up to ``block_timeout`` seconds before dropping it.
+    Delivery counters are reported every ``stats_interval`` seconds.
+
+    With ``spool_dir`` set, captures that fail to send because the server
+    is unreachable or erroring are written to a spool in that directory,
+    holding at most ``spool_max_bytes``, and replayed once the server is
+    back. ``"spill"`` requires a spool and otherwise acts as
+    ``"drop_newest"``.
+
+    ``compress`` gzips request bodies of at least ``GZIP_MIN_BYTES``.
+
+    ``workers`` is how many requests may be in flight to the server at
+    once. With more than one, batches are sent from a pool of sender
+    threads; see `ORDERED_EVENT_TYPES`.
+    """
+    global _server_url, _app, _session, _started, _workers
+    global _batch_size, _batch_wait, _batch_supported, _stats_supported
+    global _overflow_policy, _block_timeout, _stats_interval, _last_report
+    global _compress, _gzip_supported
+    if overflow_policy not in OVERFLOW_POLICIES:
+        raise ValueError(
+            f"Unknown overflow policy {overflow_policy!r},"
+            f" expected one of {', '.join(OVERFLOW_POLICIES)}"
+        )
+    if server_url != _server_url:
+        _batch_supported = True
+        _stats_supported = True
+        _gzip_supported = True
     _server_url = server_url
     _app = app
     _session = session
+    _batch_size = max(1, batch_size)
+    _batch_wait = max(0.0, batch_wait)
+    with _queue.mutex:
+        _queue.max_events = max(1, max_events)
+        _queue.max_bytes = max(1, max_bytes)
+        _queue.not_full.notify_all()
+    _overflow_policy = overflow_policy
+    _block_timeout = max(0.0, block_timeout)
+    _stats_interval = max(0.0, stats_interval)
+    _set_spool(spool_dir, spool_max_bytes)
+    _compress = compress
+    _workers = max(1, workers)
 
     if _started:
         return
     _started = True
+    _start_thread()
 
+
+def _start_thread() -> None:
+    global _last_report
+    _last_report = time.monotonic()
     thread = threading.Thread(target=_worker, daemon=True, name="smello-transport")
     thread.start()
 
 
-def send_http(payload: dict) -> None:
-    """Queue an HTTP capture payload for `/api/capture/http`."""
-    _enqueue("/api/capture/http", payload)
+def _after_fork_in_child() -> None:
+    """Give a forked child its own queue, locks, connection, and worker.
+
+    The child inherits the parent's module state but not its worker
+    thread, and any lock another thread held at fork time stays held
+    forever. Everything shared with the parent is replaced: the parent
+    still sends the captures queued before the fork, owns the keep-alive
+    socket and the spool segment it was writing or replaying, and the
+    child reports its own counters under its own pid.
+    """
+    global _queue, _counts, _counts_lock, _counts_changed
+    global _connections, _senders, _replay_path, _replay_lines
+    global _loop_local, _loop_buffers
+    _queue = _CaptureQueue(_queue.max_events, _queue.max_bytes)
+    _loop_local = threading.local()
+    _loop_buffers = weakref.WeakSet()
+    _counts = {}
+    _counts_lock = threading.Lock()
+    _counts_changed = False
+    # Dropped, not closed: closing would only close the child's copy of the
+    # socket anyway, and the parent keeps using it.
+    _connections = threading.local()
+    _senders = []
+    _replay_path = None
+    _replay_lines = []
+    if _spool is not None:
+        _spool.after_fork()
+    if _started:
+        _start_thread()
+
+
+def send_http(payload: Payload, *, size: int | None = None) -> None:
+    """Queue an HTTP capture payload for `/api/capture/http`.
+
+    *payload* may be a callable that builds the payload; the worker calls
+    it just before sending. *size* is the payload's approximate size in
+    bytes, counted against the queue's byte limit; by default it is
+    estimated from the payload's strings.
+    """
+    _enqueue("http", payload, size)
 
 
 def send_log(payload: dict) -> None:
     """Queue a log capture payload for `/api/capture/log`."""
-    _enqueue("/api/capture/log", payload)
+    _enqueue("log", payload)
 
 
 def send_http_incoming(payload: dict) -> None:
     """Queue an incoming HTTP capture payload for `/api/capture/http_incoming`."""
-    _enqueue("/api/capture/http_incoming", payload)
+    _enqueue("http_incoming", payload)
 
 
 def send_exception(payload: dict) -> None:
     """Queue an exception capture payload for `/api/capture/exception`."""
-    _enqueue("/api/capture/exception", payload)
+    _enqueue("exception", payload)
+
+
+def stats() -> dict[str, dict[str, int]]:
+    """Return delivery counters per event type since the process started.
+
+    Each event type maps to ``{"sent": n, "dropped": n, "failed": n}``:
+    captures the server accepted, captures dropped because the queue was
+    full, and captures that could not be built or delivered.
+    """
+    with _counts_lock:
+        return {event_type: dict(counts) for event_type, counts in _counts.items()}
 
 
 def flush(timeout: float = 2.0) -> bool:
@@ -57,6 +396,8 @@ def flush(timeout: float = 2.0) -> bool:
 
     Returns ``True`` if the queue drained in time, ``False`` otherwise.
     """
+    for buffer in list(_loop_buffers):
+        buffer.drain()
     # Queue.join() has no timeout parameter. Access the underlying
     # condition variable directly — same technique Sentry's SDK uses.
     with _queue.all_tasks_done:
@@ -83,38 +424,505 @@ def shutdown(timeout: float = 2.0) -> bool:
     Returns ``True`` if the queue drained in time, ``False`` otherwise.
     """
     logger.debug("shutting down transport")
-    return flush(timeout=timeout)
+    drained = flush(timeout=timeout)
+    if _spool is not None:
+        _spool.close()
+    return drained
 
 
-def _enqueue(path: str, payload: dict) -> None:
+def _set_spool(spool_dir: str | os.PathLike | None, max_bytes: int) -> None:
+    global _spool
+    if _spool is not None:
+        if spool_dir is not None and _spool.directory == Path(spool_dir):
+            _spool.max_bytes = max(1, max_bytes)
+            return
+        _spool.close()
+        _spool = None
+    if spool_dir is None:
+        return
     try:
-        _queue.put_nowait((path, {**payload, "app": _app, "session": _session}))
-    except queue.Full:
-        logger.warning("Payload dropped: capture queue is full")
+        _spool = Spool(spool_dir, max_bytes=max(1, max_bytes))
+    except OSError as err:
+        logger.warning("Cannot use capture spool %s: %s", spool_dir, err)
+
+
+def _enqueue(event_type: str, payload: Payload, size: int | None = None) -> None:
+    if size is None:
+        size = _estimate_size(payload) if isinstance(payload, dict) else EVENT_OVERHEAD
+    item = (event_type, payload, size)
+    # Non-raising get_running_loop(): most captures come from sync code, and
+    # raising and catching RuntimeError on every one would cost more.
+    loop = asyncio._get_running_loop()
+    if loop is None:
+        _offer([item])
+        return
+    buffer = getattr(_loop_local, "buffer", None)
+    if buffer is None or buffer.loop is not loop:
+        # A new loop on this thread; the old one has stopped running.
+        if buffer is not None:
+            buffer.drain()
+        buffer = _loop_local.buffer = _LoopBuffer(loop)
+        _loop_buffers.add(buffer)
+    buffer.add(item)
+
+
+def _offer(items: list[tuple[str, Payload, int]]) -> None:
+    """Queue *items*, spilling or counting whatever the queue turns away."""
+    spill = _overflow_policy == "spill" and _spool is not None
+    policy = "drop_newest" if _overflow_policy == "spill" else _overflow_policy
+    dropped = _queue.offer_many(items, policy, _block_timeout)
+    if not dropped:
+        return
+    if spill:
+        # Runs on the caller's thread, but only while the queue is full.
+        _spool_batch(_render(dropped))
+        return
+    for dropped_type, _, _ in dropped:
+        _count(dropped_type, "dropped")
+    total = sum(counts["dropped"] for counts in stats().values())
+    # Warn on the first drop, then every 1000th, so a burst doesn't flood stderr.
+    if total == len(dropped) or total // 1000 != (total - len(dropped)) // 1000:
+        logger.warning(
+            "Capture queue is full (%s): %d capture(s) dropped so far",
+            _overflow_policy,
+            total,
+        )
+
+
+def _estimate_size(payload: dict) -> int:
+    """Approximate *payload*'s size from its strings, one level of nesting deep."""
+    size = EVENT_OVERHEAD
+    for value in payload.values():
+        if isinstance(value, dict):
+            for inner in value.values():
+                if isinstance(inner, (str, bytes)):
+                    size += len(inner)
+        elif isinstance(value, (str, bytes)):
+            size += len(value)
+    return size
+
+
+def _count(event_type: str, outcome: str, n: int = 1) -> None:
+    global _counts_changed
+    with _counts_lock:
+        counts = _counts.setdefault(event_type, {"sent": 0, "dropped": 0, "failed": 0})
+        counts[outcome] += n
+        _counts_changed = True
 
 
 def _worker() -> None:
     """Background worker that sends queued payloads to the server."""
     while True:
-        path, payload = _queue.get()
+        batch = _next_batch(_idle_timeout())
+        try:
+            if batch and _workers > 1:
+                _dispatch(batch)
+            elif batch:
+                _send_batch(_render(batch))
+            _replay()
+            _report_stats()
+        except Exception as err:
+            logger.debug("transport worker error: %s", err)
+        finally:
+            # Captures handed to a sender are marked done by the sender.
+            for _ in batch:
+                _queue.task_done()
+
+
+def _dispatch(batch: list[tuple[str, Payload, int]]) -> None:
+    """Split *batch* between the senders, starting any that are missing.
+
+    Ordered captures go to the sender picked by their event type; the rest
+    join the least busy sender's share. Blocks while a chosen sender
+    already has ``SENDER_BACKLOG`` batches waiting. Captures are removed
+    from *batch* as they are handed over, so on error it holds the rest.
+    """
+    while len(_senders) < _workers:
+        inbox: queue.Queue = queue.Queue(SENDER_BACKLOG)
+        name = f"smello-sender-{len(_senders)}"
+        threading.Thread(target=_sender, args=(inbox,), daemon=True, name=name).start()
+        _senders.append(inbox)
+    senders = _senders[:_workers]
+    shares: dict[int, list[tuple[str, Payload, int]]] = {}
+    unordered = []
+    for item in batch:
+        if item[0] in ORDERED_EVENT_TYPES:
+            index = ORDERED_EVENT_TYPES.index(item[0]) % len(senders)
+            shares.setdefault(index, []).append(item)
+        else:
+            unordered.append(item)
+    if unordered:
+        # unfinished_tasks counts the batch a sender is busy with, too.
+        idle = min(range(len(senders)), key=lambda i: senders[i].unfinished_tasks)
+        shares.setdefault(idle, []).extend(unordered)
+    for index, share in shares.items():
+        senders[index].put(share)
+        handed = {id(item) for item in share}
+        batch[:] = [item for item in batch if id(item) not in handed]
+
+
+def _sender(inbox: queue.Queue) -> None:
+    """Sender thread: sends the batches `_dispatch` hands it, in order."""
+    while True:
+        batch = inbox.get()
+        try:
+            _send_batch(_render(batch))
+        except Exception as err:
+            logger.debug("transport sender error: %s", err)
+        finally:
+            for _ in batch:
+                _queue.task_done()
+            inbox.task_done()
+
+
+def _next_batch(timeout: float | None = None) -> list[tuple[str, Payload, int]]:
+    """Block for the next item, then drain up to ``_batch_size`` items.
+
+    Stops early once ``_batch_wait`` seconds have passed since the first
+    item arrived, so a lone capture is never held back for long. Returns
+    an empty batch if nothing arrives within *timeout* seconds, so the
+    worker still gets to report its counters and replay the spool.
+    """
+    try:
+        batch = [_queue.get(timeout=timeout)]
+    except queue.Empty:
+        return []
+    deadline = time.monotonic() + _batch_wait
+    while len(batch) < _batch_size:
+        remaining = deadline - time.monotonic()
         try:
-            _send_to_server(path, payload)
+            if remaining > 0:
+                batch.append(_queue.get(timeout=remaining))
+            else:
+                batch.append(_queue.get_nowait())
+        except queue.Empty:
+            break
+    return batch
+
+
+def _idle_timeout() -> float | None:
+    """How long the worker may wait for captures before it has other work."""
+    waits = [_stats_interval] if _stats_interval else []
+    if _spool is not None:
+        ready = _down_until if _replay_lines else max(_down_until, _next_replay)
+        waits.append(max(0.0, ready - time.monotonic()))
+    return min(waits, default=None)
+
+
+def _render(batch: list[tuple[str, Payload, int]]) -> list[tuple[str, dict]]:
+    """Build deferred payloads and tag every payload with the app and session.
+
+    A payload that fails to build is dropped with a debug log, like a
+    capture that fails in the patch itself.
+    """
+    rendered = []
+    for event_type, payload, _ in batch:
+        if callable(payload):
+            try:
+                payload = payload()
+            except Exception as err:
+                logger.debug("failed to capture %s event: %s", event_type, err)
+                _count(event_type, "failed")
+                continue
+        rendered.append((event_type, {**payload, "app": _app, "session": _session}))
+    return rendered
+
+
+def _send_batch(batch: list[tuple[str, dict]]) -> None:
+    """Send *batch* in one request, falling back to one request per item.
+
+    While the server is known to be down, the batch goes straight to the
+    spool.
+    """
+    global _batch_supported
+    if not batch:
+        return
+    if _spool is not None and time.monotonic() < _down_until:
+        _spool_batch(batch)
+        return
+    if len(batch) > 1 and _batch_supported:
+        events = [
+            {**payload, "event_type": event_type} for event_type, payload in batch
+        ]
+        try:
+            _send_to_server("/api/capture/batch", {"events": events})
+            _count_batch(batch, "sent")
+            return
+        except Exception as err:
+            # 404 from the API router, 405 from the SPA static mount: either
+            # way this server has no batch endpoint.
+            if not _is_missing_endpoint(err):
+                _send_failed(batch, err)
+                return
+            logger.debug("batch endpoint unavailable, sending captures one by one")
+            _batch_supported = False
+
+    for i, (event_type, payload) in enumerate(batch):
+        try:
+            _send_to_server(f"/api/capture/{event_type}", payload)
+            _count(event_type, "sent")
         except Exception as err:
-            logger.warning("Failed to send capture to %s: %s", _server_url, err)
-        _queue.task_done()
+            if _spool is not None and _is_retryable(err):
+                _send_failed(batch[i:], err)
+                return
+            _send_failed([(event_type, payload)], err)
+
+
+def _send_failed(batch: list[tuple[str, dict]], err: Exception) -> None:
+    """Spool *batch* if the failure may pass, else count it as failed."""
+    global _down_until
+    if _spool is not None and _is_retryable(err):
+        if time.monotonic() >= _down_until:
+            logger.warning(
+                "Smello server at %s is unavailable (%s), spooling captures to %s",
+                _server_url,
+                err,
+                _spool.directory,
+            )
+        _down_until = time.monotonic() + RETRY_INTERVAL
+        _spool_batch(batch)
+        return
+    if len(batch) > 1:
+        logger.warning(
+            "Failed to send %d captures to %s: %s", len(batch), _server_url, err
+        )
+    else:
+        logger.warning("Failed to send capture to %s: %s", _server_url, err)
+    _count_batch(batch, "failed")
+
+
+def _is_retryable(err: Exception) -> bool:
+    """Whether *err* means the server is unreachable or overloaded."""
+    return not isinstance(err, _ServerError) or err.status >= 500
+
+
+def _spool_batch(batch: list[tuple[str, dict]]) -> None:
+    """Write *batch* to the spool; captures that do not fit count as failed."""
+    if _spool is None or not batch:
+        return
+    lines = [
+        _encode({**payload, "event_type": event_type}) for event_type, payload in batch
+    ]
+    written = _spool.append(lines)
+    logger.debug("spooled %d capture(s)", written)
+    if written < len(batch):
+        logger.warning(
+            "Capture spool %s is full, %d capture(s) not kept",
+            _spool.directory,
+            len(batch) - written,
+        )
+        _count_batch(batch[written:], "failed")
+
+
+def _replay() -> None:
+    """Send the next ``_batch_size`` spooled captures, if the server is up.
+
+    Claims one segment at a time and puts whatever is left back if the
+    server goes away again.
+    """
+    global _replay_path, _replay_lines, _next_replay
+    now = time.monotonic()
+    if _spool is None or now < _down_until:
+        return
+    if _replay_path is None:
+        if now < _next_replay:
+            return
+        claimed = _spool.claim()
+        if claimed is None:
+            _next_replay = now + RETRY_INTERVAL
+            return
+        _replay_path, _replay_lines = claimed
+        logger.debug("replaying %d spooled capture(s)", len(_replay_lines))
+    chunk = _replay_lines[:_batch_size]
+    _replay_lines = _replay_lines[_batch_size:]
+    batch = []
+    for line in chunk:
+        try:
+            event = json.loads(line)
+            batch.append((event.pop("event_type"), event))
+        except (ValueError, KeyError, AttributeError):
+            # A torn last line from a process that died mid-write.
+            logger.debug("skipped unreadable spooled capture")
+    _send_batch(batch)
+    if not _replay_lines or time.monotonic() < _down_until:
+        _spool.release(_replay_path, _replay_lines)
+        _replay_path = None
+        _replay_lines = []
+
+
+def _count_batch(batch: list[tuple[str, dict]], outcome: str) -> None:
+    for event_type, _ in batch:
+        _count(event_type, outcome)
+
+
+def _is_missing_endpoint(err: Exception) -> bool:
+    return isinstance(err, _ServerError) and err.status in (404, 405)
+
+
+def _report_stats() -> None:
+    """POST the delivery counters to `/api/capture/stats` if they changed.
+
+    Reports at most every ``_stats_interval`` seconds. Counters are totals
+    since the process started, so a lost report costs nothing.
+    """
+    global _counts_changed, _last_report, _stats_supported
+    if not _stats_supported or not _counts_changed:
+        return
+    if time.monotonic() - _last_report < _stats_interval:
+        return
+    with _counts_lock:
+        _counts_changed = False
+    _last_report = time.monotonic()
+    report = {
+        "client_id": f"{socket.gethostname()}:{os.getpid()}",
+        "app": _app,
+        "session": _session,
+        "smello_version": smello.__version__,
+        "events": stats(),
+    }
+    try:
+        _send_to_server("/api/capture/stats", report)
+    except Exception as err:
+        if _is_missing_endpoint(err):
+            logger.debug("stats endpoint unavailable, not reporting counters")
+            _stats_supported = False
+        else:
+            logger.debug("failed to report capture counters: %s", err)
+            # Try again next interval, even if the counters don't change.
+            with _counts_lock:
+                _counts_changed = True
 
 
 def _send_to_server(path: str, payload: dict) -> None:
-    """Send a payload to the Smello server using urllib (to avoid recursion)."""
-    data = json.dumps(payload, default=_json_default).encode("utf-8")
-    req = urllib.request.Request(
-        f"{_server_url}{path}",
-        data=data,
-        headers={"Content-Type": "application/json"},
-        method="POST",
-    )
-    resp = urllib.request.urlopen(req, timeout=5)
-    logger.debug("sent %s (%d)", path, resp.status)
+    """POST a payload to the Smello server over the keep-alive connection.
+
+    Uses http.client directly (to avoid recursion through patched
+    libraries). If a reused connection turns out to be stale — the server
+    closed it while idle — the request is retried once on a fresh one.
+
+    With compression on, large bodies are gzipped. A server that answers a
+    gzipped body with 415, or with 422 because it tried to parse it as
+    JSON, gets it again uncompressed; if that works, compression stays off
+    for this server.
+    """
+    global _gzip_supported
+    data = _encode(payload)
+    if _compress and _gzip_supported and len(data) >= GZIP_MIN_BYTES:
+        status, reason = _request(path, gzip.compress(data, 1, mtime=0), gzipped=True)
+        if status not in (415, 422):
+            _check_status(path, status, reason)
+            return
+        status, reason = _request(path, data)
+        if 200 <= status < 300:
+            logger.debug("server does not accept gzip, sending uncompressed")
+            _gzip_supported = False
+    else:
+        status, reason = _request(path, data)
+    _check_status(path, status, reason)
+
+
+def _request(path: str, data: bytes, *, gzipped: bool = False) -> tuple[int, str]:
+    conn, prefix, reused = _get_connection()
+    try:
+        return _post(conn, prefix + path, data, gzipped)
+    except (http.client.HTTPException, OSError):
+        _close_connection()
+        if not reused:
+            raise
+        logger.debug("connection to %s went stale, reconnecting", _server_url)
+        conn, prefix, _ = _get_connection()
+        try:
+            return _post(conn, prefix + path, data, gzipped)
+        except (http.client.HTTPException, OSError):
+            _close_connection()
+            raise
+
+
+def _check_status(path: str, status: int, reason: str) -> None:
+    logger.debug("sent %s (%d)", path, status)
+    if not 200 <= status < 300:
+        raise _ServerError(status, reason)
+
+
+def _post(
+    conn: http.client.HTTPConnection, path: str, data: bytes, gzipped: bool = False
+) -> tuple[int, str]:
+    headers = {"Content-Type": "application/json"}
+    if gzipped:
+        headers["Content-Encoding"] = "gzip"
+    conn.request("POST", path, body=data, headers=headers)
+    resp = conn.getresponse()
+    # The body must be drained before the connection can carry another request.
+    resp.read()
+    return resp.status, resp.reason
+
+
+def _get_connection() -> tuple[http.client.HTTPConnection, str, bool]:
+    """Return ``(connection, path_prefix, reused)`` for the current server URL.
+
+    Each thread gets its own connection, rebuilt whenever ``start_worker``
+    points the transport at a different server.
+    """
+    conn = getattr(_connections, "conn", None)
+    url = _server_url
+    if conn is not None and _connections.url == url:
+        return conn, _url_prefix(url), conn.sock is not None
+    _close_connection()
+    conn = _connections.conn = open_connection(url, _TIMEOUT)
+    _connections.url = url
+    return conn, _url_prefix(url), False
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    """An HTTP connection over a Unix domain socket instead of TCP."""
+
+    def __init__(self, socket_path: str, timeout: float) -> None:
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self) -> None:
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(self.socket_path)
+        except OSError:
+            sock.close()
+            raise
+        self.sock = sock
+
+
+def open_connection(server_url: str, timeout: float) -> http.client.HTTPConnection:
+    """Return an unopened connection for *server_url*.
+
+    ``unix:///path/to/socket`` URLs talk HTTP over that Unix domain socket,
+    skipping TCP loopback when the server runs on the same host.
+    """
+    url = urllib.parse.urlsplit(server_url)
+    if url.scheme == "unix":
+        return _UnixHTTPConnection(url.path, timeout)
+    if url.scheme == "https":
+        return http.client.HTTPSConnection(url.netloc, timeout=timeout)
+    return http.client.HTTPConnection(url.netloc, timeout=timeout)
+
+
+def _url_prefix(server_url: str) -> str:
+    """Return the path the server's API routes hang off, e.g. ``/smello``.
+
+    The path of a ``unix://`` URL names the socket, so its prefix is empty.
+    """
+    url = urllib.parse.urlsplit(server_url)
+    return "" if url.scheme == "unix" else url.path.rstrip("/")
+
+
+def _close_connection() -> None:
+    conn = getattr(_connections, "conn", None)
+    if conn is not None:
+        conn.close()
+        _connections.conn = None
+
+
+def _encode(payload: dict) -> bytes:
+    return json.dumps(payload, default=_json_default).encode("utf-8")
 
 
 def _json_default(obj: object) -> str:
@@ -123,3 +931,9 @@ def _json_default(obj: object) -> str:
         return repr(obj)
     except Exception:
         return "<unserializable>"
+
+
+# Pre-fork servers (gunicorn, uWSGI, multiprocessing with "fork") fork after
+# init(); without this, children would queue captures nobody sends.
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
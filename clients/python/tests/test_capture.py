@@ -2,9 +2,10 @@
 
 import gzip
 import zlib
+from unittest.mock import patch
 
 import pytest
-from smello.capture import serialize_request_response
+from smello.capture import capture_http, serialize_request_response
 from smello.config import SmelloConfig
 from smello.utils import MAX_DECOMPRESSED
 
@@ -363,3 +364,35 @@ def test_truncated_gzip_stream_falls_back_to_binary(config):
         library="httpx",
     )
     assert payload["response"]["body"].startswith("[binary:")
+
+
+def test_capture_http_defers_serialization(config):
+    queued = []
+    headers = {"Authorization": "Bearer secret"}
+    with (
+        patch("smello.capture.send_http", side_effect=lambda b, **_: queued.append(b)),
+        patch("smello.capture.time.time", return_value=0.0),
+        patch(
+            "smello.capture.serialize_request_response",
+            wraps=serialize_request_response,
+        ) as serialize,
+    ):
+        capture_http(
+            config=config,
+            method="GET",
+            url="https://api.example.com/test",
+            request_headers=headers,
+            request_body=None,
+            status_code=200,
+            response_headers={},
+            response_body=b"ok",
+            duration_s=0.1,
+            library="requests",
+        )
+        assert not serialize.called
+        payload = queued[0]()
+
+    assert payload["timestamp"] == "1970-01-01T00:00:00Z"
+    assert payload["request"]["headers"]["Authorization"] == "[REDACTED]"
+    assert payload["response"]["body"] == "ok"
+    assert headers == {"Authorization": "Bearer secret"}
@@ -41,6 +41,19 @@ def _make_args(**overrides) -> argparse.Namespace:
         "capture_logs": None,
         "log_level": None,
         "ignore_logger": None,
+        "sample_rate": None,
+        "host_sample_rate": None,
+        "method_sample_rate": None,
+        "slow_threshold_ms": None,
+        "rate_limit": None,
+        "queue_max_events": None,
+        "queue_max_bytes": None,
+        "overflow_policy": None,
+        "block_timeout_ms": None,
+        "spool_dir": None,
+        "spool_max_bytes": None,
+        "compress": None,
+        "workers": None,
         "app": None,
         "session": None,
         "debug": None,
@@ -146,6 +159,77 @@ def test_overrides_capture_logs_with_level():
     assert overrides == {"SMELLO_CAPTURE_LOGS": "true", "SMELLO_LOG_LEVEL": "10"}
 
 
+def test_overrides_sampling():
+    overrides = cli._smello_env_overrides(
+        _make_args(
+            sample_rate=0.1,
+            host_sample_rate=["api.example.com=0.5", "b.com=0"],
+            method_sample_rate=["GET=0.2"],
+            slow_threshold_ms=500,
+        )
+    )
+    assert overrides == {
+        "SMELLO_SAMPLE_RATE": "0.1",
+        "SMELLO_HOST_SAMPLE_RATES": "api.example.com=0.5,b.com=0",
+        "SMELLO_METHOD_SAMPLE_RATES": "GET=0.2",
+        "SMELLO_SLOW_THRESHOLD_MS": "500",
+    }
+
+
+def test_overrides_rate_limits():
+    overrides = cli._smello_env_overrides(_make_args(rate_limit=["log=20", "http=5"]))
+    assert overrides == {"SMELLO_RATE_LIMITS": "log=20,http=5"}
+
+
+def test_overrides_queue():
+    overrides = cli._smello_env_overrides(
+        _make_args(
+            queue_max_events=5000,
+            queue_max_bytes=1048576,
+            overflow_policy="block",
+            block_timeout_ms=50,
+        )
+    )
+    assert overrides == {
+        "SMELLO_QUEUE_MAX_EVENTS": "5000",
+        "SMELLO_QUEUE_MAX_BYTES": "1048576",
+        "SMELLO_OVERFLOW_POLICY": "block",
+        "SMELLO_BLOCK_TIMEOUT_MS": "50",
+    }
+
+
+def test_overrides_spool():
+    overrides = cli._smello_env_overrides(
+        _make_args(spool_dir="/tmp/spool", spool_max_bytes=1048576)
+    )
+    assert overrides == {
+        "SMELLO_SPOOL_DIR": "/tmp/spool",
+        "SMELLO_SPOOL_MAX_BYTES": "1048576",
+    }
+
+
+@pytest.mark.parametrize("flag,expected", [(True, "true"), (False, "false")])
+def test_overrides_compress(flag, expected):
+    overrides = cli._smello_env_overrides(_make_args(compress=flag))
+    assert overrides == {"SMELLO_COMPRESS": expected}
+
+
+def test_overrides_workers():
+    overrides = cli._smello_env_overrides(_make_args(workers=4))
+    assert overrides == {"SMELLO_WORKERS": "4"}
+
+
+def test_provenance_no_compress_flag():
+    overrides = {"SMELLO_COMPRESS": "false"}
+    prov = cli._cli_provenance(_make_args(compress=False), overrides)
+    assert prov == {"SMELLO_COMPRESS": "--no-compress"}
+
+
+def test_overflow_policy_rejects_unknown(capsys):
+    with pytest.raises(SystemExit):
+        cli.main(["run", "--overflow-policy", "discard", "echo"])
+
+
 def test_overrides_app():
     overrides = cli._smello_env_overrides(_make_args(app="myapp"))
     assert overrides == {"SMELLO_APP": "myapp"}
@@ -202,6 +286,17 @@ def test_log_level_rejects_invalid(capsys):
         cli.main(["run", "--log-level", "BOGUS", "echo"])
 
 
+def test_rate_limit_flag_parsed():
+    c = _capture_execvpe(["run", "--rate-limit", "log=20", "echo"])
+    assert c["env"]["SMELLO_RATE_LIMITS"] == "log=20"
+
+
+@pytest.mark.parametrize("value", ["log", "log=many", "=5", "log=1,http=2"])
+def test_rate_limit_rejects_invalid(value, capsys):
+    with pytest.raises(SystemExit):
+        cli.main(["run", "--rate-limit", value, "echo"])
+
+
 # --- _cli_provenance (maps env vars to their CLI flag origin) ---
 
 
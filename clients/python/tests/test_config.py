@@ -1,5 +1,7 @@
 """Tests for smello.config.SmelloConfig."""
 
+from unittest.mock import patch
+
 import pytest
 from smello.config import SmelloConfig
 
@@ -80,3 +82,69 @@ def test_app_and_session_accept_values():
     config = SmelloConfig(server_url="http://test:5110", app="myapp", session="sess-1")
     assert config.app == "myapp"
     assert config.session == "sess-1"
+
+
+# --- sampling ---
+
+
+def test_should_sample_keeps_everything_by_default(default_config):
+    assert default_config.should_sample("a.com", "GET", 200, 0.01) is True
+
+
+def test_should_sample_drops_at_zero_rate():
+    config = SmelloConfig(server_url="http://test:5110", sample_rate=0.0)
+    assert config.should_sample("a.com", "GET", 200, 0.01) is False
+
+
+@pytest.mark.parametrize("status_code", [0, 400, 404, 500, 503])
+def test_should_sample_always_keeps_errors(status_code):
+    config = SmelloConfig(server_url="http://test:5110", sample_rate=0.0)
+    assert config.should_sample("a.com", "GET", status_code, 0.01) is True
+
+
+def test_should_sample_always_keeps_slow_calls():
+    config = SmelloConfig(
+        server_url="http://test:5110", sample_rate=0.0, slow_threshold_ms=200
+    )
+    assert config.should_sample("a.com", "GET", 200, 0.19) is False
+    assert config.should_sample("a.com", "GET", 200, 0.2) is True
+
+
+def test_should_sample_uses_random_draw():
+    config = SmelloConfig(server_url="http://test:5110", sample_rate=0.3)
+    with patch("smello.config.random.random", return_value=0.2):
+        assert config.should_sample("a.com", "GET", 200, 0.01) is True
+    with patch("smello.config.random.random", return_value=0.4):
+        assert config.should_sample("a.com", "GET", 200, 0.01) is False
+
+
+def test_should_sample_host_rate_beats_method_rate():
+    config = SmelloConfig(
+        server_url="http://test:5110",
+        sample_rate=0.0,
+        host_sample_rates={"a.com": 1.0},
+        method_sample_rates={"GET": 0.0, "POST": 1.0},
+    )
+    assert config.should_sample("a.com", "GET", 200, 0.01) is True
+    assert config.should_sample("b.com", "GET", 200, 0.01) is False
+    assert config.should_sample("b.com", "post", 200, 0.01) is True
+
+
+# --- rate limits ---
+
+
+def test_allow_without_limit(default_config):
+    assert all(default_config.allow("log") for _ in range(100))
+
+
+def test_allow_limits_burst():
+    config = SmelloConfig(server_url="http://test:5110", rate_limits={"log": 3})
+    assert [config.allow("log") for _ in range(5)] == [True] * 3 + [False] * 2
+    assert config.allow("http") is True
+
+
+def test_allow_picks_up_changed_limit():
+    config = SmelloConfig(server_url="http://test:5110", rate_limits={"log": 0})
+    assert config.allow("log") is False
+    config.rate_limits = {"log": 5}
+    assert config.allow("log") is True
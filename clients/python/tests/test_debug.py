@@ -1,7 +1,10 @@
 """Tests for smello._debug (debug logging helpers)."""
 
 import logging
+import socketserver
 import sys
+import threading
+from http.server import BaseHTTPRequestHandler
 from unittest.mock import patch
 
 import pytest
@@ -139,6 +142,29 @@ def test_connectivity_failure(caplog):
     assert "Connection refused" in caplog.text
 
 
+def test_connectivity_over_unix_socket(tmp_path, caplog):
+    class MetaHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200 if self.path == "/api/meta" else 404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    path = tmp_path / "smello.sock"
+    server = socketserver.UnixStreamServer(str(path), MetaHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    try:
+        with caplog.at_level(logging.DEBUG, logger="smello"):
+            check_connectivity(f"unix://{path}")
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    assert f"connected to unix://{path} (200)" in caplog.text
+
+
 def test_connectivity_never_raises():
     with patch(
         "smello._debug.urllib.request.urlopen",
@@ -6,7 +6,16 @@ from unittest.mock import patch
 
 import pytest
 import smello
-from smello._env import env_bool, env_list, env_log_level, env_str, parse_log_level
+from smello._env import (
+    env_bool,
+    env_float,
+    env_list,
+    env_log_level,
+    env_rates,
+    env_str,
+    parse_log_level,
+    parse_rates,
+)
 
 # --- env_str ---
 
@@ -154,6 +163,48 @@ def testenv_list_single_item():
         assert env_list("CAPTURE_HOSTS") == ["api.stripe.com"]
 
 
+# --- env_float ---
+
+
+def test_env_float():
+    with patch.dict(os.environ, {"SMELLO_SAMPLE_RATE": "0.25"}):
+        assert env_float("SAMPLE_RATE") == 0.25
+
+
+def test_env_float_returns_none_for_invalid():
+    with patch.dict(os.environ, {"SMELLO_SAMPLE_RATE": "half"}):
+        assert env_float("SAMPLE_RATE") is None
+
+
+# --- parse_rates / env_rates ---
+
+
+def test_parse_rates():
+    assert parse_rates("api.example.com=0.1, GET=0.5") == {
+        "api.example.com": 0.1,
+        "GET": 0.5,
+    }
+
+
+def test_parse_rates_skips_empty_items():
+    assert parse_rates("log=20,,") == {"log": 20.0}
+
+
+@pytest.mark.parametrize("value", ["log", "log=", "=5", "log=many", "", " , "])
+def test_parse_rates_returns_none_for_invalid(value):
+    assert parse_rates(value) is None
+
+
+def test_env_rates():
+    with patch.dict(os.environ, {"SMELLO_RATE_LIMITS": "log=20,http=100"}):
+        assert env_rates("RATE_LIMITS") == {"log": 20.0, "http": 100.0}
+
+
+def test_env_rates_returns_none_when_unset():
+    with patch.dict(os.environ, {}, clear=True):
+        assert env_rates("RATE_LIMITS") is None
+
+
 # --- init() env var integration ---
 
 
@@ -381,6 +432,121 @@ def test_init_log_level_string_from_env():
         assert smello._config.log_level == 20
 
 
+def test_init_sampling_from_env():
+    with (
+        patch.dict(
+            os.environ,
+            {
+                "SMELLO_URL": "http://test:5110",
+                "SMELLO_SAMPLE_RATE": "0.1",
+                "SMELLO_HOST_SAMPLE_RATES": "api.example.com=0.5",
+                "SMELLO_METHOD_SAMPLE_RATES": "get=0",
+                "SMELLO_SLOW_THRESHOLD_MS": "250",
+                "SMELLO_RATE_LIMITS": "log=20",
+            },
+        ),
+        patch("smello._start_worker"),
+        patch("smello._apply_all"),
+    ):
+        smello._config = None
+        smello.init()
+        assert smello._config.sample_rate == 0.1
+        assert smello._config.host_sample_rates == {"api.example.com": 0.5}
+        assert smello._config.method_sample_rates == {"GET": 0.0}
+        assert smello._config.slow_threshold_ms == 250
+        assert smello._config.rate_limits == {"log": 20.0}
+
+
+def test_init_sample_rates_clamped():
+    with (
+        patch.dict(os.environ, {}, clear=True),
+        patch("smello._start_worker"),
+        patch("smello._apply_all"),
+    ):
+        smello._config = None
+        smello.init(
+            server_url="http://test:5110",
+            sample_rate=2.0,
+            host_sample_rates={"a.com": -1.0},
+        )
+        assert smello._config.sample_rate == 1.0
+        assert smello._config.host_sample_rates == {"a.com": 0.0}
+
+
+def test_init_unknown_rate_limit_type_warns(caplog):
+    with (
+        patch.dict(os.environ, {}, clear=True),
+        patch("smello._start_worker"),
+        patch("smello._apply_all"),
+        caplog.at_level(logging.WARNING, logger="smello"),
+    ):
+        smello._config = None
+        smello.init(server_url="http://test:5110", rate_limits={"logs": 10})
+    assert "Unknown event type 'logs'" in caplog.text
+
+
+def test_init_transport_settings_from_env():
+    with (
+        patch.dict(
+            os.environ,
+            {
+                "SMELLO_URL": "http://test:5110",
+                "SMELLO_QUEUE_MAX_EVENTS": "50",
+                "SMELLO_QUEUE_MAX_BYTES": "4096",
+                "SMELLO_OVERFLOW_POLICY": "drop_oldest",
+                "SMELLO_BLOCK_TIMEOUT_MS": "250",
+                "SMELLO_SPOOL_DIR": "/tmp/smello-spool",
+                "SMELLO_SPOOL_MAX_BYTES": "8192",
+                "SMELLO_COMPRESS": "true",
+                "SMELLO_WORKERS": "4",
+            },
+        ),
+        patch("smello._start_worker") as start_worker,
+        patch("smello._apply_all"),
+    ):
+        smello._config = None
+        smello.init()
+    start_worker.assert_called_once_with(
+        "http://test:5110",
+        app="",
+        session="",
+        max_events=50,
+        max_bytes=4096,
+        overflow_policy="drop_oldest",
+        block_timeout=0.25,
+        spool_dir="/tmp/smello-spool",
+        spool_max_bytes=8192,
+        compress=True,
+        workers=4,
+    )
+
+
+def test_init_unknown_overflow_policy_falls_back(caplog):
+    with (
+        patch.dict(os.environ, {}, clear=True),
+        patch("smello._start_worker"),
+        patch("smello._apply_all"),
+        caplog.at_level(logging.WARNING, logger="smello"),
+    ):
+        smello._config = None
+        smello.init(server_url="http://test:5110", overflow_policy="discard")
+    assert smello._config.overflow_policy == "drop_newest"
+    assert "Unknown overflow_policy 'discard'" in caplog.text
+
+
+def test_init_spill_without_spool_dir_falls_back(caplog):
+    with (
+        patch.dict(os.environ, {}, clear=True),
+        patch("smello._start_worker"),
+        patch("smello._apply_all"),
+        caplog.at_level(logging.WARNING, logger="smello"),
+    ):
+        smello._config = None
+        smello.init(server_url="http://test:5110", overflow_policy="spill")
+    assert smello._config.overflow_policy == "drop_newest"
+    assert "'spill' needs spool_dir" in caplog.text
+
+
 # --- init() idempotency ---
 
 
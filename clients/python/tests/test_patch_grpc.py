@@ -373,6 +373,7 @@ def test_send_capture(mock_serialize, mock_send, config):
 
     _send_capture(
         config=config,
+        host="host",
         method="POST",
         url="grpc://host:443/svc/Method",
         request_headers={"k": "v"},
@@ -22,11 +22,18 @@ def config():
 
 @pytest.fixture()
 def captured(config):
-    """Apply patches and return a list that collects send_http payloads."""
+    """Apply patches and return a list that collects send_http payloads.
+
+    Captures are queued as builders, so each one is built on arrival here,
+    as the transport worker would.
+    """
     orig_sync_init = httpx.Client.__init__
     orig_async_init = httpx.AsyncClient.__init__
     payloads: list[dict] = []
-    with patch("smello.patches.patch_httpx.send_http", side_effect=payloads.append):
+    with patch(
+        "smello.capture.send_http",
+        side_effect=lambda build, **_: payloads.append(build()),
+    ):
         patch_httpx(config)
         yield payloads
     httpx.Client.__init__ = orig_sync_init
@@ -317,3 +324,27 @@ def test_gzip_streaming_response_decompressed(captured):
 
     assert len(captured) == 1
     assert captured[0]["response"]["body"] == '{"message":"hello"}'
+
+
+# ---- sampling -----------------------------------------------------------------
+
+
+def test_sampled_out_call_not_captured(captured, config):
+    config.sample_rate = 0.0
+    transport = httpx.MockTransport(_stream_handler)
+    with httpx.Client(transport=transport) as client:
+        resp = client.get("https://example.com/api")
+
+    assert resp.json() == {"ok": True}
+    assert captured == []
+
+
+def test_error_response_captured_despite_sampling(captured, config):
+    config.sample_rate = 0.0
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(500, stream=httpx.ByteStream(b"oops"))
+    )
+    with httpx.Client(transport=transport) as client:
+        client.get("https://example.com/api")
+
+    assert len(captured) == 1
@@ -177,3 +177,18 @@ def test_captures_extra_attributes(mock_transport):
     # Assert
     data = mock_transport.send_log_calls[-1]["data"]
     assert data["extra"]["user_id"] == 42
+
+
+def test_respects_rate_limit(mock_transport):
+    # Arrange
+    config = _make_config(rate_limits={"log": 2})
+    patch_logging_mod.patch_logging(config)
+    test_logger = logging.getLogger("test.ratelimit")
+
+    # Act
+    for i in range(5):
+        test_logger.warning("burst %d", i)
+
+    # Assert
+    messages = [p["data"]["message"] for p in mock_transport.send_log_calls]
+    assert messages == ["burst 0", "burst 1"]
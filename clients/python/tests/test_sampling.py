@@ -0,0 +1,42 @@
+"""Tests for smello.sampling.TokenBucket."""
+
+from unittest.mock import patch
+
+from smello.sampling import TokenBucket
+
+
+def test_burst_defaults_to_one_second_of_events():
+    with patch("smello.sampling.time.monotonic", return_value=100.0):
+        bucket = TokenBucket(5)
+        assert [bucket.take() for _ in range(6)] == [True] * 5 + [False]
+
+
+def test_fractional_rate_allows_one_event():
+    with patch("smello.sampling.time.monotonic", return_value=100.0):
+        bucket = TokenBucket(0.5)
+        assert bucket.take() is True
+        assert bucket.take() is False
+
+
+def test_zero_rate_allows_nothing():
+    bucket = TokenBucket(0)
+    assert bucket.take() is False
+
+
+def test_refills_over_time():
+    with patch("smello.sampling.time.monotonic") as clock:
+        clock.return_value = 100.0
+        bucket = TokenBucket(2)
+        assert bucket.take() and bucket.take()
+        assert bucket.take() is False
+        clock.return_value = 100.5
+        assert bucket.take() is True
+        assert bucket.take() is False
+
+
+def test_refill_capped_at_burst():
+    with patch("smello.sampling.time.monotonic") as clock:
+        clock.return_value = 100.0
+        bucket = TokenBucket(2, burst=3)
+        clock.return_value = 1000.0
+        assert [bucket.take() for _ in range(4)] == [True] * 3 + [False]
@@ -0,0 +1,107 @@
+"""Tests for smello.spool.Spool."""
+
+import os
+import time
+
+from smello.spool import STALE_AFTER, Spool
+
+
+def test_claim_returns_appended_lines(tmp_path):
+    spool = Spool(tmp_path)
+    assert spool.append([b'{"id": "a"}', b'{"id": "b"}']) == 2
+
+    path, lines = spool.claim()
+
+    assert lines == [b'{"id": "a"}', b'{"id": "b"}']
+    assert path.suffix == ".sending"
+
+
+def test_claim_returns_none_when_empty(tmp_path):
+    assert Spool(tmp_path).claim() is None
+
+
+def test_release_without_remaining_deletes_segment(tmp_path):
+    spool = Spool(tmp_path)
+    spool.append([b"x"])
+    path, _ = spool.claim()
+
+    spool.release(path, [])
+
+    assert list(tmp_path.iterdir()) == []
+    assert spool.bytes == 0
+    assert spool.claim() is None
+
+
+def test_release_puts_remaining_lines_back(tmp_path):
+    spool = Spool(tmp_path)
+    spool.append([b"a", b"b", b"c"])
+    path, _ = spool.claim()
+
+    spool.release(path, [b"b", b"c"])
+
+    assert spool.claim()[1] == [b"b", b"c"]
+
+
+def test_segments_roll_over_and_replay_oldest_first(tmp_path):
+    spool = Spool(tmp_path, segment_bytes=4)
+    spool.append([b"one", b"two", b"six"])
+
+    assert len(list(tmp_path.glob("*.jsonl"))) == 2
+    replayed = []
+    while claimed := spool.claim():
+        replayed += claimed[1]
+        spool.release(claimed[0], [])
+    assert replayed == [b"one", b"two", b"six"]
+
+
+def test_append_stops_at_max_bytes(tmp_path):
+    spool = Spool(tmp_path, max_bytes=10)
+
+    assert spool.append([b"1234", b"5678", b"9"]) == 2
+    assert spool.append([b"x"]) == 0
+    assert spool.bytes == 10
+
+
+def test_claimed_segment_not_claimed_twice(tmp_path):
+    first, second = Spool(tmp_path), Spool(tmp_path)
+    first.append([b"only"])
+    first.close()
+
+    assert second.claim()[1] == [b"only"]
+    assert first.claim() is None
+
+
+def test_close_seals_segment_for_other_processes(tmp_path):
+    spool = Spool(tmp_path)
+    spool.append([b"a"])
+
+    spool.close()
+
+    assert [p.suffix for p in tmp_path.iterdir()] == [".jsonl"]
+
+
+def test_stale_segments_recovered(tmp_path):
+    stale = tmp_path / f"{time.time_ns():020d}-99999.part"
+    stale.write_bytes(b"left behind\n")
+    old = time.time() - STALE_AFTER - 1
+    os.utime(stale, (old, old))
+
+    assert Spool(tmp_path).claim()[1] == [b"left behind"]
+
+
+def test_fresh_segment_of_another_process_left_alone(tmp_path):
+    (tmp_path / f"{time.time_ns():020d}-99999.part").write_bytes(b"busy\n")
+
+    assert Spool(tmp_path).claim() is None
+
+
+def test_after_fork_leaves_parent_segment_alone(tmp_path):
+    spool = Spool(tmp_path)
+    spool.append([b"parent"])
+    parent_part = next(tmp_path.glob("*.part"))
+
+    spool.after_fork()
+    spool.append([b"child"])
+
+    assert parent_part.read_bytes() == b"parent\n"
+    assert len(list(tmp_path.glob("*.part"))) == 2
@@ -1,12 +1,21 @@
 """Tests for smello.transport."""
 
+import asyncio
+import contextlib
+import gzip
 import json
+import os
+import signal
+import socketserver
 import threading
 import time
-from http.server import BaseHTTPRequestHandler, HTTPServer
+from http.server import BaseHTTPRequestHandler, HTTPServer, ThreadingHTTPServer
 
 import pytest
+from smello import transport
+from smello.spool import Spool
 from smello.transport import (
+    _CaptureQueue,
     _json_default,
     flush,
     send_exception,
@@ -14,17 +23,63 @@ from smello.transport import (
     send_log,
     shutdown,
     start_worker,
+    stats,
 )
 
 
 class CaptureHandler(BaseHTTPRequestHandler):
+    """Records each capture as ``{"path", "body"}``, unpacking batch posts.
+
+    ``posts`` keeps the raw request paths so tests can tell batched and
+    per-event delivery apart. Counter reports go to ``stats_reports``.
+    Gzipped posts are decoded and their paths noted in ``gzipped``, unless
+    ``accept_gzip`` is off, which answers them with 422 like a server that
+    predates gzip support.
+    """
+
     captured: list = []
+    posts: list = []
+    peers: list = []
+    stats_reports: list = []
+    gzipped: list = []
+    batch_status: int = 201
+    accept_gzip: bool = True
 
     def do_POST(self):
         length = int(self.headers.get("Content-Length", 0))
-        body = json.loads(self.rfile.read(length))
-        CaptureHandler.captured.append({"path": self.path, "body": body})
+        data = self.rfile.read(length)
+        if self.headers.get("Content-Encoding") == "gzip":
+            if not CaptureHandler.accept_gzip:
+                self.send_response(422)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+            CaptureHandler.gzipped.append(self.path)
+            data = gzip.decompress(data)
+        body = json.loads(data)
+        if self.path == "/api/capture/stats":
+            CaptureHandler.stats_reports.append(body)
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        if self.path == "/api/capture/batch" and CaptureHandler.batch_status != 201:
+            self.send_response(CaptureHandler.batch_status)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        CaptureHandler.posts.append(self.path)
+        CaptureHandler.peers.append(self.client_address)
+        if self.path == "/api/capture/batch":
+            for event in body["events"]:
+                event_type = event.pop("event_type")
+                CaptureHandler.captured.append(
+                    {"path": f"/api/capture/{event_type}", "body": event}
+                )
+        else:
+            CaptureHandler.captured.append({"path": self.path, "body": body})
         self.send_response(201)
+        self.send_header("Content-Length", "15")
         self.end_headers()
         self.wfile.write(b'{"status":"ok"}')
 
@@ -32,16 +87,109 @@ class CaptureHandler(BaseHTTPRequestHandler):
         pass
 
 
+class KeepAliveHandler(CaptureHandler):
+    """HTTP/1.1 variant that keeps connections open between requests.
+
+    With ``drop_idle`` set, it silently closes the connection after each
+    response, like a server whose keep-alive timeout has expired.
+    """
+
+    protocol_version = "HTTP/1.1"
+    drop_idle: bool = False
+
+    def do_POST(self):
+        super().do_POST()
+        if KeepAliveHandler.drop_idle:
+            self.close_connection = True
+
+
+class SlowHandler(KeepAliveHandler):
+    """Takes ``delay`` seconds to answer each capture, like a busy server.
+
+    ``max_in_flight`` records the most requests it was answering at once.
+    """
+
+    delay: float = 0.0
+    in_flight: int = 0
+    max_in_flight: int = 0
+    _lock = threading.Lock()
+
+    def do_POST(self):
+        with SlowHandler._lock:
+            SlowHandler.in_flight += 1
+            SlowHandler.max_in_flight = max(
+                SlowHandler.max_in_flight, SlowHandler.in_flight
+            )
+        try:
+            time.sleep(SlowHandler.delay)
+        finally:
+            with SlowHandler._lock:
+                SlowHandler.in_flight -= 1
+        super().do_POST()
+
+
+@pytest.fixture(autouse=True)
+def _reset_handlers():
+    """Give every test empty handler records and default handler flags."""
+    CaptureHandler.captured = []
+    CaptureHandler.posts = []
+    CaptureHandler.peers = []
+    CaptureHandler.stats_reports = []
+    CaptureHandler.gzipped = []
+    CaptureHandler.batch_status = 201
+    CaptureHandler.accept_gzip = True
+    KeepAliveHandler.drop_idle = False
+    SlowHandler.delay = 0.0
+    SlowHandler.in_flight = 0
+    SlowHandler.max_in_flight = 0
+
+
+@contextlib.contextmanager
+def _serve(server):
+    """Serve *server* on a background thread until the block exits."""
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
 @pytest.fixture()
 def capture_server():
     """Start a minimal HTTP server that records POSTed payloads."""
-    CaptureHandler.captured = []
     server = HTTPServer(("127.0.0.1", 0), CaptureHandler)
-    port = server.server_address[1]
-    thread = threading.Thread(target=server.serve_forever, daemon=True)
-    thread.start()
-    yield f"http://127.0.0.1:{port}", CaptureHandler.captured
-    server.shutdown()
+    with _serve(server):
+        yield f"http://127.0.0.1:{server.server_address[1]}", CaptureHandler.captured
+
+
+@pytest.fixture()
+def keepalive_server():
+    """Like ``capture_server``, but speaks HTTP/1.1 with persistent connections."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    server.daemon_threads = True
+    with _serve(server):
+        yield f"http://127.0.0.1:{server.server_address[1]}", CaptureHandler.captured
+
+
+@pytest.fixture()
+def unix_server(tmp_path):
+    """Like ``capture_server``, but listening on a Unix domain socket."""
+    path = tmp_path / "smello.sock"
+    server = socketserver.UnixStreamServer(str(path), CaptureHandler)
+    with _serve(server):
+        yield f"unix://{path}", CaptureHandler.captured
+
+
+@pytest.fixture()
+def slow_server():
+    """Like ``keepalive_server``, but every capture takes 0.2s to answer."""
+    SlowHandler.delay = 0.2
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SlowHandler)
+    server.daemon_threads = True
+    with _serve(server):
+        yield f"http://127.0.0.1:{server.server_address[1]}", CaptureHandler.captured
 
 
 def _wait(captured, n, timeout=5.0):
@@ -135,11 +283,118 @@ def test_shutdown_flushes(capture_server):
     assert len(captured) == 1
 
 
+# ---------------------------------------------------------------------------
+# Batching
+# ---------------------------------------------------------------------------
+
+
+def test_queued_captures_are_sent_as_one_batch(capture_server):
+    url, captured = capture_server
+    start_worker(url, batch_wait=0.5)
+
+    send_http({"id": "b-http"})
+    send_log({"id": "b-log", "data": {}})
+    send_exception({"id": "b-exc", "data": {}})
+    assert flush(timeout=5.0) is True
+
+    assert CaptureHandler.posts == ["/api/capture/batch"]
+    assert [(c["path"], c["body"]["id"]) for c in captured] == [
+        ("/api/capture/http", "b-http"),
+        ("/api/capture/log", "b-log"),
+        ("/api/capture/exception", "b-exc"),
+    ]
+
+
+def test_batch_size_caps_items_per_request(capture_server):
+    url, captured = capture_server
+    start_worker(url, batch_size=2, batch_wait=0.5)
+
+    for i in range(4):
+        send_http({"id": f"cap-{i}"})
+    assert flush(timeout=5.0) is True
+
+    assert CaptureHandler.posts == ["/api/capture/batch", "/api/capture/batch"]
+    assert len(captured) == 4
+
+
+def test_batch_size_one_uses_typed_endpoints(capture_server):
+    url, captured = capture_server
+    start_worker(url, batch_size=1)
+
+    send_http({"id": "single-1"})
+    send_log({"id": "single-2", "data": {}})
+    assert flush(timeout=5.0) is True
+
+    assert CaptureHandler.posts == ["/api/capture/http", "/api/capture/log"]
+
+
+@pytest.mark.parametrize("status", [404, 405])
+def test_falls_back_to_typed_endpoints_without_batch_support(capture_server, status):
+    url, captured = capture_server
+    CaptureHandler.batch_status = status
+    start_worker(url, batch_wait=0.5)
+
+    send_http({"id": "old-1"})
+    send_log({"id": "old-2", "data": {}})
+    assert flush(timeout=5.0) is True
+
+    assert CaptureHandler.posts == ["/api/capture/http", "/api/capture/log"]
+    assert [c["body"]["id"] for c in captured] == ["old-1", "old-2"]
+
+
 # ---------------------------------------------------------------------------
 # _json_default() — fallback serializer
 # ---------------------------------------------------------------------------
 
 
+def test_sequential_sends_reuse_one_connection(keepalive_server):
+    url, captured = keepalive_server
+    start_worker(url, batch_size=1)
+
+    for i in range(3):
+        send_log({"id": f"log-{i}", "data": {"message": "hi"}})
+        _wait(captured, i + 1)
+
+    assert len(captured) == 3
+    assert len(set(CaptureHandler.peers)) == 1
+
+
+def test_reconnects_when_server_drops_idle_connection(keepalive_server):
+    url, captured = keepalive_server
+    KeepAliveHandler.drop_idle = True
+    start_worker(url, batch_size=1)
+
+    send_log({"id": "log-1", "data": {"message": "first"}})
+    _wait(captured, 1)
+    send_log({"id": "log-2", "data": {"message": "second"}})
+    _wait(captured, 2)
+
+    assert [c["body"]["id"] for c in captured] == ["log-1", "log-2"]
+    assert len(set(CaptureHandler.peers)) == 2
+
+
+def test_server_url_path_prefix_is_kept(capture_server):
+    url, captured = capture_server
+    start_worker(url + "/smello/", batch_size=1)
+
+    send_log({"id": "log-1", "data": {"message": "hi"}})
+
+    _wait(captured, 1)
+    assert captured[0]["path"] == "/smello/api/capture/log"
+
+
+def test_unix_socket_url_sends_over_socket(unix_server):
+    url, captured = unix_server
+    start_worker(url)
+
+    send_log({"id": "log-1", "data": {"message": "hi"}})
+    send_log({"id": "log-2", "data": {"message": "there"}})
+
+    _wait(captured, 2)
+    assert [c["body"]["id"] for c in captured] == ["log-1", "log-2"]
+    assert all(path.startswith("/api/capture/") for path in CaptureHandler.posts)
+
+
 def test_json_default_handles_bytes():
     assert _json_default(b"\x00\x01\x02") == "b'\\x00\\x01\\x02'"
 
@@ -167,6 +422,70 @@ def test_json_dumps_with_default_serializes_bytes():
     assert isinstance(result["headers"]["x-bin"], str)
 
 
+# ---------------------------------------------------------------------------
+# Compression
+# ---------------------------------------------------------------------------
+
+
+def test_compress_gzips_large_bodies(capture_server):
+    url, captured = capture_server
+    start_worker(url, batch_size=1, compress=True)
+
+    send_log({"id": "big", "data": {"message": "x" * 2000}})
+    send_log({"id": "small", "data": {"message": "x"}})
+    assert flush(timeout=5.0) is True
+    start_worker(url)
+
+    assert [c["body"]["id"] for c in captured] == ["big", "small"]
+    assert captured[0]["body"]["data"]["message"] == "x" * 2000
+    assert CaptureHandler.gzipped == ["/api/capture/log"]
+
+
+def test_compress_falls_back_when_server_rejects_gzip(capture_server):
+    url, captured = capture_server
+    CaptureHandler.accept_gzip = False
+    start_worker(url, batch_size=1, compress=True)
+
+    send_log({"id": "first", "data": {"message": "x" * 2000}})
+    send_log({"id": "second", "data": {"message": "y" * 2000}})
+    assert flush(timeout=5.0) is True
+    gzip_supported = transport._gzip_supported
+    start_worker(url)
+
+    assert [c["body"]["id"] for c in captured] == ["first", "second"]
+    assert gzip_supported is False
+
+
+def test_send_http_builds_deferred_payload_on_worker(capture_server):
+    url, captured = capture_server
+    start_worker(url)
+    threads = []
+
+    def build():
+        threads.append(threading.current_thread().name)
+        return {"id": "deferred-1", "request": {}, "response": {}}
+
+    send_http(build)
+
+    _wait(captured, 1)
+    assert captured[0]["body"]["id"] == "deferred-1"
+    assert threads == ["smello-transport"]
+
+
+def test_failing_builder_is_dropped(capture_server):
+    url, captured = capture_server
+    start_worker(url)
+
+    def build():
+        raise ValueError("boom")
+
+    send_http(build)
+    send_http({"id": "after-failure"})
+
+    assert flush(timeout=5)
+    assert [c["body"]["id"] for c in captured] == ["after-failure"]
+
+
 def test_send_http_payload_with_bytes(capture_server):
     """Payloads containing bytes should not crash the transport."""
     url, captured = capture_server
@@ -217,3 +536,329 @@ def test_app_and_session_default_to_empty(capture_server):
 
     assert captured[0]["body"]["app"] == ""
     assert captured[0]["body"]["session"] == ""
+
+
+# ---------------------------------------------------------------------------
+# Queue capacity and overflow policies
+# ---------------------------------------------------------------------------
+
+
+def _item(name, size=10):
+    return ("log", {"id": name}, size)
+
+
+def test_queue_drop_newest_rejects_item_that_does_not_fit():
+    q = _CaptureQueue(max_events=2, max_bytes=1000)
+    assert q.offer(_item("a"), "drop_newest", 0) == []
+    assert q.offer(_item("b"), "drop_newest", 0) == []
+
+    assert q.offer(_item("c"), "drop_newest", 0) == [_item("c")]
+    assert [q.get_nowait()[1]["id"] for _ in range(2)] == ["a", "b"]
+
+
+def test_queue_drop_oldest_makes_room():
+    q = _CaptureQueue(max_events=2, max_bytes=1000)
+    q.offer(_item("a"), "drop_oldest", 0)
+    q.offer(_item("b"), "drop_oldest", 0)
+
+    assert q.offer(_item("c"), "drop_oldest", 0) == [_item("a")]
+    assert q.unfinished_tasks == 2
+    assert [q.get_nowait()[1]["id"] for _ in range(2)] == ["b", "c"]
+
+
+def test_queue_block_waits_for_room():
+    q = _CaptureQueue(max_events=1, max_bytes=1000)
+    q.offer(_item("a"), "block", 0)
+    threading.Timer(0.05, q.get).start()
+
+    assert q.offer(_item("b"), "block", 5.0) == []
+    assert q.get_nowait()[1]["id"] == "b"
+
+
+def test_queue_block_drops_after_timeout():
+    q = _CaptureQueue(max_events=1, max_bytes=1000)
+    q.offer(_item("a"), "block", 0)
+
+    begin = time.monotonic()
+    assert q.offer(_item("b"), "block", 0.05) == [_item("b")]
+    assert time.monotonic() - begin >= 0.05
+
+
+def test_queue_bounded_by_bytes():
+    q = _CaptureQueue(max_events=100, max_bytes=100)
+    assert q.offer(_item("a", 60), "drop_newest", 0) == []
+    assert q.offer(_item("b", 60), "drop_newest", 0) == [_item("b", 60)]
+    assert q.bytes == 60
+    q.get_nowait()
+    assert q.bytes == 0
+
+
+def test_queue_accepts_oversized_item_when_empty():
+    q = _CaptureQueue(max_events=100, max_bytes=100)
+    assert q.offer(_item("big", 500), "drop_newest", 0) == []
+
+
+def test_queue_offer_many_drops_what_does_not_fit():
+    q = _CaptureQueue(max_events=2, max_bytes=1000)
+
+    dropped = q.offer_many([_item("a"), _item("b"), _item("c")], "drop_newest", 0)
+
+    assert [payload["id"] for _, payload, _ in dropped] == ["c"]
+    assert q.qsize() == 2
+    assert q.unfinished_tasks == 2
+
+
+def test_unknown_overflow_policy_rejected():
+    with pytest.raises(ValueError, match="overflow policy"):
+        start_worker("http://127.0.0.1:1", overflow_policy="discard")
+
+
+# ---------------------------------------------------------------------------
+# Sender pool
+# ---------------------------------------------------------------------------
+
+
+def test_workers_send_concurrently(slow_server):
+    url, captured = slow_server
+    start_worker(url, batch_size=1, workers=4)
+    try:
+        for i in range(4):
+            send_http({"id": f"http-{i}", "request": {}, "response": {}})
+        assert flush(timeout=10.0) is True
+    finally:
+        start_worker(url)
+
+    assert len(captured) == 4
+    assert SlowHandler.max_in_flight > 1
+    assert len(set(CaptureHandler.peers)) > 1
+
+
+def test_failed_dispatch_does_not_hang_flush(capture_server, monkeypatch):
+    class BrokenInbox:
+        unfinished_tasks = 0
+
+        def put(self, batch):
+            raise RuntimeError("can't start new thread")
+
+    url, _ = capture_server
+    monkeypatch.setattr(transport, "_senders", [BrokenInbox(), BrokenInbox()])
+    start_worker(url, workers=2)
+    try:
+        send_log({"id": "log-1", "data": {}})
+        assert flush(timeout=5.0) is True
+    finally:
+        start_worker(url)
+
+
+def test_workers_keep_logs_in_order(slow_server):
+    url, captured = slow_server
+    start_worker(url, batch_size=1, workers=4)
+    try:
+        for i in range(4):
+            send_log({"id": f"log-{i}", "data": {}})
+        assert flush(timeout=5.0) is True
+    finally:
+        start_worker(url)
+
+    assert [c["body"]["id"] for c in captured] == [f"log-{i}" for i in range(4)]
+
+
+# ---------------------------------------------------------------------------
+# Event loop buffering
+# ---------------------------------------------------------------------------
+
+
+def test_captures_on_running_loop_are_queued_once_per_iteration(monkeypatch):
+    monkeypatch.setattr(transport, "_queue", _CaptureQueue(1000, 10**6))
+
+    async def capture():
+        for i in range(3):
+            send_log({"id": f"log-{i}", "data": {}})
+        before = transport._queue.qsize()
+        await asyncio.sleep(0)
+        return before, transport._queue.qsize()
+
+    assert asyncio.run(capture()) == (0, 3)
+
+
+def test_loop_buffer_queues_full_batch_immediately(monkeypatch):
+    monkeypatch.setattr(transport, "_queue", _CaptureQueue(1000, 10**6))
+    monkeypatch.setattr(transport, "_batch_size", 2)
+
+    async def capture():
+        send_log({"id": "log-1", "data": {}})
+        send_log({"id": "log-2", "data": {}})
+        return transport._queue.qsize()
+
+    assert asyncio.run(capture()) == 2
+
+
+def test_captures_from_async_code_reach_server(capture_server):
+    url, captured = capture_server
+    start_worker(url)
+
+    async def capture():
+        send_log({"id": "log-1", "data": {}})
+        # flush() drains the loop's buffer without yielding to the loop.
+        return flush(timeout=5.0)
+
+    assert asyncio.run(capture()) is True
+    assert [c["body"]["id"] for c in captured] == ["log-1"]
+
+
+# ---------------------------------------------------------------------------
+# Disk spool
+# ---------------------------------------------------------------------------
+
+
+def test_unreachable_server_spools_then_replays(capture_server, tmp_path, monkeypatch):
+    monkeypatch.setattr(transport, "RETRY_INTERVAL", 0.05)
+    start_worker("http://127.0.0.1:1", app="spooler", spool_dir=tmp_path)
+    before = _stat("log", "failed")
+
+    send_log({"id": "spooled-1", "data": {}})
+    assert flush(timeout=10.0) is True
+
+    assert _stat("log", "failed") == before
+    assert b"spooled-1" in b"".join(p.read_bytes() for p in tmp_path.iterdir())
+
+    url, captured = capture_server
+    start_worker(url, spool_dir=tmp_path)
+    _wait(captured, 1)
+
+    assert captured == [
+        {
+            "path": "/api/capture/log",
+            "body": {"id": "spooled-1", "data": {}, "app": "spooler", "session": ""},
+        }
+    ]
+    deadline = time.monotonic() + 5.0
+    while any(tmp_path.iterdir()) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    start_worker(url)
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_client_errors_are_not_spooled(tmp_path):
+    transport._set_spool(tmp_path, 1024)
+    try:
+        transport._send_failed(
+            [("log", {"id": "bad"})], transport._ServerError(422, "x")
+        )
+    finally:
+        transport._set_spool(None, 0)
+
+    assert b"bad" not in b"".join(p.read_bytes() for p in tmp_path.iterdir())
+
+
+def test_spill_policy_writes_overflow_to_spool(monkeypatch, tmp_path):
+    spool = Spool(tmp_path)
+    monkeypatch.setattr(transport, "_queue", _CaptureQueue(0, 1000))
+    monkeypatch.setattr(transport, "_overflow_policy", "spill")
+    monkeypatch.setattr(transport, "_spool", spool)
+    before = _stat("log", "dropped")
+
+    send_log({"id": "spilled", "data": {}})
+
+    assert _stat("log", "dropped") == before
+    event = json.loads(spool.claim()[1][0])
+    assert event["id"] == "spilled"
+    assert event["event_type"] == "log"
+
+
+@pytest.mark.skipif(not hasattr(os, "fork"), reason="needs os.fork")
+@pytest.mark.filterwarnings("ignore:.*fork:DeprecationWarning")
+def test_forked_child_gets_its_own_worker(capture_server):
+    url, captured = capture_server
+    start_worker(url, batch_size=1)
+    send_log({"id": "parent-before", "data": {}})
+    _wait(captured, 1)
+
+    # Fork while the queue lock is held, as if another thread were mid-put.
+    with transport._queue.mutex:
+        pid = os.fork()
+        if pid == 0:
+            signal.alarm(10)  # a deadlocked child fails instead of hanging
+            try:
+                send_log({"id": "child", "data": {}})
+                os._exit(0 if flush(timeout=5) else 1)
+            finally:
+                os._exit(2)
+    _, status = os.waitpid(pid, 0)
+    send_log({"id": "parent-after", "data": {}})
+    _wait(captured, 3)
+
+    assert os.waitstatus_to_exitcode(status) == 0
+    assert sorted(c["body"]["id"] for c in captured) == [
+        "child",
+        "parent-after",
+        "parent-before",
+    ]
+
+
+# ---------------------------------------------------------------------------
+# Delivery counters
+# ---------------------------------------------------------------------------
+
+
+def _stat(event_type, outcome):
+    return stats().get(event_type, {}).get(outcome, 0)
+
+
+def test_stats_count_sent_captures(capture_server):
+    url, captured = capture_server
+    start_worker(url)
+    before = _stat("exception", "sent")
+
+    send_exception({"id": "counted-1", "data": {}})
+    send_exception({"id": "counted-2", "data": {}})
+    assert flush(timeout=5.0) is True
+
+    assert _stat("exception", "sent") == before + 2
+
+
+def test_stats_count_failed_captures():
+    start_worker("http://127.0.0.1:1")
+    before = _stat("log", "failed")
+
+    send_log({"id": "unreachable", "data": {}})
+    assert flush(timeout=10.0) is True
+
+    assert _stat("log", "failed") == before + 1
+
+
+def test_stats_count_dropped_captures(monkeypatch, caplog):
+    monkeypatch.setattr(transport, "_queue", _CaptureQueue(0, 1000))
+    before = _stat("log", "dropped")
+
+    send_log({"id": "no-room", "data": {}})
+
+    assert _stat("log", "dropped") == before + 1
+    assert "Capture queue is full" in caplog.text
+
+
+def test_failed_stats_report_is_retried(monkeypatch):
+    def unreachable(path, payload):
+        raise ConnectionRefusedError("Connection refused")
+
+    monkeypatch.setattr(transport, "_send_to_server", unreachable)
+    monkeypatch.setattr(transport, "_stats_interval", 0)
+    monkeypatch.setattr(transport, "_stats_supported", True)
+    monkeypatch.setattr(transport, "_counts_changed", True)
+
+    transport._report_stats()
+
+    assert transport._counts_changed is True
+
+
+def test_stats_reported_to_server(capture_server):
+    url, _ = capture_server
+    start_worker(url, app="reporter", stats_interval=0)
+
+    send_http({"id": "reported-1"})
+    assert flush(timeout=5.0) is True
+
+    report = CaptureHandler.stats_reports[-1]
+    assert report["app"] == "reporter"
+    assert report["client_id"].endswith(f":{os.getpid()}")
+    assert report["events"]["http"]["sent"] >= 1
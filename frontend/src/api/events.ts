@@ -5,7 +5,8 @@
  * server's OpenAPI spec). This module re-exports them under friendly names and
  * wraps each endpoint in a fetch + React Query hook.
  */
-import { useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
+import { useEffect, useRef, useState } from "react";
+import { useInfiniteQuery, useMutation, useQuery, useQueryClient } from "@tanstack/react-query";
 import type { UseQueryOptions, UseMutationOptions } from "@tanstack/react-query";
 
 import type { components } from "./schema";
@@ -13,6 +14,7 @@ import type { components } from "./schema";
 // --- Types (re-exported from generated schema) ---
 
 export type EventSummary = components["schemas"]["EventSummary"];
+export type EventList = components["schemas"]["EventList"];
 export type EventDetail = components["schemas"]["EventDetail"];
 export type HttpEventData = components["schemas"]["HttpEventData"];
 export type HttpIncomingEventData = components["schemas"]["HttpIncomingEventData"];
@@ -31,6 +33,11 @@ export interface ListEventsParams {
   app?: string;
   session?: string;
   limit?: number;
+  sort?: "newest" | "relevance";
+  /** Cursor: events older than this position (an `EventList.next_cursor`). */
+  before?: string;
+  /** Cursor: events newer than this position (an `EventList.prev_cursor`). */
+  after?: string;
 }
 
 // --- Fetch functions ---
@@ -52,8 +59,32 @@ function buildUrl(path: string, params?: Record<string, string | number | undefi
   return url.toString();
 }
 
-export async function listEvents(params?: ListEventsParams): Promise<EventSummary[]> {
-  return fetchJson(buildUrl("/api/events", params as Record<string, string | number | undefined>));
+// Last response per list URL, so polls can revalidate with `If-None-Match`
+// and reuse the parsed body on `304 Not Modified`.
+const listCache = new Map<string, { etag: string; body: EventList }>();
+const LIST_CACHE_SIZE = 50;
+
+export async function listEvents(params?: ListEventsParams): Promise<EventList> {
+  const url = buildUrl("/api/events", params as Record<string, string | number | undefined>);
+  const cached = listCache.get(url);
+  const res = await fetch(url, {
+    // Bypass the browser cache: a 304 must reach us, not turn into a re-parse.
+    cache: "no-store",
+    headers: cached ? { "If-None-Match": cached.etag } : undefined,
+  });
+  if (res.status === 304 && cached) return cached.body;
+  if (!res.ok) throw new Error(`${res.status} ${res.statusText}`);
+  const body: EventList = await res.json();
+  const etag = res.headers.get("ETag");
+  listCache.delete(url);
+  if (etag) {
+    listCache.set(url, { etag, body });
+    if (listCache.size > LIST_CACHE_SIZE) {
+      const oldest = listCache.keys().next().value;
+      if (oldest !== undefined) listCache.delete(oldest);
+    }
+  }
+  return body;
 }
 
 export async function getEvent(id: string): Promise<EventDetail> {
@@ -73,6 +104,7 @@ export async function clearEvents(): Promise<void> {
 export const eventKeys = {
   all: ["/api/events"] as const,
   list: (params?: ListEventsParams) => ["/api/events", params] as const,
+  pages: (params?: ListEventsParams) => ["/api/events", "pages", params] as const,
   detail: (id: string) => ["/api/events", id] as const,
   meta: ["/api/meta"] as const,
 };
@@ -81,7 +113,7 @@ export const eventKeys = {
 
 export function useListEvents(
   params?: ListEventsParams,
-  options?: Partial<UseQueryOptions<EventSummary[]>>,
+  options?: Partial<UseQueryOptions<EventList>>,
 ) {
   return useQuery({
     queryKey: eventKeys.list(params),
@@ -90,6 +122,55 @@ export function useListEvents(
   });
 }
 
+/** Newest-first event list that loads older pages on demand via `before` cursors. */
+export function useListEventPages(
+  params?: ListEventsParams,
+  options?: { refetchInterval?: number },
+) {
+  return useInfiniteQuery({
+    queryKey: eventKeys.pages(params),
+    queryFn: ({ pageParam }) => listEvents({ ...params, before: pageParam }),
+    initialPageParam: undefined as string | undefined,
+    getNextPageParam: (lastPage) => lastPage.next_cursor ?? undefined,
+    ...options,
+  });
+}
+
+/**
+ * Subscribe to `/api/events/stream` with the given filters and call `onEvent`
+ * for each newly captured event. Returns whether the stream is connected, so
+ * callers can fall back to polling while it isn't (e.g. an older server).
+ * `EventSource` reconnects by itself and the server replays what was missed.
+ */
+export function useEventStream(
+  params: ListEventsParams | undefined,
+  onEvent: (event: EventSummary) => void,
+  enabled = true,
+): boolean {
+  const [connected, setConnected] = useState(false);
+  const onEventRef = useRef(onEvent);
+  useEffect(() => {
+    onEventRef.current = onEvent;
+  }, [onEvent]);
+
+  const url = buildUrl(
+    "/api/events/stream",
+    params as Record<string, string | number | undefined>,
+  );
+  useEffect(() => {
+    if (!enabled) return;
+    const source = new EventSource(url);
+    source.onopen = () => setConnected(true);
+    source.onerror = () => setConnected(false);
+    source.onmessage = (message) => onEventRef.current(JSON.parse(message.data));
+    return () => {
+      source.close();
+      setConnected(false);
+    };
+  }, [url, enabled]);
+  return connected;
+}
+
 export function useGetEvent(id: string, options?: Partial<UseQueryOptions<EventDetail>>) {
   return useQuery({
     queryKey: eventKeys.detail(id),
@@ -72,6 +72,53 @@ export interface paths {
     patch?: never;
     trace?: never;
   };
+  "/api/capture/batch": {
+    parameters: {
+      query?: never;
+      header?: never;
+      path?: never;
+      cookie?: never;
+    };
+    get?: never;
+    put?: never;
+    /**
+     * Capture Batch Api
+     * @description Store a mixed batch of captures.
+     *
+     *     Used by the client transport to ship many events per request. Items are
+     *     validated up front, so a malformed item rejects the whole batch with 422
+     *     and nothing is written.
+     */
+    post: operations["capture_batch_api_api_capture_batch_post"];
+    delete?: never;
+    options?: never;
+    head?: never;
+    patch?: never;
+    trace?: never;
+  };
+  "/api/capture/stats": {
+    parameters: {
+      query?: never;
+      header?: never;
+      path?: never;
+      cookie?: never;
+    };
+    get?: never;
+    put?: never;
+    /**
+     * Capture Stats Api
+     * @description Record a client's delivery counters.
+     *
+     *     Client transports post their sent, dropped, and failed counts per event
+     *     type every few seconds; see `GET /api/clients`.
+     */
+    post: operations["capture_stats_api_api_capture_stats_post"];
+    delete?: never;
+    options?: never;
+    head?: never;
+    patch?: never;
+    trace?: never;
+  };
   "/api/capture": {
     parameters: {
       query?: never;
@@ -116,6 +163,23 @@ export interface paths {
     patch?: never;
     trace?: never;
   };
+  "/api/events/stream": {
+    parameters: {
+      query?: never;
+      header?: never;
+      path?: never;
+      cookie?: never;
+    };
+    /** Stream Events Api */
+    get: operations["stream_events_api_api_events_stream_get"];
+    put?: never;
+    post?: never;
+    delete?: never;
+    options?: never;
+    head?: never;
+    patch?: never;
+    trace?: never;
+  };
   "/api/events/{event_id}": {
     parameters: {
       query?: never;
@@ -150,15 +214,134 @@ export interface paths {
     patch?: never;
     trace?: never;
   };
+  "/api/clients": {
+    parameters: {
+      query?: never;
+      header?: never;
+      path?: never;
+      cookie?: never;
+    };
+    /**
+     * List Clients Api
+     * @description Delivery counters from each client process, most recent report first.
+     */
+    get: operations["list_clients_api_api_clients_get"];
+    put?: never;
+    post?: never;
+    delete?: never;
+    options?: never;
+    head?: never;
+    patch?: never;
+    trace?: never;
+  };
 }
 export type webhooks = Record<string, never>;
 export interface components {
   schemas: {
+    /** CaptureBatchPayload */
+    CaptureBatchPayload: {
+      /** Events */
+      events: (
+        | components["schemas"]["HttpBatchItem"]
+        | components["schemas"]["HttpIncomingBatchItem"]
+        | components["schemas"]["LogBatchItem"]
+        | components["schemas"]["ExceptionBatchItem"]
+      )[];
+    };
+    /** CaptureBatchResponse */
+    CaptureBatchResponse: {
+      /** Status */
+      status: string;
+      /** Count */
+      count: number;
+    };
     /** CaptureResponse */
     CaptureResponse: {
       /** Status */
       status: string;
     };
+    /**
+     * ClientStats
+     * @description The delivery counters one client process last reported.
+     *
+     *     Counts are totals since the client process started.
+     */
+    ClientStats: {
+      /** Client Id */
+      client_id: string;
+      /**
+       * App
+       * @default
+       */
+      app: string;
+      /**
+       * Session
+       * @default
+       */
+      session: string;
+      /**
+       * Smello Version
+       * @default
+       */
+      smello_version: string;
+      /**
+       * Reported At
+       * Format: date-time
+       */
+      reported_at: string;
+      /** Events */
+      events: {
+        [key: string]: components["schemas"]["DeliveryCounts"];
+      };
+    };
+    /** ClientStatsPayload */
+    ClientStatsPayload: {
+      /** Client Id */
+      client_id: string;
+      /**
+       * App
+       * @default
+       */
+      app: string;
+      /**
+       * Session
+       * @default
+       */
+      session: string;
+      /**
+       * Smello Version
+       * @default
+       */
+      smello_version: string;
+      /**
+       * Events
+       * @default {}
+       */
+      events: {
+        [key: string]: components["schemas"]["DeliveryCounts"];
+      };
+    };
+    /**
+     * DeliveryCounts
+     * @description Captures of one event type a client sent, dropped, or failed to send.
+     */
+    DeliveryCounts: {
+      /**
+       * Sent
+       * @default 0
+       */
+      sent: number;
+      /**
+       * Dropped
+       * @default 0
+       */
+      dropped: number;
+      /**
+       * Failed
+       * @default 0
+       */
+      failed: number;
+    };
     /** EventDetail */
     EventDetail: {
       /** Id */
@@ -192,6 +375,22 @@ export interface components {
         | components["schemas"]["LogEventData"]
         | components["schemas"]["ExceptionEventData"];
     };
+    /**
+     * EventList
+     * @description One page of `/api/events`, newest first.
+     *
+     * Pass ``next_cursor`` as ``before`` to get the next, older page; it is
+     * ``None`` once there is nothing older. Pass ``prev_cursor`` as ``after``
+     * to get events newer than this page.
+     */
+    EventList: {
+      /** Events */
+      events: components["schemas"]["EventSummary"][];
+      /** Next Cursor */
+      next_cursor?: string | null;
+      /** Prev Cursor */
+      prev_cursor?: string | null;
+    };
     /** EventSummary */
     EventSummary: {
       /** Id */
@@ -219,6 +418,29 @@ export interface components {
        */
       session: string;
     };
+    /** ExceptionBatchItem */
+    ExceptionBatchItem: {
+      /** Id */
+      id?: string | null;
+      /** Timestamp */
+      timestamp?: string | null;
+      data: components["schemas"]["ExceptionData"];
+      /**
+       * App
+       * @default
+       */
+      app: string;
+      /**
+       * Session
+       * @default
+       */
+      session: string;
+      /**
+       * @description discriminator enum property added by openapi-typescript
+       * @enum {string}
+       */
+      event_type: "exception";
+    };
     /** ExceptionCapturePayload */
     ExceptionCapturePayload: {
       /** Id */
@@ -324,6 +546,43 @@ export interface components {
       /** Detail */
       detail?: components["schemas"]["ValidationError"][];
     };
+    /** HttpBatchItem */
+    HttpBatchItem: {
+      /** Id */
+      id?: string | null;
+      /** Timestamp */
+      timestamp?: string | null;
+      /**
+       * Duration Ms
+       * @default 0
+       */
+      duration_ms: number;
+      request: components["schemas"]["HttpRequestData"];
+      response: components["schemas"]["HttpResponseData"];
+      /**
+       * @default {
+       *       "library": "unknown",
+       *       "python_version": "",
+       *       "smello_version": ""
+       *     }
+       */
+      meta: components["schemas"]["HttpMeta"];
+      /**
+       * App
+       * @default
+       */
+      app: string;
+      /**
+       * Session
+       * @default
+       */
+      session: string;
+      /**
+       * @description discriminator enum property added by openapi-typescript
+       * @enum {string}
+       */
+      event_type: "http";
+    };
     /** HttpCapturePayload */
     HttpCapturePayload: {
       /** Id */
@@ -424,6 +683,43 @@ export interface components {
        */
       smello_version: string;
     };
+    /** HttpIncomingBatchItem */
+    HttpIncomingBatchItem: {
+      /** Id */
+      id?: string | null;
+      /** Timestamp */
+      timestamp?: string | null;
+      /**
+       * Duration Ms
+       * @default 0
+       */
+      duration_ms: number;
+      request: components["schemas"]["HttpIncomingRequestData"];
+      response: components["schemas"]["HttpIncomingResponseData"];
+      /**
+       * @default {
+       *       "framework": "unknown",
+       *       "python_version": "",
+       *       "smello_version": ""
+       *     }
+       */
+      meta: components["schemas"]["HttpIncomingMeta"];
+      /**
+       * App
+       * @default
+       */
+      app: string;
+      /**
+       * Session
+       * @default
+       */
+      session: string;
+      /**
+       * @description discriminator enum property added by openapi-typescript
+       * @enum {string}
+       */
+      event_type: "http_incoming";
+    };
     /** HttpIncomingCapturePayload */
     HttpIncomingCapturePayload: {
       /** Id */
@@ -648,6 +944,29 @@ export interface components {
        */
       body_size: number;
     };
+    /** LogBatchItem */
+    LogBatchItem: {
+      /** Id */
+      id?: string | null;
+      /** Timestamp */
+      timestamp?: string | null;
+      data: components["schemas"]["LogData"];
+      /**
+       * App
+       * @default
+       */
+      app: string;
+      /**
+       * Session
+       * @default
+       */
+      session: string;
+      /**
+       * @description discriminator enum property added by openapi-typescript
+       * @enum {string}
+       */
+      event_type: "log";
+    };
     /** LogCapturePayload */
     LogCapturePayload: {
       /** Id */
@@ -894,6 +1213,72 @@ export interface operations {
       };
     };
   };
+  capture_batch_api_api_capture_batch_post: {
+    parameters: {
+      query?: never;
+      header?: never;
+      path?: never;
+      cookie?: never;
+    };
+    requestBody: {
+      content: {
+        "application/json": components["schemas"]["CaptureBatchPayload"];
+      };
+    };
+    responses: {
+      /** @description Successful Response */
+      201: {
+        headers: {
+          [name: string]: unknown;
+        };
+        content: {
+          "application/json": components["schemas"]["CaptureBatchResponse"];
+        };
+      };
+      /** @description Validation Error */
+      422: {
+        headers: {
+          [name: string]: unknown;
+        };
+        content: {
+          "application/json": components["schemas"]["HTTPValidationError"];
+        };
+      };
+    };
+  };
+  capture_stats_api_api_capture_stats_post: {
+    parameters: {
+      query?: never;
+      header?: never;
+      path?: never;
+      cookie?: never;
+    };
+    requestBody: {
+      content: {
+        "application/json": components["schemas"]["ClientStatsPayload"];
+      };
+    };
+    responses: {
+      /** @description Successful Response */
+      200: {
+        headers: {
+          [name: string]: unknown;
+        };
+        content: {
+          "application/json": components["schemas"]["CaptureResponse"];
+        };
+      };
+      /** @description Validation Error */
+      422: {
+        headers: {
+          [name: string]: unknown;
+        };
+        content: {
+          "application/json": components["schemas"]["HTTPValidationError"];
+        };
+      };
+    };
+  };
   capture_legacy_api_api_capture_post: {
     parameters: {
       query?: never;
@@ -938,6 +1323,12 @@ export interface operations {
         app?: string | null;
         session?: string | null;
         limit?: number;
+        /** @description `relevance` orders `search` results best match first. */
+        sort?: "newest" | "relevance";
+        /** @description Cursor: return events older than this position. */
+        before?: string | null;
+        /** @description Cursor: return events newer than this position. */
+        after?: string | null;
       };
       header?: never;
       path?: never;
@@ -951,9 +1342,16 @@ export interface operations {
           [name: string]: unknown;
         };
         content: {
-          "application/json": components["schemas"]["EventSummary"][];
+          "application/json": components["schemas"]["EventList"];
         };
       };
+      /** @description No events changed since the `If-None-Match` ETag */
+      304: {
+        headers: {
+          [name: string]: unknown;
+        };
+        content?: never;
+      };
       /** @description Validation Error */
       422: {
         headers: {
@@ -983,6 +1381,46 @@ export interface operations {
       };
     };
   };
+  stream_events_api_api_events_stream_get: {
+    parameters: {
+      query?: {
+        event_type?: string | null;
+        host?: string | null;
+        method?: string | null;
+        status?: number | null;
+        search?: string | null;
+        app?: string | null;
+        session?: string | null;
+      };
+      header?: {
+        /** @description Replay events stored after this cursor first. */
+        "last-event-id"?: string | null;
+      };
+      path?: never;
+      cookie?: never;
+    };
+    requestBody?: never;
+    responses: {
+      /** @description Server-Sent Events: one `EventSummary` JSON per event, oldest first. Each event's `id` is a list cursor. */
+      200: {
+        headers: {
+          [name: string]: unknown;
+        };
+        content: {
+          "text/event-stream": unknown;
+        };
+      };
+      /** @description Validation Error */
+      422: {
+        headers: {
+          [name: string]: unknown;
+        };
+        content: {
+          "application/json": components["schemas"]["HTTPValidationError"];
+        };
+      };
+    };
+  };
   get_event_api_api_events__event_id__get: {
     parameters: {
       query?: never;
@@ -1034,4 +1472,36 @@ export interface operations {
       };
     };
   };
+  list_clients_api_api_clients_get: {
+    parameters: {
+      query?: {
+        app?: string | null;
+        session?: string | null;
+      };
+      header?: never;
+      path?: never;
+      cookie?: never;
+    };
+    requestBody?: never;
+    responses: {
+      /** @description Successful Response */
+      200: {
+        headers: {
+          [name: string]: unknown;
+        };
+        content: {
+          "application/json": components["schemas"]["ClientStats"][];
+        };
+      };
+      /** @description Validation Error */
+      422: {
+        headers: {
+          [name: string]: unknown;
+        };
+        content: {
+          "application/json": components["schemas"]["HTTPValidationError"];
+        };
+      };
+    };
+  };
 }
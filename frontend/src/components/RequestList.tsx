@@ -1,4 +1,5 @@
 import Box from "@mui/material/Box";
+import Button from "@mui/material/Button";
 import Stack from "@mui/material/Stack";
 import List from "@mui/material/List";
 import Typography from "@mui/material/Typography";
@@ -9,7 +10,12 @@ import RequestListItem from "./RequestListItem";
 
 export default function RequestList() {
   const [selectedId, setSelectedId] = useSelectedRequestId();
-  const { data: requests = [] } = useFilteredRequests();
+  const {
+    data: requests = [],
+    fetchNextPage,
+    hasNextPage,
+    isFetchingNextPage,
+  } = useFilteredRequests();
 
   return (
     <Box
@@ -39,6 +45,18 @@ export default function RequestList() {
               onClick={() => setSelectedId(item.id)}
             />
           ))}
+          {hasNextPage && (
+            <Box sx={{ p: 1, textAlign: "center" }}>
+              <Button
+                size="small"
+                color="inherit"
+                disabled={isFetchingNextPage}
+                onClick={() => fetchNextPage()}
+              >
+                {isFetchingNextPage ? "Loading…" : "Load older events"}
+              </Button>
+            </Box>
+          )}
         </List>
       )}
     </Box>
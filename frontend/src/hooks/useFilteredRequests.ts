@@ -1,4 +1,6 @@
+import { useCallback, useMemo } from "react";
 import { useAtomValue } from "jotai";
+import { useQueryClient, type InfiniteData } from "@tanstack/react-query";
 import {
   hostFilterAtom,
   methodFilterAtom,
@@ -7,7 +9,14 @@ import {
   appFilterAtom,
   sessionFilterAtom,
 } from "../atoms/filters";
-import { useListEvents } from "../api/events";
+import {
+  eventKeys,
+  useEventStream,
+  useListEventPages,
+  type EventList,
+  type EventSummary,
+  type ListEventsParams,
+} from "../api/events";
 
 export function useFilteredRequests() {
   const host = useAtomValue(hostFilterAtom);
@@ -17,15 +26,37 @@ export function useFilteredRequests() {
   const app = useAtomValue(appFilterAtom);
   const session = useAtomValue(sessionFilterAtom);
 
-  return useListEvents(
-    {
+  const params: ListEventsParams = useMemo(
+    () => ({
       ...(eventType ? { event_type: eventType } : {}),
       ...(host ? { host } : {}),
       ...(method ? { method } : {}),
       ...(search ? { search } : {}),
       ...(app !== undefined ? { app } : {}),
       ...(session !== undefined ? { session } : {}),
+    }),
+    [eventType, host, method, search, app, session],
+  );
+
+  // New events arrive over the live stream and are prepended to the first
+  // page; the list only polls while the stream is down.
+  const queryClient = useQueryClient();
+  const prepend = useCallback(
+    (event: EventSummary) => {
+      queryClient.setQueryData<InfiniteData<EventList, string | undefined>>(
+        eventKeys.pages(params),
+        (data) => {
+          const [first, ...rest] = data?.pages ?? [];
+          if (!data || !first || first.events.some((e) => e.id === event.id)) return data;
+          return { ...data, pages: [{ ...first, events: [event, ...first.events] }, ...rest] };
+        },
+      );
     },
-    { refetchInterval: 3_000 },
+    [queryClient, params],
   );
+  const live = useEventStream(params, prepend);
+
+  const query = useListEventPages(params, { refetchInterval: live ? undefined : 3_000 });
+  const data = useMemo(() => query.data?.pages.flatMap((page) => page.events), [query.data]);
+  return { ...query, data };
 }
@@ -86,7 +86,9 @@ export default function SplitView() {
     }
   }, []);
 
-  const { data: allEvents = [], isLoading } = useListEvents({}, { refetchInterval: 3_000 });
+  // Only tells whether anything was captured yet. Unchanged polls are
+  // answered with 304 from the server's ETag, without touching SQLite.
+  const { data: latest, isLoading } = useListEvents({ limit: 1 }, { refetchInterval: 3_000 });
 
   const setSnackbar = useSetAtom(snackbarMessageAtom);
   const clearMutation = useClearEvents({
@@ -102,7 +104,7 @@ export default function SplitView() {
     return <SplitViewSkeleton />;
   }
 
-  if (allEvents.length === 0) {
+  if (!latest?.events.length) {
     return <EmptyState />;
   }
 
@@ -60,7 +60,7 @@ const DEFAULT_SESSION = {
     {
       role: "tool_call",
       tool: "Bash",
-      header: "curl -s localhost:5110/api/events | jq '[.[] | select(.summary | startswith(\"POST /api/orders\"))]'",
+      header: "curl -s localhost:5110/api/events | jq '[.events[] | select(.summary | startswith(\"POST /api/orders\"))]'",
       collapsed: true,
     },
     {
@@ -53,7 +53,7 @@ async function clearRequests() {
 async function waitForRequests(minCount = 1, timeoutMs = 10000) {
   const start = Date.now();
   while (Date.now() - start < timeoutMs) {
-    const requests = await smelloAPI(
+    const { events: requests } = await smelloAPI(
       `/api/events?event_type=http&limit=${minCount}`,
     );
     if (requests.length >= minCount) return requests;
@@ -153,7 +153,7 @@ async function main() {
   //    (POST by default) since it shows request + response bodies, then fall
   //    back to the most recent capture.
   await waitForRequests(1);
-  const requests = await smelloAPI("/api/events?event_type=http&limit=50");
+  const { events: requests } = await smelloAPI("/api/events?event_type=http&limit=50");
   const wantedMethod = args["select-method"].toUpperCase();
   const matchPrefix = `${wantedMethod} `;
   const picked =
@@ -0,0 +1,522 @@
+"""Benchmark how fast smello-server absorbs captures and answers reads.
+
+Seeds a database with synthetic events, starts the server on it in a
+subprocess, and drives the capture and read endpoints from concurrent
+clients. Prints throughput and p50/p99 latency per scenario as JSON::
+
+    uv run python server/benchmarks/bench_server.py --rows 10k --rows 1M
+
+Run with ``--help`` for the options, and see README.md next to this file.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import platform
+import random
+import socket
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Generator, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import httpx
+import smello_server
+
+SEED_BATCH = 1000
+HOSTS = [
+    "api.stripe.com",
+    "api.openai.com",
+    "api.github.com",
+    "hooks.slack.com",
+    "s3.amazonaws.com",
+]
+APPS = ["web", "worker", "cron"]
+# App of the events captured while measuring, told apart from seeded ones.
+LIVE_APP = "bench-live"
+LOGGERS = ["app.billing", "app.auth", "app.sync", "urllib3", "celery"]
+WORDS = (
+    "charge customer invoice refund token session timeout retry webhook"
+    " upload download sync account payment subscription quota"
+).split()
+_SIZE_SUFFIXES = {"k": 1_000, "m": 1_000_000}
+
+
+def parse_count(value: str) -> int:
+    """Parse ``10000``, ``10k``, or ``1M``."""
+    suffix = value[-1:].lower()
+    if suffix in _SIZE_SUFFIXES:
+        return int(value[:-1]) * _SIZE_SUFFIXES[suffix]
+    return int(value)
+
+
+# --- Synthetic payloads ---
+
+
+def event_id(index: int) -> str:
+    """Deterministic id of the *index*-th seeded event, so cached databases
+    can be reused and detail lookups hit stored rows."""
+    return str(uuid.UUID(int=index, version=4))
+
+
+def http_payload(rng: random.Random) -> dict:
+    host = rng.choice(HOSTS)
+    method = rng.choice(["GET", "GET", "GET", "POST", "DELETE"])
+    resource = rng.choice(WORDS)
+    request_body = (
+        json.dumps({"resource": resource, "amount": rng.randrange(100, 10_000)})
+        if method == "POST"
+        else None
+    )
+    response_body = json.dumps(
+        {
+            "object": resource,
+            "id": f"{resource}_{rng.getrandbits(48):x}",
+            "items": [rng.choice(WORDS) for _ in range(rng.randrange(1, 20))],
+        }
+    )
+    return {
+        "duration_ms": rng.randrange(5, 2000),
+        "request": {
+            "method": method,
+            "url": f"https://{host}/v1/{resource}s/{rng.randrange(1000)}",
+            "headers": {"Accept": "application/json", "User-Agent": "bench/1.0"},
+            "body": request_body,
+            "body_size": len(request_body or ""),
+        },
+        "response": {
+            "status_code": rng.choice([200, 200, 200, 201, 404, 500]),
+            "headers": {"Content-Type": "application/json"},
+            "body": response_body,
+            "body_size": len(response_body),
+        },
+        "meta": {"library": "httpx", "python_version": "3.14.0"},
+        "app": rng.choice(APPS),
+    }
+
+
+def http_incoming_payload(rng: random.Random) -> dict:
+    resource = rng.choice(WORDS)
+    path = f"/{resource}s/{rng.randrange(1000)}"
+    return {
+        "duration_ms": rng.randrange(1, 500),
+        "request": {
+            "method": "GET",
+            "path": path,
+            "url": f"http://localhost:8000{path}",
+            "headers": {"Host": "localhost:8000"},
+        },
+        "response": {
+            "status_code": 200,
+            "headers": {"Content-Type": "application/json"},
+            "body": json.dumps({"object": resource}),
+        },
+        "meta": {"framework": "fastapi", "route": f"/{resource}s/{{id}}"},
+        "app": "web",
+    }
+
+
+def log_payload(rng: random.Random) -> dict:
+    message = " ".join(rng.choice(WORDS) for _ in range(rng.randrange(3, 12)))
+    return {
+        "data": {
+            "level": rng.choice(["DEBUG", "INFO", "INFO", "WARNING", "ERROR"]),
+            "logger_name": rng.choice(LOGGERS),
+            "message": message,
+            "pathname": "/srv/app/tasks.py",
+            "lineno": rng.randrange(1, 500),
+            "func_name": "run",
+        },
+        "app": rng.choice(APPS),
+    }
+
+
+def exception_payload(rng: random.Random) -> dict:
+    value = f"{rng.choice(WORDS)} {rng.choice(WORDS)} failed"
+    return {
+        "data": {
+            "exc_type": rng.choice(["ValueError", "KeyError", "TimeoutError"]),
+            "exc_value": value,
+            "exc_module": "builtins",
+            "traceback_text": f"Traceback (most recent call last):\n  ...\n{value}",
+            "frames": [
+                {
+                    "filename": "/srv/app/tasks.py",
+                    "lineno": rng.randrange(1, 500),
+                    "function": "run",
+                    "context_line": "    sync(account)",
+                }
+            ],
+        },
+        "app": rng.choice(APPS),
+    }
+
+
+# Seeded mix: mostly outgoing HTTP, as in a typical captured session.
+SEED_MIX = [
+    ("http", http_payload, 60),
+    ("http_incoming", http_incoming_payload, 10),
+    ("log", log_payload, 25),
+    ("exception", exception_payload, 5),
+]
+
+
+def seed_items(start: int, stop: int, total: int, seed: int) -> Iterator[dict]:
+    """Batch items for seeded events *start* to *stop*, one second apart and
+    ending now, so live captures made by the benchmark sort as newest."""
+    rng = random.Random(seed * 1_000_003 + start)
+    now = datetime.now(timezone.utc)
+    types = [(t, build) for t, build, _ in SEED_MIX]
+    weights = [w for _, _, w in SEED_MIX]
+    for index in range(start, stop):
+        event_type, build = rng.choices(types, weights)[0]
+        yield {
+            **build(rng),
+            "event_type": event_type,
+            "id": event_id(index),
+            "timestamp": (now - timedelta(seconds=total - index)).isoformat(),
+        }
+
+
+def seeded_rows(db_path: Path) -> int:
+    """Seeded events already in a database kept with ``--db-dir``."""
+    if not db_path.exists():
+        return 0
+    with contextlib.closing(sqlite3.connect(db_path)) as conn:
+        try:
+            (count,) = conn.execute(
+                "SELECT count(*) FROM captured_events WHERE app != ?", [LIVE_APP]
+            ).fetchone()
+        except sqlite3.OperationalError:
+            return 0
+    return count
+
+
+async def seed(client: httpx.AsyncClient, start: int, total: int, seed: int) -> None:
+    """Store events *start* to *total* through ``/api/capture/batch``."""
+    semaphore = asyncio.Semaphore(4)
+
+    async def send(offset: int) -> None:
+        async with semaphore:
+            stop = min(offset + SEED_BATCH, total)
+            items = list(seed_items(offset, stop, total, seed))
+            response = await client.post("/api/capture/batch", json={"events": items})
+            response.raise_for_status()
+
+    await asyncio.gather(*(send(o) for o in range(start, total, SEED_BATCH)))
+    # Reads write out pending captures first.
+    (await client.get("/api/meta")).raise_for_status()
+
+
+# --- Scenarios ---
+
+
+@dataclass
+class Context:
+    rows: int
+    rng: random.Random
+
+
+Scenario = Callable[[httpx.AsyncClient, Context], Awaitable[httpx.Response]]
+
+
+def _capture(path: str, build: Callable[[random.Random], dict]) -> Scenario:
+    async def run(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+        return await client.post(path, json={**build(ctx.rng), "app": LIVE_APP})
+
+    return run
+
+
+def _get(path: str, params: Callable[[Context], dict] | None = None) -> Scenario:
+    async def run(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+        return await client.get(path, params=params(ctx) if params else None)
+
+    return run
+
+
+async def _event_detail(client: httpx.AsyncClient, ctx: Context) -> httpx.Response:
+    return await client.get(f"/api/events/{event_id(ctx.rng.randrange(ctx.rows))}")
+
+
+# Reads run before captures, so they see the seeded table size.
+SCENARIOS: dict[str, Scenario] = {
+    "list_events": _get("/api/events"),
+    "list_events_filtered": _get(
+        "/api/events",
+        lambda ctx: {"host": ctx.rng.choice(HOSTS), "method": "POST"},
+    ),
+    "search": _get("/api/events", lambda ctx: {"search": ctx.rng.choice(WORDS)}),
+    "event_detail": _event_detail,
+    "meta": _get("/api/meta"),
+    "capture_http": _capture("/api/capture/http", http_payload),
+    "capture_log": _capture("/api/capture/log", log_payload),
+}
+CAPTURE_SCENARIOS = {"capture_http", "capture_log"}
+
+
+async def measure(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    ctx: Context,
+    *,
+    concurrency: int,
+    duration: float,
+) -> tuple[list[float], int, float]:
+    """Run *scenario* from *concurrency* workers for *duration* seconds.
+
+    Returns the latencies of successful requests in seconds, the number of
+    failed ones, and the elapsed time.
+    """
+    latencies: list[float] = []
+    errors = 0
+    started = time.perf_counter()
+    deadline = started + duration
+
+    async def worker() -> None:
+        nonlocal errors
+        while (begin := time.perf_counter()) < deadline:
+            try:
+                response = await scenario(client, ctx)
+            except httpx.HTTPError:
+                errors += 1
+                continue
+            if response.is_success:
+                latencies.append(time.perf_counter() - begin)
+            else:
+                errors += 1
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+def summarize(latencies: list[float], errors: int, elapsed: float) -> dict:
+    ms = sorted(latency * 1000 for latency in latencies)
+    latency = None
+    if ms:
+        # "inclusive" needs two points; with one, every percentile is it.
+        percentiles = statistics.quantiles(ms * 2, n=100, method="inclusive")
+        latency = {
+            "p50": round(percentiles[49], 3),
+            "p99": round(percentiles[98], 3),
+            "mean": round(statistics.fmean(ms), 3),
+            "max": round(ms[-1], 3),
+        }
+    return {
+        "requests": len(ms),
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(ms) / elapsed, 1),
+        "latency_ms": latency,
+    }
+
+
+# --- Server ---
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextlib.contextmanager
+def running_server(db_path: Path, port: int) -> Generator[subprocess.Popen]:
+    env = {**os.environ, "SMELLO_DB_PATH": str(db_path)}
+    # Retention would delete seeded rows mid-run.
+    for name in list(env):
+        if name.startswith("SMELLO_MAX_") or name == "SMELLO_APP_MAX_EVENTS":
+            del env[name]
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "uvicorn",
+            "smello_server.app:create_app",
+            "--factory",
+            "--host=127.0.0.1",
+            f"--port={port}",
+            "--log-level=warning",
+            "--no-access-log",
+        ],
+        env=env,
+    )
+    try:
+        yield process
+    finally:
+        process.terminate()
+        try:
+            process.wait(10)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+async def wait_ready(client: httpx.AsyncClient, process: subprocess.Popen) -> None:
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"smello-server exited with code {process.returncode}")
+        with contextlib.suppress(httpx.TransportError):
+            if (await client.get("/api/meta")).is_success:
+                return
+        await asyncio.sleep(0.1)
+    raise RuntimeError("smello-server did not start within 60 seconds")
+
+
+async def bench_size(rows: int, db_path: Path, args: argparse.Namespace) -> list[dict]:
+    port = args.port or free_port()
+    existing = seeded_rows(db_path)
+    limits = httpx.Limits(max_connections=max(args.concurrency) + 4)
+    results = []
+    with running_server(db_path, port) as process:
+        async with httpx.AsyncClient(
+            base_url=f"http://127.0.0.1:{port}", limits=limits, timeout=60
+        ) as client:
+            await wait_ready(client, process)
+            seed_started = time.perf_counter()
+            if existing < rows:
+                print(
+                    f"Seeding {rows - existing} events into {db_path}", file=sys.stderr
+                )
+                await seed(client, existing, rows, args.seed)
+            seed_seconds = time.perf_counter() - seed_started
+
+            for name in args.scenario:
+                for concurrency in args.concurrency:
+                    ctx = Context(rows=rows, rng=random.Random(args.seed))
+                    scenario = SCENARIOS[name]
+                    await measure(
+                        client,
+                        scenario,
+                        ctx,
+                        concurrency=concurrency,
+                        duration=args.warmup,
+                    )
+                    latencies, errors, elapsed = await measure(
+                        client,
+                        scenario,
+                        ctx,
+                        concurrency=concurrency,
+                        duration=args.duration,
+                    )
+                    if name in CAPTURE_SCENARIOS:
+                        # Count the time to write out what was acknowledged.
+                        drain = time.perf_counter()
+                        (await client.get("/api/meta")).raise_for_status()
+                        elapsed += time.perf_counter() - drain
+                    result = {
+                        "rows": rows,
+                        "scenario": name,
+                        "concurrency": concurrency,
+                        **summarize(latencies, errors, elapsed),
+                    }
+                    print(
+                        f"{rows:>10} rows  {name:<22} c={concurrency:<4}"
+                        f" {result['throughput_rps']:>9} req/s"
+                        f"  p50={(result['latency_ms'] or {}).get('p50')} ms"
+                        f"  p99={(result['latency_ms'] or {}).get('p99')} ms",
+                        file=sys.stderr,
+                    )
+                    results.append(result)
+    for result in results:
+        result["seed_s"] = round(seed_seconds, 1)
+    return results
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--rows",
+        type=parse_count,
+        action="append",
+        help="Seeded table size, e.g. 10k, 1M, 10M. Repeatable. (default: 10k)",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        action="append",
+        help="Concurrent clients per scenario. Repeatable. (default: 1 and 16)",
+    )
+    parser.add_argument(
+        "--scenario",
+        choices=list(SCENARIOS),
+        action="append",
+        help="Scenario to run. Repeatable. (default: all)",
+    )
+    parser.add_argument(
+        "--duration",
+        type=float,
+        default=10.0,
+        help="Seconds per measurement. (default: 10)",
+    )
+    parser.add_argument(
+        "--warmup",
+        type=float,
+        default=1.0,
+        help="Unmeasured seconds before each measurement. (default: 1)",
+    )
+    parser.add_argument(
+        "--db-dir",
+        type=Path,
+        help="Keep seeded databases here and reuse them on later runs."
+        " (default: a temporary directory)",
+    )
+    parser.add_argument(
+        "--port", type=int, default=0, help="0 picks a free port. (default: 0)"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Random seed. (default: 0)")
+    parser.add_argument(
+        "--output", type=Path, help="Write the JSON report here. (default: stdout)"
+    )
+    args = parser.parse_args(argv)
+    args.rows = args.rows or [10_000]
+    args.concurrency = args.concurrency or [1, 16]
+    # Keep the declared order: reads first.
+    args.scenario = [s for s in SCENARIOS if s in (args.scenario or SCENARIOS)]
+    return args
+
+
+async def run(args: argparse.Namespace) -> dict:
+    results = []
+    with contextlib.ExitStack() as stack:
+        db_dir = args.db_dir or Path(stack.enter_context(tempfile.TemporaryDirectory()))
+        db_dir.mkdir(parents=True, exist_ok=True)
+        for rows in args.rows:
+            db_path = db_dir / f"smello-{rows}.db"
+            results.extend(await bench_size(rows, db_path, args))
+    return {
+        "environment": {
+            "smello_server": smello_server.__version__,
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "config": {
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "seed": args.seed,
+        },
+        "results": results,
+    }
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = parse_args(argv)
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        args.output.write_text(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
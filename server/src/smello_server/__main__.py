@@ -9,6 +9,7 @@ backwards compatibility (e.g. `just server`, the Dockerfile).
 import json
 import logging
 import os
+import socket
 import threading
 import webbrowser
 from pathlib import Path
@@ -43,13 +44,16 @@ def _get_url(host: str, port: int) -> str:
     return f"http://{host}:{port}"
 
 
-def _print_banner(host: str, port: int):
+def _print_banner(host: str, port: int, uds: str | None = None):
     console = Console()
     url = _get_url(host, port)
 
     body = Text()
     body.append("Smello is running at ", style="bold")
     body.append(url, style="bold #FFA600")
+    if uds:
+        body.append("\nClients can capture over ", style="bold")
+        body.append(f"unix://{uds}", style="bold #FFA600")
     body.append("\n\n")
     body.append(
         "If Smello's been useful, a GitHub star helps others find it too:\n",
@@ -71,37 +75,149 @@ def _start_server(
     db_path: str | None,
     reload: bool,
     open_browser: bool,
+    max_age: str | None = None,
+    max_events: int | None = None,
+    max_db_size: str | None = None,
+    app_max_events: list[str] | None = None,
+    uds: str | None = None,
 ) -> None:
+    if uds and reload:
+        raise typer.BadParameter("--uds cannot be combined with --reload.")
     if db_path:
         os.environ["SMELLO_DB_PATH"] = db_path
+    # Passed to the app factory (and any reload workers) via the environment.
+    if max_age:
+        os.environ["SMELLO_MAX_AGE"] = max_age
+    if max_events is not None:
+        os.environ["SMELLO_MAX_EVENTS"] = str(max_events)
+    if max_db_size:
+        os.environ["SMELLO_MAX_DB_SIZE"] = max_db_size
+    if app_max_events:
+        os.environ["SMELLO_APP_MAX_EVENTS"] = ",".join(app_max_events)
 
     resolved_db = db_path or os.environ.get("SMELLO_DB_PATH") or str(DEFAULT_DB_PATH)
     logging.basicConfig(level=logging.INFO)
     logger.info("Database: %s", resolved_db)
+    _check_retention()
 
-    _print_banner(host, port)
+    # Bind before printing the banner so a busy socket path fails cleanly.
+    unix_sock = _bind_uds(uds) if uds else None
+
+    _print_banner(host, port, uds)
 
     if open_browser:
         url = _get_url(host, port)
         threading.Timer(1.5, webbrowser.open, args=(url,)).start()
 
-    uvicorn.run(
+    if unix_sock is None:
+        uvicorn.run(
+            "smello_server.app:create_app",
+            factory=True,
+            host=host,
+            port=port,
+            log_level="info",
+            reload=reload,
+            # Open live streams (/api/events/stream) never finish on their own;
+            # don't let an open dashboard tab hold up Ctrl+C.
+            timeout_graceful_shutdown=3,
+        )
+        return
+
+    # uvicorn.run() binds a single socket; serve the dashboard's TCP port and
+    # the Unix socket from one server instead.
+    config = uvicorn.Config(
         "smello_server.app:create_app",
         factory=True,
         host=host,
         port=port,
         log_level="info",
-        reload=reload,
+        timeout_graceful_shutdown=3,
     )
+    sockets = [config.bind_socket(), unix_sock]
+    try:
+        uvicorn.Server(config).run(sockets=sockets)
+    finally:
+        for sock in sockets:
+            sock.close()
+        Path(uds).unlink(missing_ok=True)
+
+
+def _bind_uds(path: str) -> socket.socket:
+    """Bind a Unix domain socket at *path* for local clients.
+
+    A socket file left behind by a server that is no longer running is
+    replaced; a live server or a regular file at *path* is an error.
+    """
+    target = Path(path)
+    if target.exists() or target.is_symlink():
+        if not target.is_socket():
+            raise typer.BadParameter(f"{path} exists and is not a socket.")
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+            except OSError:
+                target.unlink()
+            else:
+                raise typer.BadParameter(f"{path} is already in use.")
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.bind(path)
+        # Clients often run as another user (e.g. inside a container).
+        os.chmod(path, 0o666)
+    except OSError as exc:
+        sock.close()
+        raise typer.BadParameter(f"cannot bind {path}: {exc}") from exc
+    sock.set_inheritable(True)
+    return sock
+
+
+def _check_retention() -> None:
+    """Fail fast on a malformed retention limit, before uvicorn starts."""
+    from smello_server.services.retention import RetentionPolicy  # noqa: PLC0415
+
+    try:
+        policy = RetentionPolicy.from_env()
+    except ValueError as exc:
+        raise typer.BadParameter(str(exc)) from exc
+    if policy.enabled:
+        logger.info("Retention: %s", policy)
 
 
 HOST_OPT = Annotated[str, typer.Option(help="Host to bind to.")]
 PORT_OPT = Annotated[int, typer.Option(help="Port to bind to.")]
+UDS_OPT = Annotated[
+    str | None,
+    typer.Option(
+        help="Also accept captures on this Unix domain socket "
+        "(clients use SMELLO_URL=unix:///path)."
+    ),
+]
 DB_PATH_OPT = Annotated[
     str | None,
     typer.Option(help=f"Path to SQLite database file (default: {DEFAULT_DB_PATH})."),
 ]
 RELOAD_OPT = Annotated[bool, typer.Option(help="Enable auto-reload on code changes.")]
+MAX_AGE_OPT = Annotated[
+    str | None,
+    typer.Option(help="Delete events older than this, e.g. 12h, 7d, 2w."),
+]
+MAX_EVENTS_OPT = Annotated[
+    int | None,
+    typer.Option(min=0, help="Keep at most this many events, deleting the oldest."),
+]
+MAX_DB_SIZE_OPT = Annotated[
+    str | None,
+    typer.Option(
+        help="Delete the oldest events while the database is larger, e.g. 500MB."
+    ),
+]
+APP_MAX_EVENTS_OPT = Annotated[
+    list[str] | None,
+    typer.Option(
+        metavar="APP=COUNT",
+        help="Keep at most COUNT events for APP. Repeatable.",
+    ),
+]
 OPEN_BROWSER_OPT = Annotated[
     bool,
     typer.Option("--open/--no-open", help="Open the dashboard in a browser."),
@@ -116,6 +232,11 @@ def main_callback(
     db_path: DB_PATH_OPT = None,
     reload: RELOAD_OPT = False,
     open_browser: OPEN_BROWSER_OPT = True,
+    max_age: MAX_AGE_OPT = None,
+    max_events: MAX_EVENTS_OPT = None,
+    max_db_size: MAX_DB_SIZE_OPT = None,
+    app_max_events: APP_MAX_EVENTS_OPT = None,
+    uds: UDS_OPT = None,
     version: Annotated[
         bool,
         typer.Option(
@@ -135,6 +256,11 @@ def main_callback(
         db_path=db_path,
         reload=reload,
         open_browser=open_browser,
+        max_age=max_age,
+        max_events=max_events,
+        max_db_size=max_db_size,
+        app_max_events=app_max_events,
+        uds=uds,
     )
 
 
@@ -145,6 +271,11 @@ def run(
     db_path: DB_PATH_OPT = None,
     reload: RELOAD_OPT = False,
     open_browser: OPEN_BROWSER_OPT = True,
+    max_age: MAX_AGE_OPT = None,
+    max_events: MAX_EVENTS_OPT = None,
+    max_db_size: MAX_DB_SIZE_OPT = None,
+    app_max_events: APP_MAX_EVENTS_OPT = None,
+    uds: UDS_OPT = None,
 ):
     """Start the Smello server (alias for the bare invocation)."""
     _start_server(
@@ -153,6 +284,11 @@ def run(
         db_path=db_path,
         reload=reload,
         open_browser=open_browser,
+        max_age=max_age,
+        max_events=max_events,
+        max_db_size=max_db_size,
+        app_max_events=app_max_events,
+        uds=uds,
     )
 
 
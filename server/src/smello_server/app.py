@@ -1,6 +1,8 @@
 """FastAPI application setup with Tortoise ORM."""
 
 import os
+from collections.abc import AsyncGenerator
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
@@ -9,7 +11,13 @@ from starlette.exceptions import HTTPException
 from starlette.types import Receive, Scope, Send
 from tortoise.contrib.fastapi import register_tortoise
 
+from smello_server.db import tortoise_config
+from smello_server.migrations import init_db
 from smello_server.routes.api import router as api_router
+from smello_server.services.clients import ClientRegistry
+from smello_server.services.ingest import IngestBuffer
+from smello_server.services.retention import Pruner, RetentionPolicy
+from smello_server.services.stream import EventStream
 
 
 class SPAStaticFiles(StaticFiles):
@@ -49,10 +57,38 @@ def _get_frontend_dir() -> Path | None:
     return None
 
 
-def create_app(db_url: str | None = None) -> FastAPI:
-    """Create and configure the FastAPI application."""
-
-    application = FastAPI(title="Smello")
+@asynccontextmanager
+async def _lifespan(app: FastAPI) -> AsyncGenerator[None]:
+    # Runs inside the Tortoise lifespan registered below, so the database is
+    # already open here and still open while the ingestion buffer drains on
+    # shutdown.
+    await init_db()
+    app.state.ingest.start()
+    app.state.pruner.start()
+    try:
+        yield
+    finally:
+        await app.state.pruner.stop()
+        await app.state.ingest.stop()
+
+
+def create_app(
+    db_url: str | None = None, retention: RetentionPolicy | None = None
+) -> FastAPI:
+    """Create and configure the FastAPI application.
+
+    *retention* defaults to the limits in the ``SMELLO_MAX_*`` environment
+    variables.
+    """
+
+    application = FastAPI(title="Smello", lifespan=_lifespan)
+    application.state.stream = EventStream()
+    application.state.ingest = IngestBuffer(stream=application.state.stream)
+    application.state.clients = ClientRegistry()
+    application.state.pruner = Pruner(
+        retention or RetentionPolicy.from_env(),
+        on_prune=application.state.ingest.mark_changed,
+    )
 
     application.include_router(api_router)
 
@@ -64,9 +100,9 @@ def create_app(db_url: str | None = None) -> FastAPI:
 
     register_tortoise(
         application,
-        db_url=db_url or _get_db_url(),
-        modules={"models": ["smello_server.models"]},
-        generate_schemas=True,
+        config=tortoise_config(db_url or _get_db_url()),
+        # Schemas are created by init_db() in _lifespan, after migrations.
+        generate_schemas=False,
         add_exception_handlers=True,
     )
 
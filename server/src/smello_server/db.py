@@ -0,0 +1,79 @@
+"""Database connections: SQLite pragmas, one writer and a pool of readers.
+
+All writes go through the ``default`` connection. Read queries use separate
+``reader_*`` connections to the same file, so with SQLite in WAL mode the
+dashboard's polls never wait behind capture inserts, and vice versa.
+"""
+
+import itertools
+from typing import Any
+
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+WRITER = "default"
+READERS = ("reader_0", "reader_1")
+
+PRAGMAS: dict[str, Any] = {
+    # Lets retention pruning shrink the file. Only takes effect on a new
+    # database, so it must come before journal_mode writes the header.
+    "auto_vacuum": "INCREMENTAL",
+    "journal_mode": "WAL",
+    # In WAL mode, NORMAL only fsyncs at checkpoints: a power loss can drop
+    # the last few commits but never corrupts the database.
+    "synchronous": "NORMAL",
+    "cache_size": -64000,  # negative means KiB: 64 MB of page cache
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+    # Wait for a competing lock (e.g. a checkpoint) instead of failing.
+    "busy_timeout": 5000,
+}
+
+_next_reader = itertools.count()
+
+
+def tortoise_config(db_url: str) -> dict[str, Any]:
+    """Build the Tortoise config for a ``sqlite://<path>`` URL.
+
+    An in-memory database is private to the connection that opened it, so
+    ``sqlite://:memory:`` gets the writer only and reads share it.
+    """
+    path = db_url.removeprefix("sqlite://")
+
+    def sqlite(**pragmas: Any) -> dict[str, Any]:
+        return {
+            "engine": "tortoise.backends.sqlite",
+            "credentials": {"file_path": path, **PRAGMAS, **pragmas},
+        }
+
+    conns = {WRITER: sqlite()}
+    if path != ":memory:":
+        conns |= {name: sqlite(query_only="ON") for name in READERS}
+    return {
+        "connections": conns,
+        "apps": {
+            "models": {
+                "models": ["smello_server.models"],
+                "default_connection": WRITER,
+            }
+        },
+    }
+
+
+def read_connection() -> BaseDBAsyncClient:
+    """Return the next reader connection, or the writer if there are none.
+
+    Falls back to the writer when Tortoise was initialized without readers
+    (an in-memory database, or a bare ``Tortoise.init(db_url=...)``).
+    """
+    name = READERS[next(_next_reader) % len(READERS)]
+    if name not in connections.db_config:
+        name = WRITER
+    return connections.get(name)
+
+
+async def table_exists(db: BaseDBAsyncClient, table: str) -> bool:
+    _, rows = await db.execute_query(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", [table]
+    )
+    return bool(rows)
@@ -0,0 +1,288 @@
+"""Schema setup and in-place migrations for existing databases.
+
+`init_db` runs on server startup. Tortoise's ``generate_schemas`` creates
+missing tables and indexes but never alters an existing table, so schema
+changes to ``captured_events`` are applied here first, as ordered steps
+tracked in SQLite's ``PRAGMA user_version``. A fresh database skips the
+steps: ``generate_schemas`` creates the current schema and the version is
+stamped to the latest.
+
+Steps must be idempotent, so a database left half-migrated by a crash (or
+already touched by a newer build) still upgrades cleanly.
+"""
+
+import logging
+import sqlite3
+from collections import Counter
+from collections.abc import Awaitable, Callable
+
+from tortoise import Tortoise, connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.exceptions import OperationalError
+from tortoise.transactions import in_transaction
+
+from smello_server.db import WRITER, table_exists
+from smello_server.models import SEARCH_TABLE, BodyBlob
+from smello_server.services.search import SEARCH_COLUMNS, index_bodies, search_values
+
+logger = logging.getLogger(__name__)
+
+Migration = Callable[[BaseDBAsyncClient], Awaitable[None]]
+
+# Rows read per round trip when a step walks a table from Python.
+BATCH_SIZE = 500
+
+
+async def _add_filter_columns(db: BaseDBAsyncClient) -> None:
+    """Copy filterable fields out of the ``data`` JSON into real columns."""
+    columns = {
+        "host": "VARCHAR(255)",
+        "method": "VARCHAR(16)",
+        "status_code": "INT",
+        "duration_ms": "INT",
+        "app": "VARCHAR(255) NOT NULL DEFAULT ''",
+        "session": "VARCHAR(255) NOT NULL DEFAULT ''",
+    }
+    existing = await _column_names(db, "captured_events")
+    for name, ddl in columns.items():
+        if name not in existing:
+            await db.execute_query(
+                f'ALTER TABLE "captured_events" ADD COLUMN "{name}" {ddl}'
+            )
+    await db.execute_query(
+        'UPDATE "captured_events" SET'
+        " host = json_extract(data, '$.host'),"
+        " method = json_extract(data, '$.method'),"
+        " status_code = json_extract(data, '$.status_code'),"
+        " duration_ms = json_extract(data, '$.duration_ms'),"
+        " app = COALESCE(json_extract(data, '$.app'), ''),"
+        " session = COALESCE(json_extract(data, '$.session'), '')"
+    )
+    # Superseded by the (event_type, timestamp) index.
+    await db.execute_query('DROP INDEX IF EXISTS "idx_captured_ev_event_t_2cbbc3"')
+
+
+async def _move_bodies(db: BaseDBAsyncClient) -> None:
+    """Move HTTP bodies out of the ``data`` JSON into ``event_bodies``."""
+    await db.execute_query(
+        'CREATE TABLE IF NOT EXISTS "event_bodies" ('
+        ' "event_id" CHAR(36) NOT NULL PRIMARY KEY,'
+        ' "request_body" TEXT,'
+        ' "response_body" TEXT)'
+    )
+    await db.execute_query(
+        'INSERT OR IGNORE INTO "event_bodies"'
+        " SELECT id, json_extract(data, '$.request_body'),"
+        " json_extract(data, '$.response_body')"
+        ' FROM "captured_events"'
+        " WHERE json_extract(data, '$.request_body') IS NOT NULL"
+        " OR json_extract(data, '$.response_body') IS NOT NULL"
+    )
+    # The search index read bodies from ``data``; `_create_search_index`
+    # rebuilds it once the bodies have moved.
+    await _drop_search_index(db)
+    await db.execute_query(
+        'UPDATE "captured_events"'
+        " SET data = json_remove(data, '$.request_body', '$.response_body')"
+        " WHERE event_type IN ('http', 'http_incoming')"
+    )
+
+
+async def _compress_bodies(db: BaseDBAsyncClient) -> None:
+    """Replace plain-text ``event_bodies`` with hashes into ``body_blobs``."""
+    if "request_body" not in await _column_names(db, "event_bodies"):
+        return
+    await db.execute_query(
+        'CREATE TABLE IF NOT EXISTS "body_blobs" ('
+        ' "hash" VARCHAR(64) NOT NULL PRIMARY KEY,'
+        ' "data" BLOB NOT NULL,'
+        ' "refcount" INT NOT NULL DEFAULT 0)'
+    )
+    await db.execute_query('DROP TABLE IF EXISTS "event_bodies_new"')
+    await db.execute_query(
+        'CREATE TABLE "event_bodies_new" ('
+        ' "event_id" CHAR(36) NOT NULL PRIMARY KEY,'
+        ' "request_hash" VARCHAR(64),'
+        ' "response_hash" VARCHAR(64))'
+    )
+    refcounts: Counter[str] = Counter()
+    last = 0
+    while True:
+        _, rows = await db.execute_query(
+            "SELECT rowid AS pos, event_id, request_body, response_body"
+            ' FROM "event_bodies" WHERE rowid > ? ORDER BY rowid LIMIT ?',
+            [last, BATCH_SIZE],
+        )
+        if not rows:
+            break
+        last = rows[-1]["pos"]
+        blobs = {}
+        refs = []
+        for r in rows:
+            hashes = []
+            for text in (r["request_body"], r["response_body"]):
+                digest = None if text is None else BodyBlob.digest(text)
+                if digest is not None and digest not in refcounts:
+                    blobs[digest] = BodyBlob.compress(text)
+                    refcounts[digest] = 0
+                hashes.append(digest)
+            # One reference per row, however many sides share the body,
+            # matching the refcount triggers.
+            for digest in {h for h in hashes if h is not None}:
+                refcounts[digest] += 1
+            refs.append([r["event_id"], *hashes])
+        if blobs:
+            await db.execute_many(
+                'INSERT OR IGNORE INTO "body_blobs" (hash, data) VALUES (?, ?)',
+                [list(item) for item in blobs.items()],
+            )
+        await db.execute_many('INSERT INTO "event_bodies_new" VALUES (?, ?, ?)', refs)
+    if refcounts:
+        await db.execute_many(
+            'UPDATE "body_blobs" SET refcount = ? WHERE hash = ?',
+            [[count, digest] for digest, count in refcounts.items()],
+        )
+    # The triggers name event_bodies and its old columns; init_db recreates
+    # them (and rebuilds the search index) once the table is swapped.
+    await db.execute_query('DROP TRIGGER IF EXISTS "event_bodies_delete"')
+    await _drop_search_index(db)
+    await db.execute_query('DROP TABLE "event_bodies"')
+    await db.execute_query('ALTER TABLE "event_bodies_new" RENAME TO "event_bodies"')
+
+
+MIGRATIONS: list[Migration] = [
+    _add_filter_columns,
+    _move_bodies,
+    _compress_bodies,
+]
+
+
+async def init_db() -> None:
+    """Migrate an existing database, then create any missing tables and indexes."""
+    db = connections.get(WRITER)
+    if await table_exists(db, "captured_events"):
+        version = await _user_version(db)
+        for step, migration in enumerate(MIGRATIONS[version:], start=version + 1):
+            async with in_transaction(WRITER) as tx:
+                await migration(tx)
+                await tx.execute_query(f"PRAGMA user_version = {step}")
+    await Tortoise.generate_schemas(safe=True)
+    await _create_body_triggers(db)
+    await _create_search_index(db)
+    await db.execute_query(f"PRAGMA user_version = {len(MIGRATIONS)}")
+
+
+async def _create_body_triggers(db: BaseDBAsyncClient) -> None:
+    """Delete an event's bodies with the event, whichever path deletes it,
+    and keep ``body_blobs.refcount`` in step with the ``event_bodies`` rows.
+    """
+    hashes = "hash IN ({row}.request_hash, {row}.response_hash)"
+    await db.execute_query(
+        'CREATE TRIGGER IF NOT EXISTS "event_bodies_delete"'
+        ' AFTER DELETE ON "captured_events"'
+        ' BEGIN DELETE FROM "event_bodies" WHERE event_id = old.id; END'
+    )
+    await db.execute_query(
+        'CREATE TRIGGER IF NOT EXISTS "body_blobs_acquire"'
+        ' AFTER INSERT ON "event_bodies" BEGIN'
+        f' UPDATE "body_blobs" SET refcount = refcount + 1 WHERE {hashes.format(row="new")};'
+        " END"
+    )
+    await db.execute_query(
+        'CREATE TRIGGER IF NOT EXISTS "body_blobs_release"'
+        ' AFTER DELETE ON "event_bodies" BEGIN'
+        f' UPDATE "body_blobs" SET refcount = refcount - 1 WHERE {hashes.format(row="old")};'
+        f' DELETE FROM "body_blobs" WHERE refcount <= 0 AND {hashes.format(row="old")};'
+        " END"
+    )
+
+
+# --- Full-text search index (columns in `smello_server.services.search`) ---
+
+
+async def _index_stored_bodies(db: BaseDBAsyncClient) -> None:
+    last = 0
+    while True:
+        _, rows = await db.execute_query(
+            "SELECT rowid AS pos, event_id,"
+            ' (SELECT data FROM "body_blobs" WHERE hash = request_hash) AS request,'
+            ' (SELECT data FROM "body_blobs" WHERE hash = response_hash) AS response'
+            ' FROM "event_bodies" WHERE rowid > ? ORDER BY rowid LIMIT ?',
+            [last, BATCH_SIZE],
+        )
+        if not rows:
+            return
+        last = rows[-1]["pos"]
+        await index_bodies(
+            db,
+            {
+                r["event_id"]: (
+                    None if r["request"] is None else BodyBlob.inflate(r["request"]),
+                    None if r["response"] is None else BodyBlob.inflate(r["response"]),
+                )
+                for r in rows
+            },
+        )
+
+
+async def _create_search_index(db: BaseDBAsyncClient) -> None:
+    """Create the FTS5 search table and its sync triggers, if missing.
+
+    A newly created index is filled from existing rows. On SQLite 3.43+ the
+    table is contentless (it stores only the index, not a second copy of
+    every body). SQLite builds without FTS5 are left without an index and
+    search falls back to ``LIKE``.
+    """
+    if await table_exists(db, SEARCH_TABLE):
+        return
+    columns = ", ".join(SEARCH_COLUMNS)
+    options = ""
+    if sqlite3.sqlite_version_info >= (3, 43, 0):
+        options = ", content='', contentless_delete=1"
+    async with in_transaction(WRITER) as tx:
+        try:
+            await tx.execute_query(
+                f'CREATE VIRTUAL TABLE "{SEARCH_TABLE}" USING fts5({columns}{options})'
+            )
+        except OperationalError as exc:
+            logger.warning("Full-text search unavailable, using LIKE: %s", exc)
+            return
+        insert = (
+            f'INSERT INTO "{SEARCH_TABLE}"(rowid, {columns})'
+            f" VALUES (new.rowid, {search_values('new')});"
+        )
+        delete = f'DELETE FROM "{SEARCH_TABLE}" WHERE rowid = old.rowid;'
+        await tx.execute_query(
+            f'CREATE TRIGGER "{SEARCH_TABLE}_insert" AFTER INSERT ON "captured_events"'
+            f" BEGIN {insert} END"
+        )
+        await tx.execute_query(
+            f'CREATE TRIGGER "{SEARCH_TABLE}_delete" AFTER DELETE ON "captured_events"'
+            f" BEGIN {delete} END"
+        )
+        await tx.execute_query(
+            f'CREATE TRIGGER "{SEARCH_TABLE}_update"'
+            ' AFTER UPDATE OF summary, data ON "captured_events"'
+            f" BEGIN {delete} {insert} END"
+        )
+        await tx.execute_query(
+            f'INSERT INTO "{SEARCH_TABLE}"(rowid, {columns})'
+            f' SELECT rowid, {search_values("captured_events")} FROM "captured_events"'
+        )
+        await _index_stored_bodies(tx)
+
+
+async def _drop_search_index(db: BaseDBAsyncClient) -> None:
+    for trigger in ("insert", "delete", "update"):
+        await db.execute_query(f'DROP TRIGGER IF EXISTS "{SEARCH_TABLE}_{trigger}"')
+    await db.execute_query(f'DROP TABLE IF EXISTS "{SEARCH_TABLE}"')
+
+
+async def _column_names(db: BaseDBAsyncClient, table: str) -> set[str]:
+    _, rows = await db.execute_query(f'PRAGMA table_info("{table}")')
+    return {r["name"] for r in rows}
+
+
+async def _user_version(db: BaseDBAsyncClient) -> int:
+    _, rows = await db.execute_query("PRAGMA user_version")
+    return rows[0][0]
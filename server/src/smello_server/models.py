@@ -1,7 +1,12 @@
 """Tortoise ORM models for captured events."""
 
+import hashlib
+import json
+import zlib
 from datetime import datetime, timezone
+from typing import Any
 
+import pydantic_core
 from tortoise import fields
 from tortoise.models import Model
 
@@ -10,23 +15,127 @@ def utcnow() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def _json_dumps(value: Any) -> str:
+    """Encode with pydantic-core, a few times faster than ``json``."""
+    try:
+        return pydantic_core.to_json(value).decode()
+    except pydantic_core.PydanticSerializationError:
+        # Lone surrogates, e.g. from an undecodable file name in a log record.
+        return json.dumps(value, separators=(",", ":"))
+
+
+def _json_loads(value: str | bytes) -> Any:
+    try:
+        return pydantic_core.from_json(value)
+    except ValueError:
+        # Escaped lone surrogates, as written by the fallback above.
+        return json.loads(value)
+
+
 class CapturedEvent(Model):
     """A single captured event (HTTP request, log record, or exception).
 
     Top-level columns (``id``, ``timestamp``, ``event_type``, ``summary``)
     are structural fields needed for ordering, discrimination, and list
-    display.  Everything else — including filterable fields like ``host``,
-    ``method``, ``app``, ``session`` — lives in the ``data`` JSON blob and
-    is queried via ``json_extract()`` when needed.  Keep it simple: add a
-    top-level column only when ``json_extract()`` is a proven bottleneck.
+    display.  The full event lives in the ``data`` JSON blob, except for
+    HTTP request and response bodies, which are kept in `EventBody` and
+    `BodyBlob` so list and meta queries never page them in.
+
+    The fields the dashboard filters on (``host``, ``method``,
+    ``status_code``, ``app``, ``session``) are copied out of ``data`` into
+    indexed columns, because ``json_extract()`` over every blob turned into
+    a full table scan on large databases; ``duration_ms`` is copied into a
+    plain column next to them.  ``data`` stays the source of truth; the
+    columns are written alongside it and backfilled for older rows by
+    `smello_server.migrations`.  Filter indexes are paired with
+    ``timestamp`` so a filtered, newest-first page is read straight off the
+    index.
     """
 
     id = fields.UUIDField(pk=True)
-    timestamp = fields.DatetimeField(default=utcnow)
-    event_type = fields.CharField(max_length=16, db_index=True)
+    timestamp = fields.DatetimeField(default=utcnow, db_index=True)
+    event_type = fields.CharField(max_length=16)
     summary = fields.CharField(max_length=500)
-    data: dict = fields.JSONField()
+    data: dict = fields.JSONField(encoder=_json_dumps, decoder=_json_loads)
+
+    # Denormalized from ``data``. HTTP-only columns are NULL for logs and
+    # exceptions.
+    host = fields.CharField(max_length=255, null=True)
+    method = fields.CharField(max_length=16, null=True)
+    status_code = fields.IntField(null=True)
+    duration_ms = fields.IntField(null=True)
+    app = fields.CharField(max_length=255, default="")
+    session = fields.CharField(max_length=255, default="")
+
+    # The (request, response) bodies built alongside this row, written with
+    # it by `save_events`. Not a column.
+    bodies: tuple[str | None, str | None] | None = None
 
     class Meta:
         table = "captured_events"
         ordering = ["-timestamp"]
+        indexes = (
+            ("event_type", "timestamp"),
+            ("host", "timestamp"),
+            ("method", "timestamp"),
+            ("status_code", "timestamp"),
+            ("app", "timestamp"),
+            ("session", "timestamp"),
+        )
+
+
+class EventBody(Model):
+    """The request and response bodies of an HTTP event, keyed by event id.
+
+    Bodies can be up to 1 MB each, so they are stored apart from the
+    ``captured_events`` row and only read when a single event is opened.
+    Each side is a `BodyBlob` hash, or NULL for no body. Rows are deleted
+    with their event by an SQL trigger (see `smello_server.migrations`).
+    """
+
+    event_id = fields.UUIDField(pk=True)
+    request_hash = fields.CharField(max_length=64, null=True)
+    response_hash = fields.CharField(max_length=64, null=True)
+
+    class Meta:
+        table = "event_bodies"
+
+
+class BodyBlob(Model):
+    """A zlib-compressed body, stored once however many events carry it.
+
+    Keyed by the SHA-256 of the body text, so the same OpenAPI document
+    or system prompt captured a thousand times takes up one row.
+    ``refcount`` is the number of `EventBody` rows pointing here; SQL
+    triggers keep it up to date and delete the blob when it drops to zero.
+    """
+
+    hash = fields.CharField(max_length=64, pk=True)
+    data = fields.BinaryField()
+    refcount = fields.IntField(default=0)
+
+    class Meta:
+        table = "body_blobs"
+
+    @staticmethod
+    def digest(text: str) -> str:
+        return hashlib.sha256(_encode(text)).hexdigest()
+
+    @staticmethod
+    def compress(text: str) -> bytes:
+        return zlib.compress(_encode(text))
+
+    @staticmethod
+    def inflate(data: bytes) -> str:
+        return zlib.decompress(data).decode("utf-8", "surrogatepass")
+
+
+def _encode(text: str) -> bytes:
+    # Bodies decoded from JSON may hold lone surrogates.
+    return text.encode("utf-8", "surrogatepass")
+
+
+# FTS5 index over the searchable text of each event, keyed by the
+# ``captured_events`` rowid. Created and kept in sync by SQL triggers (see
+# `smello_server.migrations`), so every write path updates it.
+SEARCH_TABLE = "captured_events_fts"
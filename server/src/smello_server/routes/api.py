@@ -5,26 +5,42 @@ Per the project convention, route handlers carry the `_api` suffix so they
 don't collide with service function names.
 """
 
-from datetime import datetime
-
-from fastapi import APIRouter, HTTPException, Query
-from pydantic import BaseModel
-
+import json
+import zlib
+from collections.abc import AsyncIterator, Callable, Coroutine
+from datetime import datetime, timezone
+from typing import Annotated, Any, Literal
+
+import pydantic_core
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, Field
+
+from smello_server.models import CapturedEvent
 from smello_server.services.capture import (
-    create_exception_event,
-    create_http_event,
-    create_http_incoming_event,
-    create_log_event,
+    build_exception_event,
+    build_http_event,
+    build_http_incoming_event,
+    build_log_event,
 )
+from smello_server.services.clients import ClientRegistry
 from smello_server.services.events import (
+    InvalidCursorError,
+    SortOrder,
     clear_events,
-    get_event,
+    get_event_json,
     get_meta,
     list_events,
+    summary_cursor,
 )
+from smello_server.services.ingest import IngestBuffer
+from smello_server.services.stream import EventFilter, EventStream, live_events
 from smello_server.types import (
+    ClientStats,
+    DeliveryCounts,
     EventDetail,
-    EventSummary,
+    EventList,
     ExceptionData,
     HttpIncomingMeta,
     HttpIncomingRequestData,
@@ -36,7 +52,89 @@ from smello_server.types import (
     MetaResponse,
 )
 
-router = APIRouter(prefix="/api")
+# Largest request body accepted once gzip is undone, so a small gzip bomb
+# cannot exhaust memory.
+MAX_DECOMPRESSED_BYTES = 256 * 1024 * 1024
+
+
+class _FastJSONRequest(Request):
+    async def body(self) -> bytes:
+        """The request body, gunzipped if sent with ``Content-Encoding: gzip``."""
+        if not hasattr(self, "_body"):
+            body = await super().body()
+            encoding = self.headers.get("content-encoding", "identity").lower()
+            if encoding == "gzip":
+                self._body = _gunzip(body)
+            elif encoding != "identity":
+                raise HTTPException(
+                    status_code=415, detail=f"Unsupported Content-Encoding: {encoding}"
+                )
+        return self._body
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            body = await self.body()
+            try:
+                self._json = pydantic_core.from_json(body)
+            except ValueError:
+                # pydantic-core rejects escaped lone surrogates, which json
+                # accepts; input json rejects too still ends up as a 422.
+                self._json = json.loads(body)
+        return self._json
+
+
+def _gunzip(body: bytes) -> bytes:
+    decompressor = zlib.decompressobj(zlib.MAX_WBITS | 16)
+    try:
+        data = decompressor.decompress(body, MAX_DECOMPRESSED_BYTES + 1)
+    except zlib.error as err:
+        raise HTTPException(status_code=400, detail="Invalid gzip body") from err
+    if len(data) > MAX_DECOMPRESSED_BYTES:
+        raise HTTPException(status_code=413, detail="Decompressed body too large")
+    if not decompressor.eof:
+        raise HTTPException(status_code=400, detail="Invalid gzip body")
+    return data
+
+
+class _FastJSONRoute(APIRoute):
+    """Parses JSON request bodies with pydantic-core's parser, about 3x
+    faster than the ``json`` module FastAPI uses. Bodies may be gzipped.
+
+    Responses need no such help: FastAPI serializes a ``response_model``
+    straight to JSON bytes with pydantic-core.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            return await handler(_FastJSONRequest(request.scope, request.receive))
+
+        return route_handler
+
+
+router = APIRouter(prefix="/api", route_class=_FastJSONRoute)
+
+
+def _get_ingest(request: Request) -> IngestBuffer:
+    return request.app.state.ingest
+
+
+Ingest = Annotated[IngestBuffer, Depends(_get_ingest)]
+
+
+def _get_stream(request: Request) -> EventStream:
+    return request.app.state.stream
+
+
+Stream = Annotated[EventStream, Depends(_get_stream)]
+
+
+def _get_clients(request: Request) -> ClientRegistry:
+    return request.app.state.clients
+
+
+Clients = Annotated[ClientRegistry, Depends(_get_clients)]
 
 
 # --- Capture payloads (per event type) ---
@@ -80,19 +178,69 @@ class HttpIncomingCapturePayload(BaseModel):
     session: str = ""
 
 
+# --- Batch capture payload ---
+#
+# Each batch item is one of the per-type payloads above plus an
+# ``event_type`` discriminator, so a single POST can carry a mix of HTTP,
+# incoming HTTP, log and exception captures.
+
+MAX_BATCH_SIZE = 1000
+
+
+class HttpBatchItem(HttpCapturePayload):
+    event_type: Literal["http"]
+
+
+class HttpIncomingBatchItem(HttpIncomingCapturePayload):
+    event_type: Literal["http_incoming"]
+
+
+class LogBatchItem(LogCapturePayload):
+    event_type: Literal["log"]
+
+
+class ExceptionBatchItem(ExceptionCapturePayload):
+    event_type: Literal["exception"]
+
+
+CaptureBatchItem = Annotated[
+    HttpBatchItem | HttpIncomingBatchItem | LogBatchItem | ExceptionBatchItem,
+    Field(discriminator="event_type"),
+]
+
+
+class CaptureBatchPayload(BaseModel):
+    events: list[CaptureBatchItem] = Field(max_length=MAX_BATCH_SIZE)
+
+
+class ClientStatsPayload(BaseModel):
+    client_id: str
+    app: str = ""
+    session: str = ""
+    smello_version: str = ""
+    events: dict[str, DeliveryCounts] = {}
+
+
 class CaptureResponse(BaseModel):
     status: str
 
 
+class CaptureBatchResponse(BaseModel):
+    status: str
+    count: int
+
+
 OK = CaptureResponse(status="ok")
 
 
 # --- Capture routes ---
+#
+# Capture routes only validate and build rows; the ingestion buffer writes
+# them in bulk shortly after the response goes out.
 
 
-@router.post("/capture/http", status_code=201, response_model=CaptureResponse)
-async def capture_http_api(payload: HttpCapturePayload) -> CaptureResponse:
-    await create_http_event(
+def _build_http(payload: HttpCapturePayload) -> CapturedEvent:
+    return build_http_event(
         event_id=payload.id,
         timestamp=payload.timestamp,
         duration_ms=payload.duration_ms,
@@ -102,14 +250,10 @@ async def capture_http_api(payload: HttpCapturePayload) -> CaptureResponse:
         app=payload.app,
         session=payload.session,
     )
-    return OK
 
 
-@router.post("/capture/http_incoming", status_code=201, response_model=CaptureResponse)
-async def capture_http_incoming_api(
-    payload: HttpIncomingCapturePayload,
-) -> CaptureResponse:
-    await create_http_incoming_event(
+def _build_http_incoming(payload: HttpIncomingCapturePayload) -> CapturedEvent:
+    return build_http_incoming_event(
         event_id=payload.id,
         timestamp=payload.timestamp,
         duration_ms=payload.duration_ms,
@@ -119,30 +263,97 @@ async def capture_http_incoming_api(
         app=payload.app,
         session=payload.session,
     )
-    return OK
 
 
-@router.post("/capture/log", status_code=201, response_model=CaptureResponse)
-async def capture_log_api(payload: LogCapturePayload) -> CaptureResponse:
-    await create_log_event(
+def _build_log(payload: LogCapturePayload) -> CapturedEvent:
+    return build_log_event(
         event_id=payload.id,
         timestamp=payload.timestamp,
         data=payload.data,
         app=payload.app,
         session=payload.session,
     )
-    return OK
 
 
-@router.post("/capture/exception", status_code=201, response_model=CaptureResponse)
-async def capture_exception_api(payload: ExceptionCapturePayload) -> CaptureResponse:
-    await create_exception_event(
+def _build_exception(payload: ExceptionCapturePayload) -> CapturedEvent:
+    return build_exception_event(
         event_id=payload.id,
         timestamp=payload.timestamp,
         data=payload.data,
         app=payload.app,
         session=payload.session,
     )
+
+
+@router.post("/capture/http", status_code=201, response_model=CaptureResponse)
+async def capture_http_api(
+    payload: HttpCapturePayload, ingest: Ingest
+) -> CaptureResponse:
+    await ingest.add([_build_http(payload)])
+    return OK
+
+
+@router.post("/capture/http_incoming", status_code=201, response_model=CaptureResponse)
+async def capture_http_incoming_api(
+    payload: HttpIncomingCapturePayload, ingest: Ingest
+) -> CaptureResponse:
+    await ingest.add([_build_http_incoming(payload)])
+    return OK
+
+
+@router.post("/capture/log", status_code=201, response_model=CaptureResponse)
+async def capture_log_api(
+    payload: LogCapturePayload, ingest: Ingest
+) -> CaptureResponse:
+    await ingest.add([_build_log(payload)])
+    return OK
+
+
+@router.post("/capture/exception", status_code=201, response_model=CaptureResponse)
+async def capture_exception_api(
+    payload: ExceptionCapturePayload, ingest: Ingest
+) -> CaptureResponse:
+    await ingest.add([_build_exception(payload)])
+    return OK
+
+
+@router.post("/capture/batch", status_code=201, response_model=CaptureBatchResponse)
+async def capture_batch_api(
+    payload: CaptureBatchPayload, ingest: Ingest
+) -> CaptureBatchResponse:
+    """Store a mixed batch of captures.
+
+    Used by the client transport to ship many events per request. Items are
+    validated up front, so a malformed item rejects the whole batch with 422
+    and nothing is written.
+    """
+    events = []
+    for item in payload.events:
+        match item:
+            case HttpBatchItem():
+                events.append(_build_http(item))
+            case HttpIncomingBatchItem():
+                events.append(_build_http_incoming(item))
+            case LogBatchItem():
+                events.append(_build_log(item))
+            case ExceptionBatchItem():
+                events.append(_build_exception(item))
+    await ingest.add(events)
+    return CaptureBatchResponse(status="ok", count=len(events))
+
+
+@router.post("/capture/stats", response_model=CaptureResponse)
+async def capture_stats_api(
+    payload: ClientStatsPayload, clients: Clients
+) -> CaptureResponse:
+    """Record a client's delivery counters.
+
+    Client transports post their sent, dropped, and failed counts per event
+    type every few seconds; see `GET /api/clients`.
+    """
+    clients.report(
+        ClientStats(**payload.model_dump(), reported_at=datetime.now(timezone.utc))
+    )
     return OK
 
 
@@ -153,7 +364,9 @@ async def capture_exception_api(payload: ExceptionCapturePayload) -> CaptureResp
     deprecated=True,
     summary="Deprecated: use /api/capture/http",
 )
-async def capture_legacy_api(payload: HttpCapturePayload) -> CaptureResponse:
+async def capture_legacy_api(
+    payload: HttpCapturePayload, ingest: Ingest
+) -> CaptureResponse:
     """Deprecated HTTP capture endpoint.
 
     Kept for backwards compatibility with old smello client wheels in the wild,
@@ -161,14 +374,35 @@ async def capture_legacy_api(payload: HttpCapturePayload) -> CaptureResponse:
     typed endpoints `/api/capture/http`, `/api/capture/log`,
     `/api/capture/exception`.
     """
-    return await capture_http_api(payload)
+    return await capture_http_api(payload, ingest)
 
 
 # --- Read routes ---
 
 
-@router.get("/events", response_model=list[EventSummary])
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Whether an ``If-None-Match`` header matches *etag* (weak comparison)."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(
+        tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(",")
+    )
+
+
+@router.get(
+    "/events",
+    response_model=EventList,
+    responses={
+        304: {"description": "No events changed since the `If-None-Match` ETag"}
+    },
+)
 async def list_events_api(
+    request: Request,
+    response: Response,
+    ingest: Ingest,
     event_type: str | None = Query(None),
     host: str | None = Query(None),
     method: str | None = Query(None),
@@ -177,8 +411,68 @@ async def list_events_api(
     app: str | None = Query(None),
     session: str | None = Query(None),
     limit: int = Query(50, le=200),
-) -> list[EventSummary]:
-    return await list_events(
+    sort: SortOrder = Query(
+        "newest",
+        description="`relevance` orders `search` results best match first.",
+    ),
+    before: str | None = Query(
+        None, description="Cursor: return events older than this position."
+    ),
+    after: str | None = Query(
+        None, description="Cursor: return events newer than this position."
+    ),
+) -> EventList | Response:
+    # Read the ETag before querying: if a capture lands mid-request, the next
+    # poll sees a newer tag and refetches rather than missing it.
+    etag = ingest.etag
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    await ingest.flush()
+    try:
+        return await list_events(
+            event_type=event_type,
+            host=host,
+            method=method,
+            status=status,
+            search=search,
+            app=app,
+            session=session,
+            limit=limit,
+            sort=sort,
+            before=before,
+            after=after,
+        )
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=422, detail=str(exc)) from exc
+
+
+@router.get(
+    "/events/stream",
+    response_class=StreamingResponse,
+    responses={
+        200: {
+            "description": "Server-Sent Events: one `EventSummary` JSON per event,"
+            " oldest first. Each event's `id` is a list cursor.",
+            "content": {"text/event-stream": {}},
+        }
+    },
+)
+async def stream_events_api(
+    stream: Stream,
+    event_type: str | None = Query(None),
+    host: str | None = Query(None),
+    method: str | None = Query(None),
+    status: int | None = Query(None),
+    search: str | None = Query(None),
+    app: str | None = Query(None),
+    session: str | None = Query(None),
+    last_event_id: str | None = Header(
+        None, description="Replay events stored after this cursor first."
+    ),
+) -> StreamingResponse:
+    filters = EventFilter(
         event_type=event_type,
         host=host,
         method=method,
@@ -186,23 +480,51 @@ async def list_events_api(
         search=search,
         app=app,
         session=session,
-        limit=limit,
+    )
+
+    async def body() -> AsyncIterator[str]:
+        async for batch in live_events(stream, filters, last_event_id=last_event_id):
+            if not batch:
+                yield ": keep-alive\n\n"
+            for summary in batch:
+                yield f"id: {summary_cursor(summary)}\ndata: {summary.model_dump_json()}\n\n"
+
+    return StreamingResponse(
+        body(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
     )
 
 
 @router.get("/events/{event_id}", response_model=EventDetail)
-async def get_event_api(event_id: str) -> EventDetail:
-    event = await get_event(event_id)
-    if event is None:
+async def get_event_api(event_id: str, ingest: Ingest) -> Response:
+    await ingest.flush()
+    # Pre-serialized: bypasses response_model validation, which only
+    # documents the shape here.
+    body = await get_event_json(event_id)
+    if body is None:
         raise HTTPException(status_code=404, detail="Event not found")
-    return event
+    return Response(body, media_type="application/json")
 
 
 @router.get("/meta", response_model=MetaResponse)
-async def get_meta_api() -> MetaResponse:
+async def get_meta_api(ingest: Ingest) -> MetaResponse:
+    await ingest.flush()
     return await get_meta()
 
 
+@router.get("/clients", response_model=list[ClientStats])
+async def list_clients_api(
+    clients: Clients,
+    app: str | None = Query(None),
+    session: str | None = Query(None),
+) -> list[ClientStats]:
+    """Delivery counters from each client process, most recent report first."""
+    return clients.list(app=app, session=session)
+
+
 @router.delete("/events", status_code=204)
-async def clear_events_api() -> None:
+async def clear_events_api(ingest: Ingest) -> None:
+    await ingest.flush()
     await clear_events()
+    ingest.mark_changed()
@@ -1,21 +1,34 @@
 """Persistence for captured events.
 
-Each ``create_*`` function takes typed input, builds the typed output model
-(`HttpEventData` / `LogEventData` / `ExceptionEventData`) and a one-line
-``summary``, then writes a `CapturedEvent` row with the output model dumped to
-JSON in the ``data`` column.
+Each ``build_*`` function takes typed input, builds the ``data`` dict of
+the typed output model (`HttpEventData` / `HttpIncomingEventData` /
+`LogEventData` / `ExceptionEventData`) and a one-line ``summary``, and
+returns an unsaved `CapturedEvent` row with the filterable fields copied into
+their own columns. The input is already validated, so ``data`` is written out
+field by field instead of being validated again into the output model and
+dumped. HTTP bodies are kept out of ``data``, on the row's
+``bodies`` attribute, and `save_events` stores them compressed and
+deduplicated in ``body_blobs``. `save_events` writes many rows in one
+transaction; the matching ``create_*`` functions build and save a single row
+in one go.
 """
 
+import functools
 import uuid
+from collections.abc import Awaitable, Callable
 from datetime import datetime
+from typing import ParamSpec
 from urllib.parse import urlparse
 
-from smello_server.models import CapturedEvent, utcnow
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+
+from smello_server.db import WRITER
+from smello_server.models import BodyBlob, CapturedEvent, utcnow
+from smello_server.services.search import index_bodies
 from smello_server.types import (
     ExceptionData,
     ExceptionEventData,
-    HttpEventData,
-    HttpIncomingEventData,
     HttpIncomingMeta,
     HttpIncomingRequestData,
     HttpIncomingResponseData,
@@ -26,8 +39,17 @@ from smello_server.types import (
     LogEventData,
 )
 
+# Fields of the output model copied from the (open) input model; anything
+# else a client sends is dropped.
+_LOG_FIELDS = LogEventData.model_fields.keys() - {"event_type", "app", "session"}
+_EXCEPTION_FIELDS = ExceptionEventData.model_fields.keys() - {
+    "event_type",
+    "app",
+    "session",
+}
+
 
-async def create_http_event(
+def build_http_event(
     *,
     event_id: str | None,
     timestamp: datetime | None = None,
@@ -38,42 +60,47 @@ async def create_http_event(
     app: str = "",
     session: str = "",
 ) -> CapturedEvent:
-    host = urlparse(request.url).hostname or "unknown"
-    summary = _build_http_summary(request.method, request.url, response.status_code)
-    event_data = HttpEventData(
-        app=app,
-        session=session,
-        duration_ms=duration_ms,
-        method=request.method.upper(),
-        url=request.url,
-        host=host,
-        request_headers=request.headers,
-        request_body=request.body,
-        request_body_size=request.body_size,
-        status_code=response.status_code,
-        response_headers=response.headers,
-        response_body=response.body,
-        response_body_size=response.body_size,
-        library=meta.library,
-        python_version=meta.python_version,
-        smello_version=meta.smello_version,
-    )
-    return await CapturedEvent.create(
+    url = urlparse(request.url)
+    host = url.hostname or "unknown"
+    summary = _build_http_summary(request.method, url.path, response.status_code)
+    data = {
+        "event_type": "http",
+        "app": app,
+        "session": session,
+        "duration_ms": duration_ms,
+        "method": request.method.upper(),
+        "url": request.url,
+        "host": host,
+        "request_headers": request.headers,
+        "request_body_size": request.body_size,
+        "status_code": response.status_code,
+        "response_headers": response.headers,
+        "response_body_size": response.body_size,
+        "library": meta.library,
+        "python_version": meta.python_version,
+        "smello_version": meta.smello_version,
+    }
+    event = CapturedEvent(
         id=_resolve_id(event_id),
         timestamp=timestamp or utcnow(),
         event_type="http",
         summary=summary,
-        data=event_data.model_dump(mode="json"),
+        data=data,
+        host=host,
+        method=data["method"],
+        status_code=response.status_code,
+        duration_ms=duration_ms,
+        app=app,
+        session=session,
     )
+    return _attach_body(event, request.body, response.body)
 
 
-def _build_http_summary(method: str, url: str, status_code: int) -> str:
-    parsed = urlparse(url)
-    path = parsed.path or "/"
-    return f"{method.upper()} {path} → {status_code}"
+def _build_http_summary(method: str, path: str, status_code: int) -> str:
+    return f"{method.upper()} {path or '/'} → {status_code}"
 
 
-async def create_http_incoming_event(
+def build_http_incoming_event(
     *,
     event_id: str | None,
     timestamp: datetime | None = None,
@@ -91,43 +118,49 @@ async def create_http_incoming_event(
     summary = _build_http_incoming_summary(
         request.method, request.path, response.status_code
     )
-    event_data = HttpIncomingEventData(
-        app=app,
-        session=session,
-        duration_ms=duration_ms,
-        method=request.method.upper(),
-        path=request.path,
-        url=request.url,
-        host=host,
-        route=meta.route,
-        client_ip=meta.client_ip,
-        request_headers=request.headers,
-        request_body=request.body,
-        request_body_size=request.body_size,
-        status_code=response.status_code,
-        response_headers=response.headers,
-        response_body=response.body,
-        response_body_size=response.body_size,
-        exc_type=meta.exc_type,
-        exc_value=meta.exc_value,
-        framework=meta.framework,
-        python_version=meta.python_version,
-        smello_version=meta.smello_version,
-    )
-    return await CapturedEvent.create(
+    data = {
+        "event_type": "http_incoming",
+        "app": app,
+        "session": session,
+        "duration_ms": duration_ms,
+        "method": request.method.upper(),
+        "path": request.path,
+        "url": request.url,
+        "host": host,
+        "route": meta.route,
+        "client_ip": meta.client_ip,
+        "request_headers": request.headers,
+        "request_body_size": request.body_size,
+        "status_code": response.status_code,
+        "response_headers": response.headers,
+        "response_body_size": response.body_size,
+        "exc_type": meta.exc_type,
+        "exc_value": meta.exc_value,
+        "framework": meta.framework,
+        "python_version": meta.python_version,
+        "smello_version": meta.smello_version,
+    }
+    event = CapturedEvent(
         id=_resolve_id(event_id),
         timestamp=timestamp or utcnow(),
         event_type="http_incoming",
         summary=summary,
-        data=event_data.model_dump(mode="json"),
+        data=data,
+        host=host,
+        method=data["method"],
+        status_code=response.status_code,
+        duration_ms=duration_ms,
+        app=app,
+        session=session,
     )
+    return _attach_body(event, request.body, response.body)
 
 
 def _build_http_incoming_summary(method: str, path: str, status_code: int) -> str:
     return f"← {method.upper()} {path} → {status_code}"
 
 
-async def create_log_event(
+def build_log_event(
     *,
     event_id: str | None,
     timestamp: datetime | None = None,
@@ -136,24 +169,20 @@ async def create_log_event(
     session: str = "",
 ) -> CapturedEvent:
     summary = _build_log_summary(data.level, data.logger_name, data.message)
-    event_data = LogEventData(
-        app=app,
-        session=session,
-        level=data.level,
-        logger_name=data.logger_name,
-        message=data.message,
-        pathname=data.pathname,
-        lineno=data.lineno,
-        func_name=data.func_name,
-        exc_text=data.exc_text,
-        extra=data.extra,
-    )
-    return await CapturedEvent.create(
+    event_data = {
+        "event_type": "log",
+        "app": app,
+        "session": session,
+        **data.model_dump(mode="json", include=_LOG_FIELDS),
+    }
+    return CapturedEvent(
         id=_resolve_id(event_id),
         timestamp=timestamp or utcnow(),
         event_type="log",
         summary=summary,
-        data=event_data.model_dump(mode="json"),
+        data=event_data,
+        app=app,
+        session=session,
     )
 
 
@@ -163,7 +192,7 @@ def _build_log_summary(level: str, logger_name: str, message: str) -> str:
     return f"{level} {logger_name}: {message}"
 
 
-async def create_exception_event(
+def build_exception_event(
     *,
     event_id: str | None,
     timestamp: datetime | None = None,
@@ -172,21 +201,20 @@ async def create_exception_event(
     session: str = "",
 ) -> CapturedEvent:
     summary = _build_exception_summary(data.exc_type, data.exc_value)
-    event_data = ExceptionEventData(
-        app=app,
-        session=session,
-        exc_type=data.exc_type,
-        exc_value=data.exc_value,
-        exc_module=data.exc_module,
-        traceback_text=data.traceback_text,
-        frames=data.frames,
-    )
-    return await CapturedEvent.create(
+    event_data = {
+        "event_type": "exception",
+        "app": app,
+        "session": session,
+        **data.model_dump(mode="json", include=_EXCEPTION_FIELDS),
+    }
+    return CapturedEvent(
         id=_resolve_id(event_id),
         timestamp=timestamp or utcnow(),
         event_type="exception",
         summary=summary,
-        data=event_data.model_dump(mode="json"),
+        data=event_data,
+        app=app,
+        session=session,
     )
 
 
@@ -196,6 +224,116 @@ def _build_exception_summary(exc_type: str, exc_value: str) -> str:
     return f"{exc_type}: {exc_value}"
 
 
+async def save_events(events: list[CapturedEvent]) -> list[CapturedEvent]:
+    """Insert *events* with a single bulk INSERT inside one transaction.
+
+    Rows whose id already exists are skipped, so a client that re-sends a
+    capture after a dropped connection doesn't produce a duplicate.
+    Returns the rows actually inserted.
+    """
+    if not events:
+        return []
+    async with in_transaction(WRITER) as conn:
+        new = await _new_events(conn, events)
+        if new:
+            await CapturedEvent.bulk_create(new, using_db=conn)
+            await _save_bodies(conn, new)
+    return new
+
+
+async def _new_events(
+    db: BaseDBAsyncClient, events: list[CapturedEvent]
+) -> list[CapturedEvent]:
+    """Drop the *events* whose id is already stored, or repeated in *events*."""
+    unique = {str(e.id): e for e in reversed(events)}
+    placeholders = ", ".join("?" * len(unique))
+    _, stored = await db.execute_query(
+        f"SELECT id FROM captured_events WHERE id IN ({placeholders})", list(unique)
+    )
+    seen = {r["id"] for r in stored}
+    new = []
+    for event in events:
+        event_id = str(event.id)
+        if event_id not in seen:
+            seen.add(event_id)
+            new.append(event)
+    return new
+
+
+async def _save_bodies(db: BaseDBAsyncClient, events: list[CapturedEvent]) -> None:
+    """Store the bodies of *events*, compressing only ones not stored yet.
+
+    Blobs are inserted unreferenced; the ``event_bodies`` insert trigger
+    counts the references, and blobs left at zero (their event was a
+    duplicate) are dropped again.
+    """
+    bodies = {str(e.id): e.bodies for e in events if e.bodies is not None}
+    if not bodies:
+        return
+    texts = {
+        BodyBlob.digest(text): text
+        for pair in bodies.values()
+        for text in pair
+        if text is not None
+    }
+    placeholders = ", ".join("?" * len(texts))
+    _, stored = await db.execute_query(
+        f"SELECT hash FROM body_blobs WHERE hash IN ({placeholders})", list(texts)
+    )
+    new = texts.keys() - {r["hash"] for r in stored}
+    if new:
+        await db.execute_many(
+            "INSERT INTO body_blobs (hash, data, refcount) VALUES (?, ?, 0)",
+            [[h, BodyBlob.compress(texts[h])] for h in new],
+        )
+    await db.execute_many(
+        "INSERT OR IGNORE INTO event_bodies (event_id, request_hash, response_hash)"
+        " VALUES (?, ?, ?)",
+        [
+            [event_id, *(BodyBlob.digest(t) if t is not None else None for t in pair)]
+            for event_id, pair in bodies.items()
+        ],
+    )
+    if new:
+        await db.execute_query(
+            f"DELETE FROM body_blobs WHERE refcount = 0 AND hash IN ({placeholders})",
+            list(texts),
+        )
+    await index_bodies(db, bodies)
+
+
+P = ParamSpec("P")
+
+
+def _build_and_save(
+    build: Callable[P, CapturedEvent],
+) -> Callable[P, Awaitable[CapturedEvent]]:
+    @functools.wraps(build)
+    async def create(*args: P.args, **kwargs: P.kwargs) -> CapturedEvent:
+        event = build(*args, **kwargs)
+        async with in_transaction(WRITER) as conn:
+            await event.save(force_create=True, using_db=conn)
+            await _save_bodies(conn, [event])
+        return event
+
+    return create
+
+
+create_http_event = _build_and_save(build_http_event)
+create_http_incoming_event = _build_and_save(build_http_incoming_event)
+create_log_event = _build_and_save(build_log_event)
+create_exception_event = _build_and_save(build_exception_event)
+
+
 def _resolve_id(event_id: str | None) -> str:
     """Shared helper: use the caller-supplied id, or generate a new UUID."""
     return event_id or str(uuid.uuid4())
+
+
+def _attach_body(
+    event: CapturedEvent, request_body: str | None, response_body: str | None
+) -> CapturedEvent:
+    """Shared helper: hand the HTTP bodies, if any, to *event* for `save_events`."""
+    if request_body is not None or response_body is not None:
+        event.bodies = (request_body, response_body)
+    return event
@@ -0,0 +1,42 @@
+"""Delivery counters reported by client processes.
+
+Each client transport posts how many captures it sent, dropped because its
+queue was full, and failed to deliver, per event type. `ClientRegistry`
+keeps the latest report from each client process in memory, so the counts
+are gone when the server restarts.
+"""
+
+from smello_server.types import ClientStats
+
+MAX_CLIENTS = 500
+
+
+class ClientRegistry:
+    """The latest `ClientStats` per ``client_id``, for up to ``max_clients``.
+
+    Reports are cumulative, so each one replaces the previous report from
+    the same client. Past ``max_clients``, the client that reported longest
+    ago is forgotten.
+    """
+
+    def __init__(self, max_clients: int = MAX_CLIENTS) -> None:
+        self.max_clients = max_clients
+        self._clients: dict[str, ClientStats] = {}
+
+    def report(self, stats: ClientStats) -> None:
+        # Re-inserting moves the client to the end, keeping report order.
+        self._clients.pop(stats.client_id, None)
+        self._clients[stats.client_id] = stats
+        while len(self._clients) > self.max_clients:
+            del self._clients[next(iter(self._clients))]
+
+    def list(
+        self, app: str | None = None, session: str | None = None
+    ) -> list[ClientStats]:
+        """Reports matching *app* and *session*, most recent first."""
+        return [
+            stats
+            for stats in reversed(self._clients.values())
+            if (app is None or stats.app == app)
+            and (session is None or stats.session == session)
+        ]
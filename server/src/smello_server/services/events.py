@@ -1,16 +1,24 @@
 """Read-side queries for captured events: list, get, meta, clear."""
 
+import base64
+import json
+import re
 import uuid
 from datetime import datetime
-from typing import Any, cast
+from typing import Any, Literal, cast
 
+import pydantic_core
 from pydantic import TypeAdapter
 from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
 
-from smello_server.models import CapturedEvent
+from smello_server.db import WRITER, read_connection, table_exists
+from smello_server.models import SEARCH_TABLE, BodyBlob, CapturedEvent
+from smello_server.services.retention import delete_oldest, incremental_vacuum
 from smello_server.types import (
     EventData,
     EventDetail,
+    EventList,
     EventSummary,
     EventType,
     MetaResponse,
@@ -35,6 +43,73 @@ def _coerce_timestamp(value: datetime | str) -> datetime:
     return datetime.fromisoformat(value) if isinstance(value, str) else value
 
 
+# A quoted phrase, or a run of non-space characters.
+_SEARCH_TERM = re.compile(r'"([^"]*)"|(\S+)')
+
+# bm25 column weights for summary, url, body, message: a hit in the
+# one-line summary or the URL counts for more than one deep in a body.
+_SEARCH_WEIGHTS = "10.0, 5.0, 1.0, 2.0"
+
+SortOrder = Literal["newest", "relevance"]
+
+# Bodies are stored compressed, so the substring fallback can't see them.
+_LIKE_SEARCH = "(summary LIKE ? COLLATE NOCASE OR data LIKE ? COLLATE NOCASE)"
+
+# Event types whose bodies live in ``body_blobs``.
+_BODY_EVENT_TYPES = ("http", "http_incoming")
+
+
+def search_query(search: str) -> str:
+    """Translate search-box input into an FTS5 ``MATCH`` expression.
+
+    ``"quoted text"`` matches as an exact phrase. Every other word is a
+    prefix match (``charg`` finds ``charges``), with or without a trailing
+    ``*``. All terms must match. Returns ``""`` when nothing searchable is
+    left, e.g. for input made only of punctuation.
+    """
+    terms = []
+    for phrase, word in _SEARCH_TERM.findall(search):
+        text = phrase if phrase else word.rstrip("*").replace('"', "")
+        if not any(c.isalnum() for c in text):
+            continue
+        terms.append(f'"{text}"' if phrase else f'"{text}"*')
+    return " ".join(terms)
+
+
+class InvalidCursorError(ValueError):
+    """A ``before``/``after`` cursor that `list_events` can't decode."""
+
+
+def encode_cursor(timestamp: str, event_id: str) -> str:
+    """Encode a row's ``(timestamp, id)`` keyset position as an opaque cursor.
+
+    *timestamp* is the raw stored column value, so the cursor compares
+    exactly like the column does.
+    """
+    raw = json.dumps([timestamp, event_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, str]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        timestamp, event_id = json.loads(raw)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}") from exc
+    if not isinstance(timestamp, str) or not isinstance(event_id, str):
+        raise InvalidCursorError(f"Invalid cursor: {cursor!r}")
+    return timestamp, event_id
+
+
+def summary_cursor(summary: EventSummary) -> str:
+    """Return the cursor for *summary*'s position in the event list.
+
+    The stored ``timestamp`` is the UTC datetime's ``isoformat(" ")`` (the
+    sqlite3 adapter Tortoise writes through), so it is rebuilt here exactly.
+    """
+    return encode_cursor(summary.timestamp.isoformat(" "), summary.id)
+
+
 async def list_events(
     *,
     event_type: str | None = None,
@@ -45,130 +120,266 @@ async def list_events(
     app: str | None = None,
     session: str | None = None,
     limit: int = 50,
-) -> list[EventSummary]:
-    """Return event summaries matching the filters, newest first."""
-    if search or host or method or status or app is not None or session is not None:
-        where_parts: list[str] = []
-        params: list[str | int] = []
-
-        if event_type:
-            where_parts.append("event_type = ?")
-            params.append(event_type)
-        if host:
-            where_parts.append("json_extract(data, '$.host') = ?")
-            params.append(host)
-        if method:
-            where_parts.append("json_extract(data, '$.method') = ?")
-            params.append(method.upper())
-        if status:
-            where_parts.append("json_extract(data, '$.status_code') = ?")
-            params.append(status)
-
-        if search:
-            like_pattern = f"%{search}%"
-            where_parts.append(
-                "(summary LIKE ? COLLATE NOCASE OR data LIKE ? COLLATE NOCASE)"
-            )
-            params.extend([like_pattern, like_pattern])
-
-        if app is not None:
-            where_parts.append("COALESCE(json_extract(data, '$.app'), '') = ?")
-            params.append(app)
-        if session is not None:
-            where_parts.append("COALESCE(json_extract(data, '$.session'), '') = ?")
-            params.append(session)
-
-        where_clause = " AND ".join(where_parts) if where_parts else "1=1"
-        db = connections.get("default")
-        _, rows = await db.execute_query(
-            f"SELECT id, timestamp, event_type, summary,"
-            " COALESCE(json_extract(data, '$.app'), '') as app,"
-            " COALESCE(json_extract(data, '$.session'), '') as session"
-            f" FROM captured_events WHERE {where_clause}"
-            " ORDER BY timestamp DESC LIMIT ?",
-            [*params, limit],
-        )
-        return [
-            EventSummary(
-                id=str(r["id"]),
-                timestamp=_coerce_timestamp(r["timestamp"]),
-                event_type=cast(EventType, r["event_type"]),
-                summary=r["summary"],
-                app=r["app"],
-                session=r["session"],
-            )
-            for r in rows
-        ]
+    sort: SortOrder = "newest",
+    before: str | None = None,
+    after: str | None = None,
+) -> EventList:
+    """Return a page of event summaries matching the filters, newest first.
+
+    Pages are keyed on ``(timestamp, id)``: ``before`` returns the events
+    just older than a cursor, ``after`` the ones just newer, so every page
+    is an index range scan no matter how deep it is.
+
+    ``search`` is served from the full-text index. With
+    ``sort="relevance"``, search results come best match first instead;
+    relevance-ordered results are a single page without cursors.
+    """
+    if sort == "relevance" and search and (before or after):
+        raise InvalidCursorError("Cursors can't be combined with sort=relevance")
+    db = read_connection()
+    from_clause = "captured_events"
+    from_params: list[str] = []
+    order_by = "timestamp DESC, id DESC"
+    where_parts: list[str] = []
+    params: list[str | int] = []
 
-    qs = CapturedEvent.all()
     if event_type:
-        qs = qs.filter(event_type=event_type)
-    events = await qs.limit(limit)
-    return [
+        where_parts.append("event_type = ?")
+        params.append(event_type)
+    if host:
+        where_parts.append("host = ?")
+        params.append(host)
+    if method:
+        where_parts.append("method = ?")
+        params.append(method.upper())
+    if status:
+        where_parts.append("status_code = ?")
+        params.append(status)
+
+    if search:
+        match = search_query(search)
+        if match and await table_exists(db, SEARCH_TABLE):
+            from_clause = (
+                "captured_events JOIN ("
+                f" SELECT rowid AS hit, bm25({SEARCH_TABLE}, {_SEARCH_WEIGHTS}) AS score"
+                f" FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH ?"
+                ") ON hit = captured_events.rowid"
+            )
+            from_params.append(match)
+            if sort == "relevance":
+                order_by = "score, timestamp DESC, id DESC"
+        else:
+            # No FTS5 in this SQLite build, or nothing tokenizable in the
+            # input: fall back to a substring scan.
+            where_parts.append(_LIKE_SEARCH)
+            params.extend([f"%{search}%"] * 2)
+
+    if app is not None:
+        where_parts.append("app = ?")
+        params.append(app)
+    if session is not None:
+        where_parts.append("session = ?")
+        params.append(session)
+
+    if before:
+        where_parts.append("(timestamp, id) < (?, ?)")
+        params.extend(decode_cursor(before))
+    if after:
+        where_parts.append("(timestamp, id) > (?, ?)")
+        params.extend(decode_cursor(after))
+        # Walk forward from the cursor, then flip the page to newest first.
+        order_by = "timestamp, id"
+
+    where_clause = " AND ".join(where_parts) if where_parts else "1=1"
+    # One extra row tells whether there is another page past this one.
+    _, rows = await db.execute_query(
+        "SELECT id, timestamp, event_type, summary, app, session"
+        f" FROM {from_clause} WHERE {where_clause}"
+        f" ORDER BY {order_by} LIMIT ?",
+        [*from_params, *params, limit + 1],
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if after:
+        rows.reverse()
+
+    def cursor(r: Any) -> str:
+        return encode_cursor(r["timestamp"], r["id"])
+
+    events = [
         EventSummary(
-            id=str(e.id),
-            timestamp=e.timestamp,
-            event_type=cast(EventType, e.event_type),
-            summary=e.summary,
-            app=e.data.get("app", ""),
-            session=e.data.get("session", ""),
+            id=str(r["id"]),
+            timestamp=_coerce_timestamp(r["timestamp"]),
+            event_type=cast(EventType, r["event_type"]),
+            summary=r["summary"],
+            app=r["app"],
+            session=r["session"],
         )
-        for e in events
+        for r in rows
     ]
+    if sort == "relevance" and search:
+        return EventList(events=events)
+    if after:
+        # Everything up to the cursor is older than this page.
+        next_cursor = cursor(rows[-1]) if rows else after
+    else:
+        next_cursor = cursor(rows[-1]) if has_more else None
+    prev_cursor = cursor(rows[0]) if rows else (after or before)
+    return EventList(events=events, next_cursor=next_cursor, prev_cursor=prev_cursor)
+
+
+def summarize_event(event: CapturedEvent) -> EventSummary:
+    return EventSummary(
+        id=str(event.id),
+        timestamp=event.timestamp,
+        event_type=cast(EventType, event.event_type),
+        summary=event.summary,
+        app=event.app,
+        session=event.session,
+    )
+
+
+async def search_matches(search: str, event_ids: list[str]) -> set[str]:
+    """Return the ids among *event_ids* whose events match *search*.
+
+    Same matching as the ``search`` filter of `list_events`, for a handful
+    of known rows (e.g. ones just written) rather than the whole table.
+    """
+    if not event_ids:
+        return set()
+    db = read_connection()
+    placeholders = ", ".join("?" * len(event_ids))
+    match = search_query(search)
+    if match and await table_exists(db, SEARCH_TABLE):
+        # Driven from the id lookup: one rowid probe into the index per row.
+        sql = (
+            f"SELECT id FROM captured_events JOIN {SEARCH_TABLE}"
+            f" ON {SEARCH_TABLE}.rowid = captured_events.rowid"
+            f" WHERE id IN ({placeholders}) AND {SEARCH_TABLE} MATCH ?"
+        )
+        params = [*event_ids, match]
+    else:
+        sql = f"SELECT id FROM captured_events WHERE id IN ({placeholders}) AND {_LIKE_SEARCH}"
+        params = [*event_ids, f"%{search}%", f"%{search}%"]
+    _, rows = await db.execute_query(sql, params)
+    return {str(r["id"]) for r in rows}
 
 
 async def get_event(event_id: str) -> EventDetail | None:
-    """Return the typed event detail, or None if the id is invalid/missing."""
+    """Return the typed event detail, or None if the id is invalid/missing.
+
+    Validates the stored ``data`` in full. The API serves `get_event_json`
+    instead, which skips that for rows this server wrote itself.
+    """
     try:
         uuid.UUID(event_id)
     except ValueError:
         return None
-    event = await CapturedEvent.get_or_none(id=event_id)
+    db = read_connection()
+    event = await CapturedEvent.get_or_none(id=event_id, using_db=db)
     if event is None:
         return None
+    data = event.data
+    bodies = await _load_bodies(db, str(event.id))
+    if bodies is not None:
+        request, response = bodies
+        data = {
+            **data,
+            "request_body": None if request is None else BodyBlob.inflate(request),
+            "response_body": None if response is None else BodyBlob.inflate(response),
+        }
     return EventDetail(
         id=str(event.id),
         timestamp=event.timestamp,
         event_type=cast(EventType, event.event_type),
         summary=event.summary,
-        app=event.data.get("app", ""),
-        session=event.data.get("session", ""),
-        data=hydrate_event_data(event.event_type, event.data),
+        app=event.app,
+        session=event.session,
+        data=hydrate_event_data(event.event_type, data),
     )
 
 
-async def get_meta() -> MetaResponse:
-    db = connections.get("default")
+async def get_event_json(event_id: str) -> str | None:
+    """Return the `EventDetail` JSON for an event, or None if invalid/missing.
 
-    _, host_rows = await db.execute_query(
-        "SELECT DISTINCT json_extract(data, '$.host') as host"
-        " FROM captured_events"
-        " WHERE event_type IN ('http', 'http_incoming') AND host IS NOT NULL"
+    Same document as ``get_event(event_id).model_dump_json()``, without the
+    two Pydantic passes over ``data``: the server wrote it from a validated
+    model, so the stored JSON text is spliced into the response as is, and
+    the inflated bodies are added with one ``pydantic_core.to_json`` each.
+    Rows written before ``data`` carried its ``event_type`` go through
+    `get_event`.
+    """
+    try:
+        event_id = str(uuid.UUID(event_id))
+    except ValueError:
+        return None
+    db = read_connection()
+    _, rows = await db.execute_query(
+        "SELECT id, timestamp, event_type, summary, app, session, data,"
+        " json_type(data, '$.event_type') IS NOT NULL AS typed"
+        " FROM captured_events WHERE id = ?",
+        [event_id],
     )
-    hosts = sorted({r["host"] for r in host_rows if r["host"]})
+    if not rows:
+        return None
+    row = rows[0]
+    if not row["typed"]:
+        event = await get_event(event_id)
+        return None if event is None else event.model_dump_json()
+    data = row["data"]
+    if row["event_type"] in _BODY_EVENT_TYPES:
+        request, response = await _load_bodies(db, event_id) or (None, None)
+        data = (
+            f"{data.rstrip()[:-1]},"
+            f'"request_body":{_body_json(request)},'
+            f'"response_body":{_body_json(response)}}}'
+        )
+    head = EventSummary(
+        id=event_id,
+        timestamp=_coerce_timestamp(row["timestamp"]),
+        event_type=cast(EventType, row["event_type"]),
+        summary=row["summary"],
+        app=row["app"],
+        session=row["session"],
+    ).model_dump_json()
+    return f'{head[:-1]},"data":{data}}}'
+
 
-    _, method_rows = await db.execute_query(
-        "SELECT DISTINCT json_extract(data, '$.method') as method"
-        " FROM captured_events"
-        " WHERE event_type IN ('http', 'http_incoming') AND method IS NOT NULL"
+async def _load_bodies(
+    db: BaseDBAsyncClient, event_id: str
+) -> tuple[bytes | None, bytes | None] | None:
+    """The compressed (request, response) bodies of an event, if it has any."""
+    _, rows = await db.execute_query(
+        "SELECT"
+        " (SELECT data FROM body_blobs WHERE hash = request_hash) AS request,"
+        " (SELECT data FROM body_blobs WHERE hash = response_hash) AS response"
+        " FROM event_bodies WHERE event_id = ?",
+        [event_id],
     )
-    methods = sorted({r["method"] for r in method_rows if r["method"]})
+    return (rows[0]["request"], rows[0]["response"]) if rows else None
 
-    event_types: list[str] = (
-        await CapturedEvent.all().distinct().values_list("event_type", flat=True)
-    )  # type: ignore[assignment]
 
-    _, app_rows = await db.execute_query(
-        "SELECT DISTINCT COALESCE(json_extract(data, '$.app'), '') as app"
-        " FROM captured_events"
-    )
-    apps = sorted({r["app"] for r in app_rows})
+def _body_json(blob: bytes | None) -> str:
+    if blob is None:
+        return "null"
+    text = BodyBlob.inflate(blob)
+    try:
+        return pydantic_core.to_json(text).decode()
+    except pydantic_core.PydanticSerializationError:
+        # Lone surrogates: pydantic-core rejects them, json escapes them.
+        return json.dumps(text)
 
-    _, session_rows = await db.execute_query(
-        "SELECT DISTINCT COALESCE(json_extract(data, '$.session'), '') as session"
-        " FROM captured_events"
-    )
-    sessions = sorted({r["session"] for r in session_rows})
+
+async def get_meta() -> MetaResponse:
+    db = read_connection()
+
+    # Each DISTINCT is answered from the leading column of a
+    # (column, timestamp) index without touching the table.
+    hosts = await _distinct(db, "host")
+    methods = await _distinct(db, "method")
+    event_types = await _distinct(db, "event_type")
+    apps = await _distinct(db, "app", keep_empty=True)
+    sessions = await _distinct(db, "session", keep_empty=True)
 
     import smello_server  # noqa: PLC0415
 
@@ -176,11 +387,32 @@ async def get_meta() -> MetaResponse:
         server_version=smello_server.__version__,
         hosts=hosts,
         methods=methods,
-        event_types=sorted({cast(EventType, t) for t in event_types}),
+        event_types=[cast(EventType, t) for t in event_types],
         apps=apps,
         sessions=sessions,
     )
 
 
+async def _distinct(
+    db: BaseDBAsyncClient, column: str, *, keep_empty: bool = False
+) -> list[str]:
+    """Sorted distinct non-NULL values of *column*, minus ``''`` unless *keep_empty*."""
+    _, rows = await db.execute_query(
+        f"SELECT DISTINCT {column} AS value FROM captured_events"
+        f" WHERE {column} IS NOT NULL ORDER BY {column}"
+    )
+    return [r["value"] for r in rows if keep_empty or r["value"]]
+
+
 async def clear_events() -> None:
-    await CapturedEvent.all().delete()
+    """Delete every event stored so far, in batches, then release the space.
+
+    Events captured while the delete runs are kept.
+    """
+    _, rows = await connections.get(WRITER).execute_query(
+        "SELECT max(rowid) AS last FROM captured_events"
+    )
+    if rows[0]["last"] is None:
+        return
+    await delete_oldest("rowid <= ?", [rows[0]["last"]])
+    await incremental_vacuum()
@@ -0,0 +1,132 @@
+"""Ingestion buffer: group incoming captures into bulk inserts.
+
+Capture routes hand validated, unsaved `CapturedEvent` rows to an
+`IngestBuffer` and return immediately. A background task flushes the buffer
+with `save_events` — one transaction for many rows — once ``max_rows`` rows
+are waiting or ``interval`` seconds after the first row arrived, whichever
+comes first.
+
+Each written batch is published to the buffer's `EventStream`, if any, for
+live dashboard streams. Read routes call `IngestBuffer.flush` before
+querying so a client always sees its own writes. `IngestBuffer.etag`
+changes with every accepted capture (and every `mark_changed` call), so a
+poll can be answered with ``304 Not Modified`` without touching the
+database.
+"""
+
+import asyncio
+import contextlib
+import logging
+import uuid
+
+from smello_server.models import CapturedEvent
+from smello_server.services.capture import save_events
+from smello_server.services.stream import EventStream
+
+logger = logging.getLogger(__name__)
+
+FLUSH_INTERVAL = 0.005
+MAX_ROWS = 500
+# Past this many pending rows, `add` waits for a flush instead of letting
+# the buffer grow without bound while the database catches up.
+MAX_PENDING = 10 * MAX_ROWS
+
+
+class IngestBuffer:
+    def __init__(
+        self,
+        *,
+        interval: float = FLUSH_INTERVAL,
+        max_rows: int = MAX_ROWS,
+        max_pending: int = MAX_PENDING,
+        stream: EventStream | None = None,
+    ) -> None:
+        self.interval = interval
+        self.max_rows = max_rows
+        self.max_pending = max_pending
+        self.stream = stream
+        self._pending: list[CapturedEvent] = []
+        self._has_rows = asyncio.Event()
+        self._full = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+        # A fresh epoch per buffer keeps ETags from one server run (or app
+        # instance) from ever matching another's.
+        self._epoch = uuid.uuid4().hex[:12]
+        self._version = 0
+
+    @property
+    def etag(self) -> str:
+        """Weak ETag for the stored events; changes whenever they may have."""
+        return f'W/"{self._epoch}-{self._version}"'
+
+    def mark_changed(self) -> None:
+        """Invalidate `etag` after a change made outside `add` (e.g. a delete)."""
+        self._version += 1
+
+    def start(self) -> None:
+        """Start the background flush task on the running event loop."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="smello-ingest")
+
+    async def stop(self) -> None:
+        """Stop the flush task and write out whatever is still pending."""
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+        await self.flush()
+
+    async def add(self, events: list[CapturedEvent]) -> None:
+        """Queue *events* for the next flush."""
+        self._pending.extend(events)
+        self._version += 1
+        if self._task is None:
+            # No flush task (e.g. the app lifespan isn't running): write now.
+            await self.flush()
+            return
+        self._has_rows.set()
+        if len(self._pending) >= self.max_rows:
+            self._full.set()
+        if len(self._pending) >= self.max_pending:
+            await self.flush()
+
+    async def flush(self) -> None:
+        """Write all pending rows, ``max_rows`` per transaction."""
+        async with self._flush_lock:
+            while self._pending:
+                batch = self._pending[: self.max_rows]
+                del self._pending[: self.max_rows]
+                saved = await _write(batch)
+                if self.stream is not None:
+                    self.stream.publish(saved)
+            self._has_rows.clear()
+            self._full.clear()
+
+    async def _run(self) -> None:
+        while True:
+            await self._has_rows.wait()
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(self._full.wait(), self.interval)
+            await self.flush()
+
+
+async def _write(batch: list[CapturedEvent]) -> list[CapturedEvent]:
+    """Save *batch*; on failure, retry row by row so one bad row can't sink the rest.
+
+    Returns the rows that were inserted; ids already stored are left out.
+    """
+    try:
+        return await save_events(batch)
+    except Exception:
+        logger.exception(
+            "Bulk insert of %d events failed; retrying one by one", len(batch)
+        )
+    saved = []
+    for event in batch:
+        try:
+            saved += await save_events([event])
+        except Exception:
+            logger.exception("Dropping event %s", event.id)
+    return saved
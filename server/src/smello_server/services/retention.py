@@ -0,0 +1,259 @@
+"""Retention: prune old captures in small batches and give the space back.
+
+A `RetentionPolicy` caps events by age, total count, database size, and
+count per app. `prune` deletes the oldest events past any limit,
+``batch_size`` rows per transaction so captures keep landing during a long
+prune, then returns freed pages to the filesystem with an incremental
+vacuum. `Pruner` runs it in the background every ``interval`` seconds.
+"""
+
+import asyncio
+import contextlib
+import logging
+import os
+import re
+from collections.abc import Callable, Mapping
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+
+from tortoise import connections
+from tortoise.backends.base.client import BaseDBAsyncClient
+from tortoise.transactions import in_transaction
+
+from smello_server.db import WRITER
+
+logger = logging.getLogger(__name__)
+
+PRUNE_INTERVAL = 60.0
+BATCH_SIZE = 500
+# Pages released per incremental-vacuum step (4 MB with 4 KB pages).
+VACUUM_PAGES = 1000
+
+_DURATION = re.compile(r"^\s*(\d+)\s*([smhdw])\s*$", re.IGNORECASE)
+_DURATION_UNITS = {
+    "s": "seconds",
+    "m": "minutes",
+    "h": "hours",
+    "d": "days",
+    "w": "weeks",
+}
+_SIZE = re.compile(r"^\s*(\d+)\s*([kmg]?)i?b?\s*$", re.IGNORECASE)
+_SIZE_UNITS = {"": 1, "k": 1024, "m": 1024**2, "g": 1024**3}
+
+
+def parse_duration(value: str) -> timedelta:
+    """Parse ``30m``, ``12h``, ``7d``, ``2w``, or ``45s`` into a timedelta."""
+    match = _DURATION.match(value)
+    if not match:
+        raise ValueError(f"Invalid duration {value!r}; use e.g. 30m, 12h, 7d, 2w")
+    amount, unit = match.groups()
+    return timedelta(**{_DURATION_UNITS[unit.lower()]: int(amount)})
+
+
+def parse_size(value: str) -> int:
+    """Parse a byte size such as ``500MB``, ``2GB``, or ``1048576`` (binary units)."""
+    match = _SIZE.match(value)
+    if not match:
+        raise ValueError(f"Invalid size {value!r}; use e.g. 500MB or 2GB")
+    amount, unit = match.groups()
+    return int(amount) * _SIZE_UNITS[unit.lower()]
+
+
+def parse_count(value: str) -> int:
+    """Parse a non-negative event count such as ``10000``."""
+    if not value.strip().isdigit():
+        raise ValueError(f"Invalid count {value!r}; use a whole number >= 0")
+    return int(value)
+
+
+def parse_app_limits(value: str) -> dict[str, int]:
+    """Parse ``web=1000,worker=500`` into ``{"web": 1000, "worker": 500}``."""
+    limits = {}
+    for item in filter(None, (part.strip() for part in value.split(","))):
+        app, sep, limit = item.rpartition("=")
+        if not sep or not limit.strip().isdigit():
+            raise ValueError(f"Invalid per-app limit {item!r}; use APP=COUNT")
+        limits[app.strip()] = int(limit)
+    return limits
+
+
+@dataclass(frozen=True)
+class RetentionPolicy:
+    """Limits on stored events. ``None`` (or no entry) means unlimited."""
+
+    max_age: timedelta | None = None
+    max_events: int | None = None
+    max_db_bytes: int | None = None
+    app_max_events: Mapping[str, int] = field(default_factory=dict)
+
+    @property
+    def enabled(self) -> bool:
+        return bool(
+            self.max_age is not None
+            or self.max_events is not None
+            or self.max_db_bytes is not None
+            or self.app_max_events
+        )
+
+    @classmethod
+    def from_env(cls, environ: Mapping[str, str] = os.environ) -> "RetentionPolicy":
+        """Read ``SMELLO_MAX_AGE``, ``SMELLO_MAX_EVENTS``, ``SMELLO_MAX_DB_SIZE``,
+        and ``SMELLO_APP_MAX_EVENTS``. Raises ValueError on a malformed value.
+        """
+        max_age = environ.get("SMELLO_MAX_AGE")
+        max_events = environ.get("SMELLO_MAX_EVENTS")
+        max_db_size = environ.get("SMELLO_MAX_DB_SIZE")
+        return cls(
+            max_age=parse_duration(max_age) if max_age else None,
+            max_events=parse_count(max_events) if max_events else None,
+            max_db_bytes=parse_size(max_db_size) if max_db_size else None,
+            app_max_events=parse_app_limits(environ.get("SMELLO_APP_MAX_EVENTS", "")),
+        )
+
+
+async def prune(
+    policy: RetentionPolicy,
+    *,
+    batch_size: int = BATCH_SIZE,
+    now: datetime | None = None,
+) -> int:
+    """Delete the oldest events past any of *policy*'s limits.
+
+    Returns the number of events deleted.
+    """
+    db = connections.get(WRITER)
+    deleted = 0
+    if policy.max_age is not None:
+        cutoff = (now or datetime.now(timezone.utc)) - policy.max_age
+        # Compared as text against the stored isoformat(" ") values.
+        deleted += await delete_oldest(
+            "timestamp < ?", [cutoff.isoformat(" ")], batch_size=batch_size
+        )
+    for app, limit in policy.app_max_events.items():
+        excess = await _count(db, "app = ?", [app]) - limit
+        deleted += await delete_oldest(
+            "app = ?", [app], count=excess, batch_size=batch_size
+        )
+    if policy.max_events is not None:
+        excess = await _count(db, "1=1", []) - policy.max_events
+        deleted += await delete_oldest("1=1", [], count=excess, batch_size=batch_size)
+    if policy.max_db_bytes is not None:
+        while await used_bytes(db) > policy.max_db_bytes:
+            batch = await delete_oldest(
+                "1=1", [], count=batch_size, batch_size=batch_size
+            )
+            if not batch:
+                break
+            deleted += batch
+    if deleted:
+        await incremental_vacuum()
+    return deleted
+
+
+async def delete_oldest(
+    where: str,
+    params: list[str | int],
+    *,
+    count: int | None = None,
+    batch_size: int = BATCH_SIZE,
+) -> int:
+    """Delete up to *count* (default: all) events matching *where*, oldest first.
+
+    Each batch is its own short transaction, and the loop yields between
+    batches so ingestion and reads aren't starved.
+    """
+    deleted = 0
+    while count is None or deleted < count:
+        limit = batch_size if count is None else min(batch_size, count - deleted)
+        async with in_transaction(WRITER) as tx:
+            await tx.execute_query(
+                "DELETE FROM captured_events WHERE rowid IN ("
+                f" SELECT rowid FROM captured_events WHERE {where}"
+                " ORDER BY timestamp LIMIT ?)",
+                [*params, limit],
+            )
+            # changes() leaves out the search-index rows the triggers delete.
+            _, rows = await tx.execute_query("SELECT changes() AS n")
+        deleted += rows[0]["n"]
+        if rows[0]["n"] < limit:
+            break
+        await asyncio.sleep(0)
+    return deleted
+
+
+async def used_bytes(db: BaseDBAsyncClient) -> int:
+    """Bytes of the database file in use, not counting free pages."""
+    _, page_size = await db.execute_query("PRAGMA page_size")
+    _, page_count = await db.execute_query("PRAGMA page_count")
+    _, free = await db.execute_query("PRAGMA freelist_count")
+    return (page_count[0][0] - free[0][0]) * page_size[0][0]
+
+
+async def incremental_vacuum() -> None:
+    """Return free pages to the filesystem, a few MB per step.
+
+    Only databases created with ``auto_vacuum=INCREMENTAL`` (every database
+    created since retention was added) can shrink; on older ones freed
+    pages are reused for new captures instead, so the file stops growing.
+    """
+    db = connections.get(WRITER)
+    _, mode = await db.execute_query("PRAGMA auto_vacuum")
+    if mode[0][0] != 2:
+        return
+    while True:
+        _, free = await db.execute_query("PRAGMA freelist_count")
+        if not free[0][0]:
+            return
+        await db.execute_query(f"PRAGMA incremental_vacuum({VACUUM_PAGES})")
+        await asyncio.sleep(0)
+
+
+async def _count(db: BaseDBAsyncClient, where: str, params: list[str | int]) -> int:
+    _, rows = await db.execute_query(
+        f"SELECT count(*) AS n FROM captured_events WHERE {where}", params
+    )
+    return rows[0]["n"]
+
+
+class Pruner:
+    """Background task that applies a `RetentionPolicy` every ``interval`` seconds."""
+
+    def __init__(
+        self,
+        policy: RetentionPolicy,
+        *,
+        interval: float = PRUNE_INTERVAL,
+        on_prune: Callable[[], None] | None = None,
+    ) -> None:
+        self.policy = policy
+        self.interval = interval
+        self.on_prune = on_prune
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start pruning on the running event loop, if the policy sets any limit."""
+        if self._task is None and self.policy.enabled:
+            self._task = asyncio.create_task(self._run(), name="smello-retention")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self._task
+            self._task = None
+
+    async def run_once(self) -> int:
+        deleted = await prune(self.policy)
+        if deleted:
+            logger.info("Retention: pruned %d events", deleted)
+            if self.on_prune is not None:
+                self.on_prune()
+        return deleted
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.run_once()
+            except Exception:
+                logger.exception("Retention pruning failed")
+            await asyncio.sleep(self.interval)
@@ -0,0 +1,64 @@
+"""The full-text search index over captured events.
+
+Searchable text per event is SQL over a ``captured_events`` row, so the
+index triggers that `smello_server.migrations` creates can fill it in.
+Missing JSON keys are NULL and drop out of the concatenation. Bodies are
+compressed, out of SQL's reach: the triggers index them as empty and
+`index_bodies` fills them in from Python once they are stored.
+"""
+
+from collections.abc import Mapping
+
+from tortoise.backends.base.client import BaseDBAsyncClient
+
+from smello_server.db import table_exists
+from smello_server.models import SEARCH_TABLE
+
+SEARCH_COLUMNS = {
+    "summary": ("summary",),
+    "url": ("$.url",),
+    "body": (),
+    "message": (
+        "$.message",
+        "$.exc_text",
+        "$.exc_type",
+        "$.exc_value",
+        "$.traceback_text",
+    ),
+}
+
+
+def search_values(row: str, *, body: str = "''") -> str:
+    """SQL for the `SEARCH_COLUMNS` values of the ``captured_events`` row
+    aliased *row*, with *body* as the body column.
+    """
+    exprs = []
+    for sources in SEARCH_COLUMNS.values():
+        parts = [
+            f"COALESCE(json_extract({row}.data, '{src}'), '')"
+            if src.startswith("$.")
+            else f"{row}.{src}"
+            for src in sources
+        ]
+        exprs.append(" || ' ' || ".join(parts) if parts else body)
+    return ", ".join(exprs)
+
+
+async def index_bodies(
+    db: BaseDBAsyncClient, bodies: Mapping[str, tuple[str | None, str | None]]
+) -> None:
+    """Add the (request, response) *bodies* of stored events, keyed by event
+    id, to their search index rows.
+    """
+    if not bodies or not await table_exists(db, SEARCH_TABLE):
+        return
+    columns = ", ".join(SEARCH_COLUMNS)
+    await db.execute_many(
+        f'INSERT OR REPLACE INTO "{SEARCH_TABLE}"(rowid, {columns})'
+        f" SELECT rowid, {search_values('captured_events', body='?')}"
+        ' FROM "captured_events" WHERE id = ?',
+        [
+            [f"{request or ''} {response or ''}", event_id]
+            for event_id, (request, response) in bodies.items()
+        ],
+    )
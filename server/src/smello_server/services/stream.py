@@ -0,0 +1,132 @@
+"""Live event stream: push newly stored events to open dashboard streams.
+
+`IngestBuffer` publishes every batch it writes to an `EventStream`, which
+fans it out to one `Subscription` per open ``/api/events/stream`` request.
+`live_events` filters each batch the way `list_events` would, so a stream
+costs no database queries while nothing is being captured (and none at all
+for streams without ``search``).
+"""
+
+import asyncio
+import contextlib
+from collections.abc import AsyncIterator, Generator
+from dataclasses import asdict, dataclass
+
+from smello_server.models import CapturedEvent
+from smello_server.services.events import (
+    InvalidCursorError,
+    list_events,
+    search_matches,
+    summarize_event,
+)
+from smello_server.types import EventSummary
+
+KEEPALIVE_INTERVAL = 15.0
+# Batches a subscriber may fall behind by before its stream is closed.
+MAX_QUEUED = 1000
+# Most events replayed to a reconnecting stream.
+CATCH_UP_LIMIT = 200
+
+
+@dataclass(frozen=True)
+class EventFilter:
+    """The `list_events` filters, for matching events in memory."""
+
+    event_type: str | None = None
+    host: str | None = None
+    method: str | None = None
+    status: int | None = None
+    search: str | None = None
+    app: str | None = None
+    session: str | None = None
+
+    def matches(self, event: CapturedEvent) -> bool:
+        """Apply every filter but ``search``, which needs the database."""
+        return (
+            (not self.event_type or event.event_type == self.event_type)
+            and (not self.host or event.host == self.host)
+            and (not self.method or event.method == self.method.upper())
+            and (not self.status or event.status_code == self.status)
+            and (self.app is None or event.app == self.app)
+            and (self.session is None or event.session == self.session)
+        )
+
+
+class Subscription:
+    def __init__(self, max_queued: int) -> None:
+        self._queue: asyncio.Queue[list[CapturedEvent]] = asyncio.Queue(max_queued)
+        self.overflowed = False
+
+    def put(self, events: list[CapturedEvent]) -> None:
+        try:
+            self._queue.put_nowait(events)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    async def get(self, timeout: float) -> list[CapturedEvent]:
+        """Wait for the next batch; ``[]`` if none arrives within *timeout*."""
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except TimeoutError:
+            return []
+
+
+class EventStream:
+    def __init__(self, *, max_queued: int = MAX_QUEUED) -> None:
+        self.max_queued = max_queued
+        self._subscribers: set[Subscription] = set()
+
+    @contextlib.contextmanager
+    def subscribe(self) -> Generator[Subscription]:
+        subscription = Subscription(self.max_queued)
+        self._subscribers.add(subscription)
+        try:
+            yield subscription
+        finally:
+            self._subscribers.discard(subscription)
+
+    def publish(self, events: list[CapturedEvent]) -> None:
+        """Hand newly stored *events* to every subscriber, without waiting."""
+        if events:
+            for subscription in self._subscribers:
+                subscription.put(events)
+
+
+async def live_events(
+    stream: EventStream,
+    filters: EventFilter,
+    *,
+    last_event_id: str | None = None,
+    keepalive: float = KEEPALIVE_INTERVAL,
+) -> AsyncIterator[list[EventSummary]]:
+    """Yield batches of stored events matching *filters*, oldest first.
+
+    With *last_event_id* (a list cursor, as sent back by a reconnecting
+    ``EventSource``), events stored since that position are replayed
+    first. An empty batch means nothing arrived for *keepalive* seconds.
+    The iterator ends if the consumer falls more than ``max_queued``
+    batches behind; the client reconnects and catches up from there.
+    """
+    with stream.subscribe() as subscription:
+        replayed: set[str] = set()
+        if last_event_id:
+            try:
+                page = await list_events(
+                    **asdict(filters), after=last_event_id, limit=CATCH_UP_LIMIT
+                )
+            except InvalidCursorError:
+                pass
+            else:
+                replayed = {e.id for e in page.events}
+                yield page.events[::-1]
+
+        while not subscription.overflowed:
+            batch = await subscription.get(keepalive)
+            events = [
+                e for e in batch if filters.matches(e) and str(e.id) not in replayed
+            ]
+            if filters.search and events:
+                hits = await search_matches(filters.search, [str(e.id) for e in events])
+                events = [e for e in events if str(e.id) in hits]
+            if events or not batch:
+                yield [summarize_event(e) for e in events]
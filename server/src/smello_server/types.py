@@ -194,6 +194,19 @@ class EventSummary(BaseModel):
     session: str = ""
 
 
+class EventList(BaseModel):
+    """One page of `/api/events`, newest first.
+
+    Pass ``next_cursor`` as ``before`` to get the next, older page; it is
+    ``None`` once there is nothing older. Pass ``prev_cursor`` as ``after``
+    to get events newer than this page.
+    """
+
+    events: list[EventSummary]
+    next_cursor: str | None = None
+    prev_cursor: str | None = None
+
+
 class EventDetail(EventSummary):
     data: EventData
 
@@ -214,3 +227,25 @@ class MetaResponse(BaseModel):
     event_types: list[EventType]
     apps: list[str]
     sessions: list[str]
+
+
+class DeliveryCounts(BaseModel):
+    """Captures of one event type a client sent, dropped, or failed to send."""
+
+    sent: int = 0
+    dropped: int = 0
+    failed: int = 0
+
+
+class ClientStats(BaseModel):
+    """The delivery counters one client process last reported.
+
+    Counts are totals since the client process started.
+    """
+
+    client_id: str
+    app: str = ""
+    session: str = ""
+    smello_version: str = ""
+    reported_at: datetime
+    events: dict[str, DeliveryCounts]
@@ -5,6 +5,8 @@ import pytest_asyncio
 import tortoise.context
 from fastapi.testclient import TestClient
 from smello_server.app import create_app
+from smello_server.db import tortoise_config
+from smello_server.migrations import init_db
 from tortoise import Tortoise
 
 
@@ -38,7 +40,20 @@ async def services_db(tmp_path):
     _reset_tortoise_global_context()
     db_url = f"sqlite://{tmp_path / 'services.db'}"
     await Tortoise.init(db_url=db_url, modules={"models": ["smello_server.models"]})
-    await Tortoise.generate_schemas()
+    await init_db()
+    try:
+        yield
+    finally:
+        await Tortoise.close_connections()
+        _reset_tortoise_global_context()
+
+
+@pytest_asyncio.fixture()
+async def pooled_db(tmp_path):
+    """Like ``services_db``, but with the app's writer + readers config."""
+    _reset_tortoise_global_context()
+    await Tortoise.init(config=tortoise_config(f"sqlite://{tmp_path / 'pooled.db'}"))
+    await init_db()
     try:
         yield
     finally:
@@ -5,6 +5,10 @@ and that each route reaches the right service. Persistence and filter
 behavior live in `test_services_*`.
 """
 
+import gzip
+import json
+
+import pytest
 from smello_server.types import (
     EventDetail,
     ExceptionEventData,
@@ -21,7 +25,7 @@ def test_capture_http_returns_201(client, http_payload):
     assert resp.status_code == 201
     assert resp.json() == {"status": "ok"}
 
-    events = client.get("/api/events").json()
+    events = client.get("/api/events").json()["events"]
     assert len(events) == 1
     assert events[0]["event_type"] == "http"
 
@@ -31,11 +35,68 @@ def test_capture_http_requires_request_and_response(client):
     assert resp.status_code == 422
 
 
+def test_capture_rejects_malformed_json(client):
+    resp = client.post(
+        "/api/capture/http",
+        content=b'{"request": ',
+        headers={"Content-Type": "application/json"},
+    )
+    assert resp.status_code == 422
+    assert resp.json()["detail"][0]["type"] == "json_invalid"
+
+
+def test_capture_accepts_non_ascii_json(client, log_payload):
+    log_payload["data"]["message"] = "caf\u00e9 \u2603"
+    resp = client.post("/api/capture/log", json=log_payload)
+    assert resp.status_code == 201
+    events = client.get("/api/events").json()["events"]
+    assert events[0]["summary"].endswith("caf\u00e9 \u2603")
+
+
+def test_capture_accepts_gzipped_body(client, log_payload):
+    body = {"events": [{**log_payload, "event_type": "log"}]}
+    resp = client.post(
+        "/api/capture/batch",
+        content=gzip.compress(json.dumps(body).encode()),
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+    assert resp.status_code == 201
+    assert resp.json() == {"status": "ok", "count": 1}
+
+
+def test_capture_rejects_invalid_gzip(client):
+    resp = client.post(
+        "/api/capture/log",
+        content=b"not gzip",
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+    assert resp.status_code == 400
+
+
+def test_capture_rejects_oversized_gzip(client, monkeypatch):
+    monkeypatch.setattr("smello_server.routes.api.MAX_DECOMPRESSED_BYTES", 100)
+    resp = client.post(
+        "/api/capture/log",
+        content=gzip.compress(b" " * 1000),
+        headers={"Content-Type": "application/json", "Content-Encoding": "gzip"},
+    )
+    assert resp.status_code == 413
+
+
+def test_capture_rejects_unknown_content_encoding(client, log_payload):
+    resp = client.post(
+        "/api/capture/log",
+        json=log_payload,
+        headers={"Content-Encoding": "br"},
+    )
+    assert resp.status_code == 415
+
+
 def test_capture_log_returns_201(client, log_payload):
     resp = client.post("/api/capture/log", json=log_payload)
     assert resp.status_code == 201
 
-    events = client.get("/api/events").json()
+    events = client.get("/api/events").json()["events"]
     assert events[0]["event_type"] == "log"
 
 
@@ -48,7 +109,7 @@ def test_capture_exception_returns_201(client, exception_payload):
     resp = client.post("/api/capture/exception", json=exception_payload)
     assert resp.status_code == 201
 
-    events = client.get("/api/events").json()
+    events = client.get("/api/events").json()["events"]
     assert events[0]["event_type"] == "exception"
 
 
@@ -62,7 +123,7 @@ def test_capture_http_incoming_returns_201(client, http_incoming_payload):
     assert resp.status_code == 201
     assert resp.json() == {"status": "ok"}
 
-    events = client.get("/api/events").json()
+    events = client.get("/api/events").json()["events"]
     assert len(events) == 1
     assert events[0]["event_type"] == "http_incoming"
 
@@ -72,11 +133,68 @@ def test_capture_http_incoming_requires_request_and_response(client):
     assert resp.status_code == 422
 
 
+# --- Batch capture endpoint ---
+
+
+def test_capture_batch_stores_mixed_event_types(
+    client, http_payload, log_payload, exception_payload, http_incoming_payload
+):
+    resp = client.post(
+        "/api/capture/batch",
+        json={
+            "events": [
+                {**http_payload, "event_type": "http"},
+                {**log_payload, "event_type": "log"},
+                {**exception_payload, "event_type": "exception"},
+                {**http_incoming_payload, "event_type": "http_incoming"},
+            ]
+        },
+    )
+    assert resp.status_code == 201
+    assert resp.json() == {"status": "ok", "count": 4}
+
+    events = client.get("/api/events").json()["events"]
+    assert sorted(e["event_type"] for e in events) == [
+        "exception",
+        "http",
+        "http_incoming",
+        "log",
+    ]
+
+
+def test_capture_batch_accepts_empty_list(client):
+    resp = client.post("/api/capture/batch", json={"events": []})
+    assert resp.status_code == 201
+    assert resp.json() == {"status": "ok", "count": 0}
+
+
+def test_capture_batch_rejects_unknown_event_type(client, log_payload):
+    resp = client.post(
+        "/api/capture/batch",
+        json={"events": [{**log_payload, "event_type": "metric"}]},
+    )
+    assert resp.status_code == 422
+
+
+def test_capture_batch_invalid_item_rejects_whole_batch(client, log_payload):
+    resp = client.post(
+        "/api/capture/batch",
+        json={
+            "events": [
+                {**log_payload, "event_type": "log"},
+                {"event_type": "http", "duration_ms": 0},
+            ]
+        },
+    )
+    assert resp.status_code == 422
+    assert client.get("/api/events").json()["events"] == []
+
+
 def test_event_detail_validates_against_typed_union_http_incoming(
     client, http_incoming_payload
 ):
     client.post("/api/capture/http_incoming", json=http_incoming_payload)
-    event_id = client.get("/api/events").json()[0]["id"]
+    event_id = client.get("/api/events").json()["events"][0]["id"]
     raw = client.get(f"/api/events/{event_id}").json()
     parsed = EventDetail.model_validate(raw)
     assert isinstance(parsed.data, HttpIncomingEventData)
@@ -91,17 +209,63 @@ def test_capture_endpoints_marked_deprecated_in_openapi(client):
     spec = client.get("/openapi.json").json()
     assert spec["paths"]["/api/capture"]["post"].get("deprecated") is True
     # Typed endpoints must NOT be deprecated.
-    for path in ("/api/capture/http", "/api/capture/log", "/api/capture/exception"):
+    for path in (
+        "/api/capture/http",
+        "/api/capture/log",
+        "/api/capture/exception",
+        "/api/capture/batch",
+    ):
         assert not spec["paths"][path]["post"].get("deprecated")
 
 
+# --- Client delivery counters ---
+
+
+def _stats_report(client_id="host:1", sent=3, **extra):
+    return {
+        "client_id": client_id,
+        "app": "web",
+        "smello_version": "0.14.1",
+        "events": {"http": {"sent": sent, "dropped": 2, "failed": 1}},
+        **extra,
+    }
+
+
+def test_capture_stats_then_list_clients(client):
+    resp = client.post("/api/capture/stats", json=_stats_report())
+    assert resp.status_code == 200
+
+    clients = client.get("/api/clients").json()
+    assert len(clients) == 1
+    assert clients[0]["client_id"] == "host:1"
+    assert clients[0]["app"] == "web"
+    assert clients[0]["events"]["http"] == {"sent": 3, "dropped": 2, "failed": 1}
+    assert clients[0]["reported_at"]
+
+
+def test_capture_stats_replaces_previous_report(client):
+    client.post("/api/capture/stats", json=_stats_report(sent=1))
+    client.post("/api/capture/stats", json=_stats_report(sent=5))
+    client.post("/api/capture/stats", json=_stats_report("host:2", app="worker"))
+
+    clients = client.get("/api/clients").json()
+    assert [c["client_id"] for c in clients] == ["host:2", "host:1"]
+    assert clients[1]["events"]["http"]["sent"] == 5
+    assert client.get("/api/clients?app=worker").json()[0]["client_id"] == "host:2"
+
+
+def test_capture_stats_requires_client_id(client):
+    resp = client.post("/api/capture/stats", json={"events": {}})
+    assert resp.status_code == 422
+
+
 # --- Deprecated HTTP-only endpoint ---
 
 
 def test_deprecated_capture_accepts_http_payload(client, sample_payload):
     resp = client.post("/api/capture", json=sample_payload)
     assert resp.status_code == 201
-    events = client.get("/api/events").json()
+    events = client.get("/api/events").json()["events"]
     assert events[0]["event_type"] == "http"
 
 
@@ -136,7 +300,7 @@ def test_event_detail_validates_against_typed_union_http(client, http_payload):
 
 def test_event_detail_validates_against_typed_union_log(client, log_payload):
     client.post("/api/capture/log", json=log_payload)
-    event_id = client.get("/api/events").json()[0]["id"]
+    event_id = client.get("/api/events").json()["events"][0]["id"]
     raw = client.get(f"/api/events/{event_id}").json()
     parsed = EventDetail.model_validate(raw)
     assert isinstance(parsed.data, LogEventData)
@@ -148,7 +312,7 @@ def test_event_detail_validates_against_typed_union_exception(
     client, exception_payload
 ):
     client.post("/api/capture/exception", json=exception_payload)
-    event_id = client.get("/api/events").json()[0]["id"]
+    event_id = client.get("/api/events").json()["events"][0]["id"]
     raw = client.get(f"/api/events/{event_id}").json()
     parsed = EventDetail.model_validate(raw)
     assert isinstance(parsed.data, ExceptionEventData)
@@ -185,10 +349,49 @@ def test_meta_endpoint(client, http_payload):
 
 def test_clear_events(client, http_payload):
     client.post("/api/capture/http", json=http_payload)
-    assert len(client.get("/api/events").json()) == 1
+    assert len(client.get("/api/events").json()["events"]) == 1
     resp = client.delete("/api/events")
     assert resp.status_code == 204
-    assert client.get("/api/events").json() == []
+    assert client.get("/api/events").json()["events"] == []
+
+
+def test_list_events_returns_304_until_something_changes(client, http_payload):
+    client.post("/api/capture/http", json=http_payload)
+    first = client.get("/api/events")
+    etag = first.headers["etag"]
+
+    resp = client.get("/api/events", headers={"If-None-Match": etag})
+    assert resp.status_code == 304
+    assert resp.content == b""
+    assert resp.headers["etag"] == etag
+
+    client.post("/api/capture/http", json={**http_payload, "id": None})
+    resp = client.get("/api/events", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert len(resp.json()["events"]) == 2
+    assert resp.headers["etag"] != etag
+
+
+def test_clearing_events_changes_the_etag(client, http_payload):
+    client.post("/api/capture/http", json=http_payload)
+    etag = client.get("/api/events").headers["etag"]
+    client.delete("/api/events")
+
+    resp = client.get("/api/events", headers={"If-None-Match": etag})
+    assert resp.status_code == 200
+    assert resp.json()["events"] == []
+
+
+@pytest.mark.parametrize(
+    "if_none_match",
+    ['"stale", {etag}', "{etag_strong}", "*"],
+    ids=["list", "strong", "any"],
+)
+def test_list_events_if_none_match_forms(client, if_none_match):
+    etag = client.get("/api/events").headers["etag"]
+    header = if_none_match.format(etag=etag, etag_strong=etag.removeprefix("W/"))
+    resp = client.get("/api/events", headers={"If-None-Match": header})
+    assert resp.status_code == 304
 
 
 # --- App and session filtering ---
@@ -211,7 +414,7 @@ def test_capture_log_with_app_and_session(client, log_payload):
     log_payload["session"] = "sess-2"
     client.post("/api/capture/log", json=log_payload)
 
-    events = client.get("/api/events").json()
+    events = client.get("/api/events").json()["events"]
     event_id = events[0]["id"]
     detail = client.get(f"/api/events/{event_id}").json()
     assert detail["app"] == "backend"
@@ -225,7 +428,7 @@ def test_filter_events_by_app(client, http_payload):
     payload2 = {**http_payload, "id": None, "app": "backend"}
     client.post("/api/capture/http", json=payload2)
 
-    events = client.get("/api/events?app=frontend").json()
+    events = client.get("/api/events?app=frontend").json()["events"]
     assert len(events) == 1
     assert events[0]["app"] == "frontend"
 
@@ -236,7 +439,7 @@ def test_filter_events_by_empty_app(client, http_payload):
     payload2 = {**http_payload, "id": None, "app": "myapp"}
     client.post("/api/capture/http", json=payload2)
 
-    events = client.get("/api/events?app=").json()
+    events = client.get("/api/events?app=").json()["events"]
     assert len(events) == 1
     assert events[0]["app"] == ""
 
@@ -248,7 +451,7 @@ def test_filter_events_by_session(client, http_payload):
     payload2 = {**http_payload, "id": None, "session": "debug-auth"}
     client.post("/api/capture/http", json=payload2)
 
-    events = client.get("/api/events?session=debug-payment").json()
+    events = client.get("/api/events?session=debug-payment").json()["events"]
     assert len(events) == 1
     assert events[0]["session"] == "debug-payment"
 
@@ -260,7 +463,7 @@ def test_no_app_param_returns_all(client, http_payload):
     payload2 = {**http_payload, "id": None, "app": ""}
     client.post("/api/capture/http", json=payload2)
 
-    events = client.get("/api/events").json()
+    events = client.get("/api/events").json()["events"]
     assert len(events) == 2
 
 
@@ -279,6 +482,60 @@ def test_event_summary_includes_app_and_session(client, http_payload):
     http_payload["session"] = "sess-1"
     client.post("/api/capture/http", json=http_payload)
 
-    events = client.get("/api/events").json()
+    events = client.get("/api/events").json()["events"]
     assert events[0]["app"] == "myapp"
     assert events[0]["session"] == "sess-1"
+
+
+def test_search_events(client, http_payload, log_payload):
+    client.post("/api/capture/http", json=http_payload)
+    client.post("/api/capture/log", json=log_payload)
+
+    events = client.get("/api/events", params={"search": "token expir"}).json()[
+        "events"
+    ]
+    assert [e["event_type"] for e in events] == ["log"]
+
+
+def test_search_events_sorted_by_relevance(client, http_payload, log_payload):
+    client.post("/api/capture/log", json=log_payload)
+    client.post("/api/capture/http", json=http_payload)
+
+    events = client.get(
+        "/api/events", params={"search": "test", "sort": "relevance"}
+    ).json()["events"]
+    assert [e["event_type"] for e in events] == ["http"]
+
+
+def test_list_events_pages_with_cursors(client, log_payload):
+    def log(message):
+        data = {**log_payload["data"], "message": message}
+        client.post("/api/capture/log", json={**log_payload, "data": data})
+
+    for i in range(3):
+        log(f"m{i}")
+
+    first = client.get("/api/events", params={"limit": 2}).json()
+    assert [e["summary"] for e in first["events"]] == [
+        "WARNING myapp.auth: m2",
+        "WARNING myapp.auth: m1",
+    ]
+    second = client.get(
+        "/api/events", params={"limit": 2, "before": first["next_cursor"]}
+    ).json()
+    assert [e["summary"] for e in second["events"]] == ["WARNING myapp.auth: m0"]
+    assert second["next_cursor"] is None
+
+    log("m3")
+    newer = client.get("/api/events", params={"after": first["prev_cursor"]}).json()
+    assert [e["summary"] for e in newer["events"]] == ["WARNING myapp.auth: m3"]
+
+
+def test_list_events_rejects_invalid_cursor(client):
+    resp = client.get("/api/events", params={"before": "not-a-cursor"})
+    assert resp.status_code == 422
+
+
+def test_list_events_rejects_unknown_sort(client):
+    resp = client.get("/api/events", params={"sort": "oldest"})
+    assert resp.status_code == 422
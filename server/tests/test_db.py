@@ -0,0 +1,61 @@
+"""Tests for the SQLite connection setup."""
+
+import pytest
+from smello_server.db import READERS, WRITER, read_connection, tortoise_config
+from smello_server.models import CapturedEvent
+from tortoise import connections
+from tortoise.exceptions import OperationalError
+
+
+def test_file_database_gets_query_only_readers(tmp_path):
+    config = tortoise_config(f"sqlite://{tmp_path / 'db.sqlite'}")
+
+    assert set(config["connections"]) == {WRITER, *READERS}
+    writer = config["connections"][WRITER]["credentials"]
+    assert writer["journal_mode"] == "WAL"
+    assert writer["synchronous"] == "NORMAL"
+    assert "query_only" not in writer
+    for name in READERS:
+        assert config["connections"][name]["credentials"]["query_only"] == "ON"
+
+
+def test_memory_database_has_writer_only():
+    config = tortoise_config("sqlite://:memory:")
+
+    assert set(config["connections"]) == {WRITER}
+
+
+@pytest.mark.asyncio
+async def test_pragmas_applied(pooled_db):
+    _, rows = await connections.get(WRITER).execute_query("PRAGMA journal_mode")
+    assert rows[0][0] == "wal"
+    _, rows = await connections.get(WRITER).execute_query("PRAGMA synchronous")
+    assert rows[0][0] == 1  # NORMAL
+    _, rows = await connections.get(WRITER).execute_query("PRAGMA auto_vacuum")
+    assert rows[0][0] == 2  # INCREMENTAL
+
+
+@pytest.mark.asyncio
+async def test_read_connection_rotates_over_readers(pooled_db):
+    seen = {id(read_connection()) for _ in range(2 * len(READERS))}
+
+    assert len(seen) == len(READERS)
+    assert id(connections.get(WRITER)) not in seen
+
+
+@pytest.mark.asyncio
+async def test_readers_refuse_writes(pooled_db):
+    with pytest.raises(OperationalError):
+        await read_connection().execute_query("DELETE FROM captured_events")
+
+
+@pytest.mark.asyncio
+async def test_readers_see_committed_writes(pooled_db):
+    await CapturedEvent.create(event_type="log", summary="hello", data={})
+
+    assert await CapturedEvent.all().using_db(read_connection()).count() == 1
+
+
+@pytest.mark.asyncio
+async def test_read_connection_falls_back_to_writer(services_db):
+    assert read_connection() is connections.get(WRITER)
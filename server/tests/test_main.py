@@ -0,0 +1,47 @@
+"""Tests for the CLI's Unix domain socket binding."""
+
+import socket
+import stat
+
+import pytest
+import typer
+from smello_server.__main__ import _bind_uds
+
+
+def test_bind_uds_creates_world_writable_socket(tmp_path):
+    path = tmp_path / "smello.sock"
+
+    with _bind_uds(str(path)):
+        mode = path.stat().st_mode
+        assert stat.S_ISSOCK(mode)
+        assert stat.S_IMODE(mode) == 0o666
+
+
+def test_bind_uds_replaces_stale_socket(tmp_path):
+    """A socket file nobody listens on is left over from a dead server."""
+    path = tmp_path / "smello.sock"
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as stale:
+        stale.bind(str(path))
+
+    with _bind_uds(str(path)) as sock:
+        sock.listen()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+            client.connect(str(path))
+
+
+def test_bind_uds_refuses_live_socket(tmp_path):
+    path = tmp_path / "smello.sock"
+
+    with _bind_uds(str(path)) as sock:
+        sock.listen()
+        with pytest.raises(typer.BadParameter, match="already in use"):
+            _bind_uds(str(path))
+
+
+def test_bind_uds_refuses_regular_file(tmp_path):
+    path = tmp_path / "smello.sock"
+    path.write_text("not a socket")
+
+    with pytest.raises(typer.BadParameter, match="not a socket"):
+        _bind_uds(str(path))
+    assert path.read_text() == "not a socket"
@@ -0,0 +1,252 @@
+"""Tests for schema setup and migrations of existing databases."""
+
+import json
+import sqlite3
+from contextlib import asynccontextmanager
+
+import pytest
+import pytest_asyncio
+import tortoise.context
+from smello_server.db import WRITER, tortoise_config
+from smello_server.migrations import MIGRATIONS, init_db
+from smello_server.services.events import get_event, get_meta, list_events
+from tortoise import Tortoise, connections
+
+# Schema as created by smello-server 0.9 and earlier.
+LEGACY_SCHEMA = """
+CREATE TABLE "captured_events" (
+    "id" CHAR(36) NOT NULL PRIMARY KEY,
+    "timestamp" TIMESTAMP NOT NULL,
+    "event_type" VARCHAR(16) NOT NULL,
+    "summary" VARCHAR(500) NOT NULL,
+    "data" JSON NOT NULL
+);
+CREATE INDEX "idx_captured_ev_event_t_2cbbc3" ON "captured_events" ("event_type");
+"""
+
+
+def _insert(conn, event_id, event_type, summary, data):
+    conn.execute(
+        "INSERT INTO captured_events VALUES (?, ?, ?, ?, ?)",
+        [event_id, "2026-01-01 00:00:00+00:00", event_type, summary, json.dumps(data)],
+    )
+
+
+@pytest.fixture()
+def legacy_db(tmp_path):
+    path = tmp_path / "legacy.db"
+    conn = sqlite3.connect(path)
+    conn.executescript(LEGACY_SCHEMA)
+    _insert(
+        conn,
+        "550e8400-e29b-41d4-a716-446655440000",
+        "http",
+        "POST /v1/charges → 402",
+        {
+            "event_type": "http",
+            "host": "api.stripe.com",
+            "url": "https://api.stripe.com/v1/charges",
+            "method": "POST",
+            "status_code": 402,
+            "duration_ms": 87,
+            "app": "billing",
+            "session": "s1",
+            "request_headers": {},
+            "request_body": '{"amount": 500}',
+            "response_headers": {},
+            "response_body": '{"error": "card_declined"}',
+        },
+    )
+    # Pre-app/session rows have neither key in the blob.
+    _insert(
+        conn,
+        "550e8400-e29b-41d4-a716-446655440001",
+        "log",
+        "WARNING app: hi",
+        {"level": "WARNING", "logger_name": "app", "message": "hi"},
+    )
+    conn.commit()
+    conn.close()
+    return path
+
+
+@asynccontextmanager
+async def _opened(path):
+    """Open Tortoise with the app's config against *path*, yield the writer."""
+    tortoise.context._global_context = None
+    await Tortoise.init(config=tortoise_config(f"sqlite://{path}"))
+    try:
+        yield connections.get(WRITER)
+    finally:
+        await Tortoise.close_connections()
+        tortoise.context._global_context = None
+
+
+@pytest_asyncio.fixture()
+async def fresh(tmp_path):
+    async with _opened(tmp_path / "fresh.db") as db:
+        yield db
+
+
+@pytest_asyncio.fixture()
+async def legacy(legacy_db):
+    async with _opened(legacy_db) as db:
+        yield db
+
+
+@pytest_asyncio.fixture()
+async def half_migrated(legacy_db):
+    """A legacy database where a crashed upgrade already added one column."""
+    conn = sqlite3.connect(legacy_db)
+    conn.execute('ALTER TABLE captured_events ADD COLUMN "host" VARCHAR(255)')
+    conn.commit()
+    conn.close()
+    async with _opened(legacy_db) as db:
+        yield db
+
+
+async def _scalar(db, sql):
+    _, rows = await db.execute_query(sql)
+    return rows[0][0]
+
+
+async def _index_names(db):
+    _, rows = await db.execute_query(
+        "SELECT name FROM sqlite_master WHERE type = 'index'"
+        " AND tbl_name = 'captured_events'"
+    )
+    return {r["name"] for r in rows}
+
+
+@pytest.mark.asyncio
+async def test_fresh_database_is_created_at_latest_version(fresh):
+    await init_db()
+
+    assert await _scalar(fresh, "PRAGMA user_version") == len(MIGRATIONS)
+    assert (await list_events()).events == []
+
+
+@pytest.mark.asyncio
+async def test_legacy_database_gets_columns_backfilled(legacy):
+    await init_db()
+
+    _, rows = await legacy.execute_query(
+        "SELECT event_type, host, method, status_code, duration_ms, app, session"
+        " FROM captured_events ORDER BY event_type"
+    )
+    assert [tuple(r) for r in rows] == [
+        ("http", "api.stripe.com", "POST", 402, 87, "billing", "s1"),
+        ("log", None, None, None, None, "", ""),
+    ]
+    assert await _scalar(legacy, "PRAGMA user_version") == len(MIGRATIONS)
+
+
+@pytest.mark.asyncio
+async def test_legacy_database_is_queryable_after_migration(legacy):
+    await init_db()
+
+    assert [e.summary for e in (await list_events(host="api.stripe.com")).events] == [
+        "POST /v1/charges → 402"
+    ]
+    assert [e.summary for e in (await list_events(app="")).events] == [
+        "WARNING app: hi"
+    ]
+    meta = await get_meta()
+    assert meta.hosts == ["api.stripe.com"]
+    assert meta.apps == ["", "billing"]
+
+
+@pytest.mark.asyncio
+async def test_legacy_database_gets_search_index(legacy):
+    await init_db()
+
+    assert [e.summary for e in (await list_events(search="charges")).events] == [
+        "POST /v1/charges → 402"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_legacy_bodies_move_to_side_table(legacy):
+    await init_db()
+
+    assert await _scalar(legacy, "SELECT count(*) FROM event_bodies") == 1
+    assert await _scalar(legacy, "SELECT sum(refcount) FROM body_blobs") == 2
+    assert (
+        await _scalar(
+            legacy,
+            "SELECT count(*) FROM captured_events"
+            " WHERE json_type(data, '$.response_body') IS NOT NULL",
+        )
+        == 0
+    )
+    event = await get_event("550e8400-e29b-41d4-a716-446655440000")
+    assert event is not None
+    assert event.data.response_body == '{"error": "card_declined"}'
+    assert [e.summary for e in (await list_events(search="card_declined")).events] == [
+        "POST /v1/charges → 402"
+    ]
+
+
+@pytest.mark.asyncio
+async def test_legacy_identical_bodies_released_with_event(legacy_db):
+    """A body shared by both sides of one event is one blob reference."""
+    conn = sqlite3.connect(legacy_db)
+    _insert(
+        conn,
+        "550e8400-e29b-41d4-a716-446655440002",
+        "http",
+        "POST /echo → 200",
+        {
+            "event_type": "http",
+            "host": "echo.test",
+            "url": "https://echo.test/echo",
+            "method": "POST",
+            "status_code": 200,
+            "request_body": "same",
+            "response_body": "same",
+        },
+    )
+    conn.execute(
+        "DELETE FROM captured_events WHERE event_type = 'http'"
+        " AND id != '550e8400-e29b-41d4-a716-446655440002'"
+    )
+    conn.commit()
+    conn.close()
+
+    async with _opened(legacy_db) as db:
+        await init_db()
+        assert await _scalar(db, "SELECT refcount FROM body_blobs") == 1
+
+        await db.execute_query("DELETE FROM captured_events")
+
+        assert await _scalar(db, "SELECT count(*) FROM body_blobs") == 0
+
+
+@pytest.mark.asyncio
+async def test_legacy_event_type_index_is_replaced(legacy):
+    await init_db()
+
+    indexes = await _index_names(legacy)
+    assert "idx_captured_ev_event_t_2cbbc3" not in indexes
+    assert len(indexes) > 1
+
+
+@pytest.mark.asyncio
+async def test_half_migrated_database_still_upgrades(half_migrated):
+    await init_db()
+
+    assert (
+        await _scalar(
+            half_migrated, "SELECT COUNT(*) FROM captured_events WHERE host IS NOT NULL"
+        )
+        == 1
+    )
+
+
+@pytest.mark.asyncio
+async def test_init_db_is_idempotent(legacy):
+    await init_db()
+    await init_db()
+
+    assert await _scalar(legacy, "SELECT COUNT(*) FROM captured_events") == 2
+    assert await _scalar(legacy, "PRAGMA user_version") == len(MIGRATIONS)
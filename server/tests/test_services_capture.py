@@ -3,16 +3,24 @@
 from datetime import datetime, timezone
 
 import pytest
-from smello_server.models import CapturedEvent
+from smello_server.models import BodyBlob, CapturedEvent, EventBody
 from smello_server.services.capture import (
+    build_exception_event,
+    build_http_event,
+    build_http_incoming_event,
+    build_log_event,
     create_exception_event,
     create_http_event,
     create_http_incoming_event,
     create_log_event,
+    save_events,
 )
 from smello_server.types import (
     ExceptionData,
+    ExceptionEventData,
     ExceptionFrame,
+    HttpEventData,
+    HttpIncomingEventData,
     HttpIncomingMeta,
     HttpIncomingRequestData,
     HttpIncomingResponseData,
@@ -20,6 +28,7 @@ from smello_server.types import (
     HttpRequestData,
     HttpResponseData,
     LogData,
+    LogEventData,
 )
 
 
@@ -256,3 +265,197 @@ async def test_create_http_incoming_event_uppercases_method(services_db):
     stored = await CapturedEvent.get(id=event.id)
     assert stored.data["method"] == "GET"
     assert "GET" in stored.summary
+
+
+@pytest.mark.asyncio
+async def test_save_events_inserts_all_rows(services_db):
+    events = [
+        build_log_event(
+            event_id=None,
+            data=LogData(level="INFO", logger_name="app", message=f"m{i}"),
+        )
+        for i in range(3)
+    ]
+
+    await save_events(events)
+
+    assert await CapturedEvent.all().count() == 3
+    stored = await CapturedEvent.get(id=events[1].id)
+    assert stored.summary == "INFO app: m1"
+
+
+@pytest.mark.asyncio
+async def test_save_events_skips_ids_that_already_exist(services_db):
+    data = LogData(level="INFO", logger_name="app", message="first")
+    event_id = "550e8400-e29b-41d4-a716-446655440000"
+    await save_events([build_log_event(event_id=event_id, data=data)])
+
+    resent = LogData(level="INFO", logger_name="app", message="resent")
+    assert await save_events([build_log_event(event_id=event_id, data=resent)]) == []
+
+    assert await CapturedEvent.all().count() == 1
+    stored = await CapturedEvent.get(id=event_id)
+    assert stored.data["message"] == "first"
+
+
+@pytest.mark.asyncio
+async def test_http_bodies_are_stored_apart_from_the_event_row(services_db):
+    event = await create_http_event(
+        event_id=None,
+        duration_ms=10,
+        request=HttpRequestData(
+            method="POST", url="https://api.example.com/", headers={}, body="in"
+        ),
+        response=HttpResponseData(status_code=200, headers={}, body="out"),
+        meta=HttpMeta(),
+    )
+
+    stored = await CapturedEvent.get(id=event.id)
+    assert "request_body" not in stored.data
+    assert "response_body" not in stored.data
+    assert stored.data["request_body_size"] == 0
+    body = await EventBody.get(event_id=event.id)
+    assert body.request_hash == BodyBlob.digest("in")
+    assert body.response_hash == BodyBlob.digest("out")
+
+
+@pytest.mark.asyncio
+async def test_save_events_writes_bodies_only_for_events_that_have_them(services_db):
+    with_body = build_http_event(
+        event_id=None,
+        duration_ms=10,
+        request=HttpRequestData(method="GET", url="https://a.test/", headers={}),
+        response=HttpResponseData(status_code=200, headers={}, body="hello"),
+        meta=HttpMeta(),
+    )
+    without_body = build_http_event(
+        event_id=None,
+        duration_ms=10,
+        request=HttpRequestData(method="GET", url="https://b.test/", headers={}),
+        response=HttpResponseData(status_code=204, headers={}),
+        meta=HttpMeta(),
+    )
+    log = build_log_event(
+        event_id=None, data=LogData(level="INFO", logger_name="app", message="m")
+    )
+
+    await save_events([with_body, without_body, log])
+
+    assert await CapturedEvent.all().count() == 3
+    assert [str(b.event_id) for b in await EventBody.all()] == [str(with_body.id)]
+
+
+@pytest.mark.asyncio
+async def test_identical_bodies_are_stored_once_compressed(services_db):
+    openapi = '{"openapi": "3.1.0", "paths": {}}' * 200
+    events = [
+        build_http_event(
+            event_id=None,
+            duration_ms=10,
+            request=HttpRequestData(
+                method="GET", url="https://api.example.com/openapi.json", headers={}
+            ),
+            response=HttpResponseData(status_code=200, headers={}, body=openapi),
+            meta=HttpMeta(),
+        )
+        for _ in range(10)
+    ]
+
+    await save_events(events[:5])
+    await save_events(events[5:])
+
+    blobs = await BodyBlob.all()
+    assert len(blobs) == 1
+    assert blobs[0].refcount == 10
+    assert len(blobs[0].data) < len(openapi) // 10
+    assert BodyBlob.inflate(blobs[0].data) == openapi
+
+
+@pytest.mark.asyncio
+async def test_resent_capture_does_not_leak_a_body_reference(services_db):
+    def build(body):
+        return build_http_event(
+            event_id="550e8400-e29b-41d4-a716-446655440000",
+            duration_ms=10,
+            request=HttpRequestData(method="GET", url="https://a.test/", headers={}),
+            response=HttpResponseData(status_code=200, headers={}, body=body),
+            meta=HttpMeta(),
+        )
+
+    await save_events([build("first")])
+    await save_events([build("first")])
+    await save_events([build("changed")])
+
+    assert [(b.hash, b.refcount) for b in await BodyBlob.all()] == [
+        (BodyBlob.digest("first"), 1)
+    ]
+
+
+def test_body_blob_round_trips_lone_surrogates():
+    text = "broken \ud800 pair"
+    assert BodyBlob.inflate(BodyBlob.compress(text)) == text
+
+
+@pytest.mark.parametrize(
+    ("event", "model"),
+    [
+        (
+            build_http_event(
+                event_id=None,
+                duration_ms=5,
+                request=HttpRequestData(
+                    method="post", url="https://a.test/x", headers={"A": "1"}, body="b"
+                ),
+                response=HttpResponseData(status_code=201, headers={}, body_size=3),
+                meta=HttpMeta(library="httpx"),
+                app="web",
+            ),
+            HttpEventData,
+        ),
+        (
+            build_http_incoming_event(
+                event_id=None,
+                duration_ms=5,
+                request=HttpIncomingRequestData(
+                    method="get", path="/x", url="http://h/x", headers={"Host": "h"}
+                ),
+                response=HttpIncomingResponseData(status_code=500, headers={}),
+                meta=HttpIncomingMeta(framework="django", exc_type="KeyError"),
+            ),
+            HttpIncomingEventData,
+        ),
+        (
+            build_log_event(
+                event_id=None,
+                data=LogData(
+                    level="INFO",
+                    logger_name="app",
+                    message="m",
+                    extra={"user": 1},
+                    unexpected="dropped",
+                ),
+                session="s",
+            ),
+            LogEventData,
+        ),
+        (
+            build_exception_event(
+                event_id=None,
+                data=ExceptionData(
+                    exc_type="KeyError",
+                    frames=[ExceptionFrame(filename="a.py", lineno=1)],
+                    unexpected="dropped",
+                ),
+            ),
+            ExceptionEventData,
+        ),
+    ],
+    ids=["http", "http_incoming", "log", "exception"],
+)
+def test_built_data_is_exactly_the_output_model(event, model):
+    """``build_*`` write ``data`` by hand; it must be what the model would dump."""
+    expected = model.model_validate(event.data).model_dump(
+        mode="json", exclude={"request_body", "response_body"}
+    )
+    assert event.data == expected
+    assert list(event.data) == list(expected)
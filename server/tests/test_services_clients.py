@@ -0,0 +1,43 @@
+"""Service-level tests for the client counter registry."""
+
+from datetime import datetime, timezone
+
+from smello_server.services.clients import ClientRegistry
+from smello_server.types import ClientStats, DeliveryCounts
+
+
+def _stats(client_id: str, *, app: str = "", sent: int = 0) -> ClientStats:
+    return ClientStats(
+        client_id=client_id,
+        app=app,
+        reported_at=datetime.now(timezone.utc),
+        events={"log": DeliveryCounts(sent=sent)},
+    )
+
+
+def test_list_is_most_recent_first():
+    registry = ClientRegistry()
+    registry.report(_stats("a"))
+    registry.report(_stats("b"))
+    registry.report(_stats("a", sent=2))
+
+    assert [s.client_id for s in registry.list()] == ["a", "b"]
+    assert registry.list()[0].events["log"].sent == 2
+
+
+def test_list_filters_by_app():
+    registry = ClientRegistry()
+    registry.report(_stats("a", app="web"))
+    registry.report(_stats("b", app="worker"))
+
+    assert [s.client_id for s in registry.list(app="worker")] == ["b"]
+
+
+def test_forgets_least_recently_reported_client():
+    registry = ClientRegistry(max_clients=2)
+    registry.report(_stats("a"))
+    registry.report(_stats("b"))
+    registry.report(_stats("a"))
+    registry.report(_stats("c"))
+
+    assert [s.client_id for s in registry.list()] == ["c", "a"]
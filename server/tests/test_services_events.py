@@ -1,22 +1,36 @@
 """Service-level tests for read functions: list, get, meta, clear."""
 
+import json
+
 import pytest
-from smello_server.models import CapturedEvent
-from smello_server.services.capture import create_http_event, create_log_event
+from smello_server.models import BodyBlob, CapturedEvent, EventBody
+from smello_server.services.capture import (
+    create_exception_event,
+    create_http_event,
+    create_log_event,
+)
 from smello_server.services.events import (
+    InvalidCursorError,
     clear_events,
+    decode_cursor,
+    encode_cursor,
     get_event,
+    get_event_json,
     get_meta,
     hydrate_event_data,
     list_events,
+    search_matches,
+    search_query,
 )
 from smello_server.types import (
+    ExceptionData,
     HttpEventData,
     HttpMeta,
     HttpRequestData,
     HttpResponseData,
     LogData,
 )
+from tortoise import connections
 
 
 def _http(
@@ -46,14 +60,14 @@ def _log(*, level: str = "INFO", message: str = "hello"):
 
 @pytest.mark.asyncio
 async def test_list_events_empty(services_db):
-    assert await list_events() == []
+    assert (await list_events()).events == []
 
 
 @pytest.mark.asyncio
 async def test_list_events_returns_summaries_newest_first(services_db):
     await _http(url="https://a.test/one")
     await _http(url="https://a.test/two")
-    rows = await list_events()
+    rows = (await list_events()).events
     assert len(rows) == 2
     assert {r.event_type for r in rows} == {"http"}
 
@@ -62,7 +76,7 @@ async def test_list_events_returns_summaries_newest_first(services_db):
 async def test_list_events_filter_by_event_type(services_db):
     await _http()
     await _log(level="WARNING", message="boom")
-    rows = await list_events(event_type="log")
+    rows = (await list_events(event_type="log")).events
     assert len(rows) == 1
     assert rows[0].event_type == "log"
 
@@ -71,7 +85,7 @@ async def test_list_events_filter_by_event_type(services_db):
 async def test_list_events_filter_by_method(services_db):
     await _http(method="GET")
     await _http(method="POST")
-    rows = await list_events(method="POST")
+    rows = (await list_events(method="POST")).events
     assert len(rows) == 1
     assert "POST" in rows[0].summary
 
@@ -80,7 +94,7 @@ async def test_list_events_filter_by_method(services_db):
 async def test_list_events_filter_by_host(services_db):
     await _http(url="https://api.stripe.com/v1/charges")
     await _http(url="https://api.openai.com/v1/models")
-    rows = await list_events(host="api.stripe.com")
+    rows = (await list_events(host="api.stripe.com")).events
     assert len(rows) == 1
     assert "/v1/charges" in rows[0].summary
 
@@ -89,7 +103,7 @@ async def test_list_events_filter_by_host(services_db):
 async def test_list_events_filter_by_status(services_db):
     await _http(status_code=200)
     await _http(status_code=404)
-    rows = await list_events(status=404)
+    rows = (await list_events(status=404)).events
     assert len(rows) == 1
     assert "404" in rows[0].summary
 
@@ -98,7 +112,7 @@ async def test_list_events_filter_by_status(services_db):
 async def test_list_events_search_summary(services_db):
     await _http()
     await _log(level="WARNING", message="Token expired")
-    rows = await list_events(search="Token expired")
+    rows = (await list_events(search="Token expired")).events
     assert len(rows) == 1
     assert rows[0].event_type == "log"
 
@@ -107,18 +121,201 @@ async def test_list_events_search_summary(services_db):
 async def test_list_events_search_data(services_db):
     await _http(body='{"error": "unique-sentinel-value"}')
     await _http()
-    rows = await list_events(search="unique-sentinel-value")
+    rows = (await list_events(search="unique-sentinel-value")).events
     assert len(rows) == 1
 
 
+@pytest.mark.asyncio
+async def test_list_events_search_matches_word_prefixes(services_db):
+    await _http(url="https://api.stripe.com/v1/charges")
+    await _http(url="https://api.openai.com/v1/models")
+    rows = (await list_events(search="charg")).events
+    assert [r.summary for r in rows] == ["GET /v1/charges → 200"]
+
+
+@pytest.mark.asyncio
+async def test_list_events_search_quoted_phrase_is_exact(services_db):
+    await _log(message="Token expired")
+    await _log(message="expired Token")
+    rows = (await list_events(search='"token expired"')).events
+    assert [r.summary for r in rows] == ["INFO app: Token expired"]
+
+
+@pytest.mark.asyncio
+async def test_list_events_search_requires_all_terms(services_db):
+    await _log(message="cache miss for user 42")
+    await _log(message="cache hit for user 42")
+    rows = (await list_events(search="cache miss")).events
+    assert [r.summary for r in rows] == ["INFO app: cache miss for user 42"]
+
+
+@pytest.mark.asyncio
+async def test_list_events_search_covers_exception_text(services_db):
+    await create_exception_event(
+        event_id=None,
+        data=ExceptionData(
+            exc_type="KeyError",
+            exc_value="'customer_id'",
+            traceback_text='File "billing.py", line 12, in charge',
+        ),
+    )
+    await _log()
+    assert len((await list_events(search="billing.py")).events) == 1
+    assert len((await list_events(search="customer_id")).events) == 1
+
+
+@pytest.mark.asyncio
+async def test_list_events_search_sort_by_relevance(services_db):
+    await _http(url="https://a.test/other", body="refund mentioned in the body")
+    await _http(url="https://a.test/refund")
+    await _http(url="https://a.test/unrelated")
+
+    newest = (await list_events(search="refund")).events
+    relevant = (await list_events(search="refund", sort="relevance")).events
+
+    assert [r.summary for r in newest] == [
+        "GET /refund → 200",
+        "GET /other → 200",
+    ]
+    assert relevant[0].summary == "GET /refund → 200"
+    assert len(relevant) == 2
+
+
+@pytest.mark.asyncio
+async def test_list_events_search_combines_with_filters(services_db):
+    await _http(method="GET", url="https://a.test/orders")
+    await _http(method="POST", url="https://a.test/orders")
+    rows = (await list_events(search="orders", method="POST")).events
+    assert [r.summary for r in rows] == ["POST /orders → 200"]
+
+
+@pytest.mark.asyncio
+async def test_list_events_search_punctuation_falls_back_to_substring(services_db):
+    await _http()
+    await _log()
+    rows = (await list_events(search="→")).events
+    assert [r.event_type for r in rows] == ["http"]
+
+
+@pytest.mark.asyncio
+async def test_cleared_events_drop_out_of_search(services_db):
+    await _log(message="ephemeral")
+    await clear_events()
+    await _log(message="something else")
+    assert (await list_events(search="ephemeral")).events == []
+
+
+@pytest.mark.parametrize(
+    ("search", "expected"),
+    [
+        ("charges", '"charges"*'),
+        ("charg*", '"charg"*'),
+        ("token expired", '"token"* "expired"*'),
+        ('"token expired"', '"token expired"'),
+        ('"token expired" 401', '"token expired" "401"*'),
+        ("api.stripe.com", '"api.stripe.com"*'),
+        ('say"hi', '"sayhi"*'),
+        ('"unterminated phrase', '"unterminated"* "phrase"*'),
+        ("→ - *", ""),
+        ("", ""),
+    ],
+)
+def test_search_query(search, expected):
+    assert search_query(search) == expected
+
+
 @pytest.mark.asyncio
 async def test_list_events_limit(services_db):
     for _ in range(5):
         await _http()
-    rows = await list_events(limit=2)
+    rows = (await list_events(limit=2)).events
     assert len(rows) == 2
 
 
+@pytest.mark.asyncio
+async def test_list_events_pages_with_before_cursor(services_db):
+    created = [await _http(url=f"https://api.example.com/{i}") for i in range(5)]
+    newest_first = [str(e.id) for e in reversed(created)]
+
+    seen = []
+    page = await list_events(limit=2)
+    seen += [e.id for e in page.events]
+    while page.next_cursor:
+        page = await list_events(limit=2, before=page.next_cursor)
+        seen += [e.id for e in page.events]
+    assert seen == newest_first
+
+
+@pytest.mark.asyncio
+async def test_list_events_last_page_has_no_next_cursor(services_db):
+    for _ in range(2):
+        await _http()
+    page = await list_events(limit=2)
+    assert len(page.events) == 2
+    assert page.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_list_events_after_cursor_returns_newer_events(services_db):
+    for _ in range(3):
+        await _http()
+    first = await list_events()
+    assert (await list_events(after=first.prev_cursor)).events == []
+
+    newer = [await _http() for _ in range(3)]
+    page = await list_events(after=first.prev_cursor, limit=2)
+    # The two just after the cursor, still newest first.
+    assert [e.id for e in page.events] == [str(newer[1].id), str(newer[0].id)]
+    page = await list_events(after=page.prev_cursor)
+    assert [e.id for e in page.events] == [str(newer[2].id)]
+
+
+@pytest.mark.asyncio
+async def test_list_events_cursor_breaks_timestamp_ties_by_id(services_db):
+    created = [await _http() for _ in range(4)]
+    await CapturedEvent.all().update(timestamp=created[0].timestamp)
+
+    seen = []
+    page = await list_events(limit=1)
+    seen += [e.id for e in page.events]
+    while page.next_cursor:
+        page = await list_events(limit=1, before=page.next_cursor)
+        seen += [e.id for e in page.events]
+    assert sorted(seen, reverse=True) == seen
+    assert len(set(seen)) == 4
+
+
+@pytest.mark.asyncio
+async def test_list_events_cursor_respects_filters(services_db):
+    for i in range(3):
+        await _http(method="POST")
+        await _log(message=f"m{i}")
+    page = await list_events(event_type="log", limit=2)
+    rest = await list_events(event_type="log", before=page.next_cursor)
+    assert [e.summary for e in page.events + rest.events] == [
+        "INFO app: m2",
+        "INFO app: m1",
+        "INFO app: m0",
+    ]
+
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("2026-01-01 00:00:00+00:00", "abc")
+    assert decode_cursor(cursor) == ("2026-01-01 00:00:00+00:00", "abc")
+
+
+@pytest.mark.parametrize("cursor", ["garbage!", "bm90IGpzb24", "WzEsMl0"])
+def test_decode_cursor_rejects_invalid_input(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor)
+
+
+@pytest.mark.asyncio
+async def test_relevance_sort_rejects_cursors(services_db):
+    with pytest.raises(InvalidCursorError):
+        await list_events(search="x", sort="relevance", before=encode_cursor("a", "b"))
+
+
 @pytest.mark.asyncio
 async def test_get_event_returns_none_for_unknown(services_db):
     assert await get_event("550e8400-e29b-41d4-a716-446655440000") is None
@@ -138,6 +335,59 @@ async def test_get_event_returns_typed_detail(services_db):
     assert isinstance(found.data, HttpEventData)
 
 
+@pytest.mark.asyncio
+async def test_get_event_loads_bodies_from_side_table(services_db):
+    created = await _http(body='{"ok": true}')
+    stored = await CapturedEvent.get(id=created.id)
+    assert "response_body" not in stored.data
+
+    found = await get_event(str(created.id))
+    assert found is not None
+    assert isinstance(found.data, HttpEventData)
+    assert found.data.response_body == '{"ok": true}'
+    assert found.data.request_body is None
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("body", [None, '{"ok": true}', 'caf\u00e9 \u2603\n"quoted"'])
+async def test_get_event_json_matches_validated_detail(services_db, body):
+    created = await _http(body=body)
+    await _log()
+    await create_exception_event(
+        event_id=None, data=ExceptionData(exc_type="KeyError", exc_value="'id'")
+    )
+
+    for event in (await list_events()).events:
+        detail = await get_event(event.id)
+        assert detail is not None
+        raw = await get_event_json(event.id)
+        assert raw is not None
+        assert json.loads(raw) == json.loads(detail.model_dump_json())
+    assert (
+        json.loads(await get_event_json(str(created.id)))["data"]["response_body"]
+        == body
+    )
+
+
+@pytest.mark.asyncio
+async def test_get_event_json_validates_legacy_rows(services_db):
+    created = await _log(message="old")
+    await CapturedEvent.filter(id=created.id).update(
+        data={"level": "INFO", "logger_name": "app", "message": "old"}
+    )
+
+    raw = await get_event_json(str(created.id).upper())
+
+    assert raw is not None
+    assert json.loads(raw)["data"]["event_type"] == "log"
+
+
+@pytest.mark.asyncio
+async def test_get_event_json_returns_none_for_unknown_or_invalid(services_db):
+    assert await get_event_json("550e8400-e29b-41d4-a716-446655440000") is None
+    assert await get_event_json("not-a-uuid") is None
+
+
 @pytest.mark.asyncio
 async def test_get_meta_empty(services_db):
     meta = await get_meta()
@@ -162,9 +412,34 @@ async def test_get_meta_returns_hosts_methods_event_types(services_db):
 async def test_clear_events(services_db):
     await _http()
     await _log()
-    assert len(await list_events()) == 2
+    assert len((await list_events()).events) == 2
+    await clear_events()
+    assert (await list_events()).events == []
+
+
+@pytest.mark.asyncio
+async def test_clear_events_deletes_bodies(services_db):
+    await _http(body="payload")
+    assert await EventBody.all().count() == 1
     await clear_events()
-    assert await list_events() == []
+    assert await EventBody.all().count() == 0
+    assert await BodyBlob.all().count() == 0
+
+
+@pytest.mark.asyncio
+async def test_shared_body_is_kept_until_its_last_event_is_deleted(services_db):
+    first = await _http(body="shared")
+    second = await _http(body="shared")
+    assert [b.refcount for b in await BodyBlob.all()] == [2]
+
+    await CapturedEvent.filter(id=first.id).delete()
+    assert [b.refcount for b in await BodyBlob.all()] == [1]
+    found = await get_event(str(second.id))
+    assert found is not None
+    assert found.data.response_body == "shared"
+
+    await CapturedEvent.filter(id=second.id).delete()
+    assert await BodyBlob.all().count() == 0
 
 
 @pytest.mark.asyncio
@@ -200,3 +475,44 @@ async def test_hydrate_event_data_backfills_legacy_rows(services_db):
     assert isinstance(typed, HttpEventData)
     assert typed.event_type == "http"
     assert typed.url == "https://legacy.test/"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "where",
+    [
+        "event_type = 'http'",
+        "host = 'api.example.com'",
+        "method = 'GET'",
+        "status_code = 200",
+        "app = 'billing'",
+        "session = 's1'",
+    ],
+)
+async def test_filtered_newest_first_page_is_read_from_an_index(services_db, where):
+    """A filtered keyset page must be an index range scan, not a full sort.
+
+    Only the ``id`` tie-breaker may be sorted, within rows that share a
+    timestamp ("LAST TERM OF ORDER BY").
+    """
+    db = connections.get("default")
+    _, rows = await db.execute_query(
+        "EXPLAIN QUERY PLAN SELECT id FROM captured_events"
+        f" WHERE {where} AND (timestamp, id) < ('2030-01-01', '')"
+        " ORDER BY timestamp DESC, id DESC LIMIT 51"
+    )
+    plan = " ".join(r["detail"] for r in rows)
+    assert "USING INDEX" in plan
+    assert "timestamp<?" in plan
+    assert "TEMP B-TREE FOR ORDER BY" not in plan
+
+
+@pytest.mark.asyncio
+async def test_search_matches_filters_given_ids(services_db):
+    stripe = await _http(url="https://api.stripe.com/v1/charges")
+    other = await _http()
+    await _http(url="https://api.stripe.com/v1/charges/2")
+
+    hits = await search_matches("charges", [str(stripe.id), str(other.id)])
+    assert hits == {str(stripe.id)}
+    assert await search_matches("charges", []) == set()
@@ -0,0 +1,134 @@
+"""Service-level tests for the ingestion buffer."""
+
+import asyncio
+
+import pytest
+from smello_server.models import CapturedEvent
+from smello_server.services.capture import build_log_event
+from smello_server.services.ingest import IngestBuffer
+from smello_server.services.stream import EventStream
+from smello_server.types import LogData
+
+
+def _log(message: str, event_id: str | None = None) -> CapturedEvent:
+    return build_log_event(
+        event_id=event_id,
+        data=LogData(level="INFO", logger_name="app", message=message),
+    )
+
+
+@pytest.mark.asyncio
+async def test_add_without_running_task_writes_immediately(services_db):
+    buffer = IngestBuffer()
+
+    await buffer.add([_log("hello")])
+
+    assert await CapturedEvent.all().count() == 1
+
+
+@pytest.mark.asyncio
+async def test_rows_are_written_after_interval(services_db):
+    buffer = IngestBuffer(interval=0.01)
+    buffer.start()
+    try:
+        await buffer.add([_log("a"), _log("b")])
+        assert await CapturedEvent.all().count() == 0
+
+        await asyncio.sleep(0.1)
+        assert await CapturedEvent.all().count() == 2
+    finally:
+        await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_full_buffer_flushes_before_interval(services_db):
+    buffer = IngestBuffer(interval=60, max_rows=3)
+    buffer.start()
+    try:
+        await buffer.add([_log(str(i)) for i in range(3)])
+
+        await asyncio.sleep(0.1)
+        assert await CapturedEvent.all().count() == 3
+    finally:
+        await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_add_waits_for_flush_past_max_pending(services_db):
+    buffer = IngestBuffer(interval=60, max_rows=2, max_pending=4)
+    buffer.start()
+    try:
+        await buffer.add([_log(str(i)) for i in range(5)])
+
+        assert await CapturedEvent.all().count() == 5
+    finally:
+        await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_flush_writes_pending_rows(services_db):
+    buffer = IngestBuffer(interval=60)
+    buffer.start()
+    try:
+        await buffer.add([_log("a")])
+        await buffer.flush()
+
+        assert await CapturedEvent.all().count() == 1
+    finally:
+        await buffer.stop()
+
+
+@pytest.mark.asyncio
+async def test_stop_drains_pending_rows(services_db):
+    buffer = IngestBuffer(interval=60)
+    buffer.start()
+    await buffer.add([_log("a"), _log("b")])
+
+    await buffer.stop()
+
+    assert await CapturedEvent.all().count() == 2
+
+
+@pytest.mark.asyncio
+async def test_bad_row_does_not_sink_the_rest_of_the_batch(services_db):
+    buffer = IngestBuffer()
+    bad = _log("bad")
+    bad.summary = None  # NOT NULL column
+
+    await buffer.add([_log("a"), bad, _log("b")])
+
+    stored = await CapturedEvent.all().values_list("summary", flat=True)
+    assert sorted(stored) == ["INFO app: a", "INFO app: b"]
+
+
+@pytest.mark.asyncio
+async def test_resent_ids_are_not_published_again(services_db):
+    stream = EventStream()
+    buffer = IngestBuffer(stream=stream)
+    event_id = "550e8400-e29b-41d4-a716-446655440000"
+
+    with stream.subscribe() as sub:
+        await buffer.add([_log("first", event_id)])
+        await buffer.add([_log("resent", event_id), _log("new")])
+        published = await sub.get(timeout=1)
+        published += await sub.get(timeout=0.1)
+
+    assert [e.summary for e in published] == ["INFO app: first", "INFO app: new"]
+
+
+@pytest.mark.asyncio
+async def test_etag_changes_on_add_and_mark_changed(services_db):
+    buffer = IngestBuffer()
+    first = buffer.etag
+    assert first == buffer.etag
+
+    await buffer.add([_log("hello")])
+    second = buffer.etag
+    assert second != first
+
+    buffer.mark_changed()
+    assert buffer.etag not in (first, second)
+
+
+def test_etags_differ_between_buffers():
+    assert IngestBuffer().etag != IngestBuffer().etag
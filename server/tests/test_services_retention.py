@@ -0,0 +1,209 @@
+"""Service-level tests for retention pruning."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from smello_server.db import WRITER
+from smello_server.models import CapturedEvent
+from smello_server.services.capture import build_log_event, save_events
+from smello_server.services.events import clear_events
+from smello_server.services.retention import (
+    Pruner,
+    RetentionPolicy,
+    parse_app_limits,
+    parse_count,
+    parse_duration,
+    parse_size,
+    prune,
+    used_bytes,
+)
+from smello_server.types import LogData
+from tortoise import connections
+
+NOW = datetime(2026, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+async def _store(count: int, *, app: str = "", age: timedelta = timedelta(0)):
+    events = []
+    for i in range(count):
+        event = build_log_event(
+            event_id=None,
+            data=LogData(
+                level="INFO", logger_name="app", message=f"m{i} " + "x" * 2000
+            ),
+        )
+        event.app = app
+        event.timestamp = NOW - age + timedelta(microseconds=i)
+        events.append(event)
+    await save_events(events)
+    return events
+
+
+@pytest.mark.asyncio
+async def test_prune_deletes_events_older_than_max_age(services_db):
+    await _store(3, age=timedelta(days=8))
+    recent = await _store(2, age=timedelta(hours=1))
+
+    deleted = await prune(RetentionPolicy(max_age=timedelta(days=7)), now=NOW)
+
+    assert deleted == 3
+    assert {e.id for e in await CapturedEvent.all()} == {e.id for e in recent}
+
+
+@pytest.mark.asyncio
+async def test_prune_keeps_newest_max_events_in_small_batches(services_db):
+    events = await _store(25)
+
+    deleted = await prune(RetentionPolicy(max_events=10), batch_size=4)
+
+    assert deleted == 15
+    kept = {e.id for e in await CapturedEvent.all()}
+    assert kept == {e.id for e in events[-10:]}
+
+
+@pytest.mark.asyncio
+async def test_prune_applies_per_app_limits(services_db):
+    await _store(5, app="web")
+    worker = await _store(5, app="worker")
+
+    deleted = await prune(RetentionPolicy(app_max_events={"web": 2}))
+
+    assert deleted == 3
+    assert await CapturedEvent.filter(app="web").count() == 2
+    assert await CapturedEvent.filter(app="worker").count() == len(worker)
+
+
+@pytest.mark.asyncio
+async def test_prune_deletes_oldest_until_under_max_db_size(pooled_db):
+    await _store(400)
+    db = connections.get(WRITER)
+    limit = await used_bytes(db) // 2
+
+    deleted = await prune(RetentionPolicy(max_db_bytes=limit), batch_size=50)
+
+    assert 0 < deleted < 400
+    assert await used_bytes(db) <= limit
+
+
+@pytest.mark.asyncio
+async def test_prune_shrinks_the_file_with_incremental_vacuum(pooled_db):
+    await _store(400)
+    db = connections.get(WRITER)
+    _, before = await db.execute_query("PRAGMA page_count")
+
+    await prune(RetentionPolicy(max_events=0))
+
+    _, after = await db.execute_query("PRAGMA page_count")
+    _, free = await db.execute_query("PRAGMA freelist_count")
+    assert after[0][0] < before[0][0]
+    assert free[0][0] == 0
+
+
+@pytest.mark.asyncio
+async def test_prune_without_limits_is_a_no_op(services_db):
+    await _store(3)
+    assert await prune(RetentionPolicy()) == 0
+    assert await CapturedEvent.all().count() == 3
+
+
+@pytest.mark.asyncio
+async def test_search_index_follows_pruned_rows(services_db):
+    await _store(3, age=timedelta(days=30))
+    db = connections.get(WRITER)
+
+    await prune(RetentionPolicy(max_age=timedelta(days=1)), now=NOW)
+
+    _, rows = await db.execute_query(
+        "SELECT count(*) FROM captured_events_fts WHERE captured_events_fts MATCH 'm0'"
+    )
+    assert rows[0][0] == 0
+
+
+@pytest.mark.asyncio
+async def test_pruner_reports_changes(services_db):
+    await _store(3)
+    calls = []
+    pruner = Pruner(RetentionPolicy(max_events=1), on_prune=lambda: calls.append(1))
+
+    assert await pruner.run_once() == 2
+    assert await pruner.run_once() == 0
+    assert calls == [1]
+
+
+def test_pruner_without_limits_does_not_start():
+    pruner = Pruner(RetentionPolicy())
+    pruner.start()
+    assert pruner._task is None
+
+
+@pytest.mark.asyncio
+async def test_clear_events_deletes_in_batches(services_db):
+    await _store(1200)
+    await clear_events()
+    assert await CapturedEvent.all().count() == 0
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("45s", timedelta(seconds=45)),
+        ("30m", timedelta(minutes=30)),
+        ("12h", timedelta(hours=12)),
+        ("7d", timedelta(days=7)),
+        ("2W", timedelta(weeks=2)),
+    ],
+)
+def test_parse_duration(value, expected):
+    assert parse_duration(value) == expected
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("1048576", 1048576),
+        ("512kb", 512 * 1024),
+        ("500MB", 500 * 1024**2),
+        ("2GiB", 2 * 1024**3),
+    ],
+)
+def test_parse_size(value, expected):
+    assert parse_size(value) == expected
+
+
+@pytest.mark.parametrize(
+    "parse",
+    [parse_duration, parse_size, parse_count, parse_app_limits],
+    ids=["duration", "size", "count", "apps"],
+)
+def test_parsers_reject_garbage(parse):
+    with pytest.raises(ValueError):
+        parse("lots")
+
+
+def test_policy_from_env():
+    policy = RetentionPolicy.from_env(
+        {
+            "SMELLO_MAX_AGE": "7d",
+            "SMELLO_MAX_EVENTS": "10000",
+            "SMELLO_MAX_DB_SIZE": "1GB",
+            "SMELLO_APP_MAX_EVENTS": "web=100, worker=50",
+        }
+    )
+    assert policy == RetentionPolicy(
+        max_age=timedelta(days=7),
+        max_events=10000,
+        max_db_bytes=1024**3,
+        app_max_events={"web": 100, "worker": 50},
+    )
+    assert policy.enabled
+    assert not RetentionPolicy.from_env({}).enabled
+
+
+@pytest.mark.parametrize(
+    "environ",
+    [{"SMELLO_MAX_EVENTS": "-1"}, {"SMELLO_APP_MAX_EVENTS": "web=-1"}],
+    ids=["total", "per-app"],
+)
+def test_policy_from_env_rejects_negative_counts(environ):
+    with pytest.raises(ValueError):
+        RetentionPolicy.from_env(environ)
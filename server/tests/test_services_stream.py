@@ -0,0 +1,112 @@
+"""Service-level tests for the live event stream."""
+
+import asyncio
+
+import pytest
+from smello_server.services.capture import build_http_event, build_log_event
+from smello_server.services.events import list_events
+from smello_server.services.ingest import IngestBuffer
+from smello_server.services.stream import EventFilter, EventStream, live_events
+from smello_server.types import HttpMeta, HttpRequestData, HttpResponseData, LogData
+
+
+def _log(message: str = "hello"):
+    return build_log_event(
+        event_id=None,
+        data=LogData(level="INFO", logger_name="app", message=message),
+    )
+
+
+def _http(*, method: str = "GET", url: str = "https://api.example.com/test"):
+    return build_http_event(
+        event_id=None,
+        duration_ms=10,
+        request=HttpRequestData(method=method, url=url, headers={}),
+        response=HttpResponseData(status_code=200, headers={}, body_size=0),
+        meta=HttpMeta(library="requests"),
+    )
+
+
+async def _receive(stream, filters=EventFilter(), *, publish, **kwargs):
+    """Open a live stream, store *publish* events, return the first batch."""
+    buffer = IngestBuffer(stream=stream)
+    events = live_events(stream, filters, **kwargs)
+    try:
+        pending = asyncio.create_task(anext(events))
+        await asyncio.sleep(0)
+        await buffer.add(publish)
+        return await asyncio.wait_for(pending, 1)
+    finally:
+        await events.aclose()
+
+
+@pytest.mark.asyncio
+async def test_stored_events_are_pushed_to_subscribers(services_db):
+    batch = await _receive(EventStream(), publish=[_log("one"), _log("two")])
+    assert [e.summary for e in batch] == ["INFO app: one", "INFO app: two"]
+
+
+@pytest.mark.asyncio
+async def test_stream_applies_column_filters(services_db):
+    batch = await _receive(
+        EventStream(),
+        EventFilter(event_type="http", method="post"),
+        publish=[_log(), _http(method="GET"), _http(method="POST")],
+    )
+    assert [e.summary for e in batch] == ["POST /test → 200"]
+
+
+@pytest.mark.asyncio
+async def test_stream_applies_search(services_db):
+    batch = await _receive(
+        EventStream(),
+        EventFilter(search="charg"),
+        publish=[_http(url="https://api.stripe.com/v1/charges"), _http()],
+    )
+    assert [e.summary for e in batch] == ["GET /v1/charges → 200"]
+
+
+@pytest.mark.asyncio
+async def test_idle_stream_yields_empty_keepalive_batch(services_db):
+    events = live_events(EventStream(), EventFilter(), keepalive=0.01)
+    try:
+        assert await asyncio.wait_for(anext(events), 1) == []
+    finally:
+        await events.aclose()
+
+
+@pytest.mark.asyncio
+async def test_reconnect_replays_events_after_last_event_id(services_db):
+    buffer = IngestBuffer()
+    await buffer.add([_log("seen")])
+    cursor = (await list_events()).prev_cursor
+    await buffer.add([_log("missed 1"), _log("missed 2")])
+
+    events = live_events(EventStream(), EventFilter(), last_event_id=cursor)
+    try:
+        replayed = await asyncio.wait_for(anext(events), 1)
+    finally:
+        await events.aclose()
+    assert [e.summary for e in replayed] == ["INFO app: missed 1", "INFO app: missed 2"]
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_stream_ends(services_db):
+    stream = EventStream(max_queued=1)
+    events = live_events(stream, EventFilter(app="other"), keepalive=0.01)
+    try:
+        assert await asyncio.wait_for(anext(events), 1) == []
+        stream.publish([_log()])
+        stream.publish([_log()])
+        with pytest.raises(StopAsyncIteration):
+            await asyncio.wait_for(anext(events), 1)
+    finally:
+        await events.aclose()
+
+
+def test_subscriptions_are_removed_on_exit():
+    stream = EventStream()
+    with stream.subscribe() as subscription:
+        stream.publish([_log()])
+    stream.publish([_log()])
+    assert subscription._queue.qsize() == 1
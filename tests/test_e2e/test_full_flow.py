@@ -6,6 +6,7 @@ makes requests through them, verifies data appears in the API.
 
 import asyncio
 import datetime
+import http.client
 import importlib
 import json
 import socket
@@ -21,11 +22,13 @@ import pytest
 import requests as requests_lib
 import tortoise.context
 import uvicorn
+from smello import transport
 from smello.config import SmelloConfig
 from smello.patches.patch_aiohttp import patch_aiohttp
 from smello.patches.patch_httpx import patch_httpx
 from smello.patches.patch_requests import patch_requests
 from smello.transport import start_worker
+from smello_server.__main__ import _bind_uds
 from smello_server.app import create_app
 
 # -- Mock target API server ---------------------------------------------------
@@ -121,6 +124,44 @@ def smello_server(tmp_path):
     tortoise.context._global_context = None
 
 
+@pytest.fixture()
+def smello_uds_server(tmp_path):
+    """Like ``smello_server``, but also listening on a Unix domain socket.
+
+    Yields ``(http_url, unix_url)``.
+    """
+    tortoise.context._global_context = None
+
+    db_url = f"sqlite://{tmp_path / 'e2e_test.db'}"
+    socket_path = str(tmp_path / "smello.sock")
+    config = uvicorn.Config(
+        create_app(db_url=db_url), host="127.0.0.1", port=0, log_level="error"
+    )
+    tcp_sock = config.bind_socket()
+    sockets = [tcp_sock, _bind_uds(socket_path)]
+    server = uvicorn.Server(config)
+    thread = threading.Thread(
+        target=server.run, kwargs={"sockets": sockets}, daemon=True
+    )
+    thread.start()
+
+    base = f"http://127.0.0.1:{tcp_sock.getsockname()[1]}"
+    deadline = time.monotonic() + 10
+    while time.monotonic() < deadline:
+        try:
+            urllib.request.urlopen(f"{base}/api/events", timeout=1)
+            break
+        except Exception:
+            time.sleep(0.1)
+
+    yield base, f"unix://{socket_path}"
+    server.should_exit = True
+    time.sleep(0.5)
+    for sock in sockets:
+        sock.close()
+    tortoise.context._global_context = None
+
+
 @pytest.fixture()
 def patched_requests(smello_server):
     """Patch the requests library via smello SDK, return the reloaded module."""
@@ -169,7 +210,7 @@ def _flatten_http_event(detail):
 
 def _list_http_events(smello_url):
     """Return all captured HTTP events with their data flattened to the top level."""
-    summaries = _fetch_json(f"{smello_url}/api/events?event_type=http")
+    summaries = _fetch_json(f"{smello_url}/api/events?event_type=http")["events"]
     return [
         _flatten_http_event(_fetch_json(f"{smello_url}/api/events/{s['id']}"))
         for s in summaries
@@ -613,3 +654,64 @@ def test_aiohttp_close_without_read(smello_server, mock_target, patched_aiohttp)
     matching = [r for r in data if "/aiohttp-close" in r["url"]]
     assert len(matching) >= 1
     assert matching[0]["status_code"] == 200
+
+
+def test_live_stream_pushes_captured_events(
+    smello_server, mock_target, patched_requests
+):
+    url = urlparse(smello_server)
+    conn = http.client.HTTPConnection(url.hostname, url.port, timeout=5)
+    try:
+        conn.request("GET", "/api/events/stream?event_type=http")
+        resp = conn.getresponse()
+        assert resp.status == 200
+        assert resp.getheader("Content-Type").startswith("text/event-stream")
+
+        patched_requests.get(f"{mock_target}/streamed")
+
+        fields = {}
+        while "data" not in fields:
+            line = resp.readline().decode().rstrip("\n")
+            if line and not line.startswith(":"):
+                name, _, value = line.partition(": ")
+                fields[name] = value
+    finally:
+        conn.close()
+
+    summary = json.loads(fields["data"])
+    assert summary["summary"] == "GET /streamed → 200"
+    assert summary["event_type"] == "http"
+    assert fields["id"]
+
+
+def test_compressed_capture_stored(smello_server, mock_target):
+    importlib.reload(requests_lib)
+    start_worker(smello_server, compress=True)
+    config = SmelloConfig(server_url=smello_server)
+    patch_requests(config)
+    try:
+        requests_lib.post(f"{mock_target}/gzipped", data="é" * 2000)
+        data = _wait_for_capture(smello_server)
+        gzip_supported = transport._gzip_supported
+    finally:
+        start_worker(smello_server)
+        importlib.reload(requests_lib)
+
+    assert data[0]["request_body"] == "é" * 2000
+    assert gzip_supported is True
+
+
+def test_capture_over_unix_socket(smello_uds_server, mock_target):
+    base, unix_url = smello_uds_server
+    importlib.reload(requests_lib)
+    start_worker(unix_url)
+    config = SmelloConfig(server_url=unix_url)
+    patch_requests(config)
+    try:
+        requests_lib.get(f"{mock_target}/over-uds")
+        data = _wait_for_capture(base)
+    finally:
+        start_worker(base)
+        importlib.reload(requests_lib)
+
+    assert "/over-uds" in data[0]["url"]